@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class InProcessBackend:
+    """Per-user cache entries held in this process, LRU-bounded by number of users."""
+
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+
+    async def get_user(self, user_id: str) -> Dict[str, dict]:
+        pages = self._users.get(user_id)
+        if pages is None:
+            return {}
+        self._users.move_to_end(user_id)
+        return pages
+
+    async def set_page(self, user_id: str, page_key: str, entry: dict, ttl: int) -> None:
+        pages = self._users.setdefault(user_id, {})
+        pages[page_key] = entry
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+
+    async def drop_page(self, user_id: str, page_key: str) -> None:
+        self._users.get(user_id, {}).pop(page_key, None)
+
+    async def invalidate_user(self, user_id: str) -> None:
+        self._users.pop(user_id, None)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "users": len(self._users),
+                "pages": sum(len(p) for p in self._users.values())}
+
+
+class RedisBackend:
+    """Shared backend for multi-worker deployments: one Redis hash per user, one field per page."""
+
+    def __init__(self, url: str, prefix: str = "prodibot:reminders:"):
+        try:
+            import redis.asyncio as redis_asyncio  # Optional: only needed for the shared backend
+        except ImportError:
+            raise RuntimeError("REMINDER_CACHE_REDIS_URL is set but the 'redis' package is not installed.")
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def get_user(self, user_id: str) -> Dict[str, dict]:
+        raw = await self.client.hgetall(self.prefix + user_id)
+        return {k.decode(): json.loads(v) for k, v in raw.items()}
+
+    async def set_page(self, user_id: str, page_key: str, entry: dict, ttl: int) -> None:
+        key = self.prefix + user_id
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, page_key, json.dumps(entry))
+            pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def drop_page(self, user_id: str, page_key: str) -> None:
+        await self.client.hdel(self.prefix + user_id, page_key)
+
+    async def invalidate_user(self, user_id: str) -> None:
+        await self.client.delete(self.prefix + user_id)
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+class ReminderCache:
+    """
+    Per-user cache of /api/my-reminders pages.
+
+    Each entry remembers the user's change version (db_utils.bump_user_version) it was built from.
+    Within `version_check_seconds` of its last check an entry is served as-is; after that the
+    version is re-read (one GetItem) and the entry is only rebuilt if the version moved.
+    So bot-side changes show up within `version_check_seconds`, and API-side changes immediately.
+    """
+
+    def __init__(self, backend=None, ttl: int = 300, version_check_seconds: float = 10.0):
+        self.backend = backend or InProcessBackend()
+        self.ttl = ttl
+        self.version_check_seconds = version_check_seconds
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    async def lookup(self, user_id: str, page_key: str, get_version) -> Optional[dict]:
+        """Returns a usable entry, or None if the page must be rebuilt."""
+        entry = (await self.backend.get_user(user_id)).get(page_key)
+        now = time.time()
+        if entry is None or now - entry["built_at"] > self.ttl:
+            self.misses += 1
+            return None
+        if now - entry["checked_at"] < self.version_check_seconds:
+            self.hits += 1
+            return entry
+        if await get_version(user_id) != entry["version"]:
+            self.misses += 1
+            await self.backend.drop_page(user_id, page_key)
+            return None
+        self.revalidations += 1
+        entry["checked_at"] = now
+        await self.backend.set_page(user_id, page_key, entry, self.ttl)
+        return entry
+
+    async def store(self, user_id: str, page_key: str, version: int, etag: str,
+                    rows: list, next_cursor: Optional[str]) -> dict:
+        now = time.time()
+        entry = {"version": version, "etag": etag, "rows": rows, "next_cursor": next_cursor,
+                 "built_at": now, "checked_at": now}
+        await self.backend.set_page(user_id, page_key, entry, self.ttl)
+        return entry
+
+    async def invalidate(self, user_id: str) -> None:
+        await self.backend.invalidate_user(user_id)
+
+    async def patch_remove(self, user_id: str, reminder_ids: Iterable[str], new_version: Optional[int],
+                           compute_etag) -> None:
+        """
+        Removes deleted reminders from the user's cached pages instead of dropping them.
+        Only safe when this delete (one version bump) is the only change since the page was
+        built (entry version == new_version - 1); anything else is invalidated.
+        """
+        reminder_ids = set(reminder_ids)
+        pages = await self.backend.get_user(user_id)
+        if new_version is None:
+            await self.backend.invalidate_user(user_id)
+            return
+        for page_key, entry in list(pages.items()):
+            if entry["version"] != new_version - 1:
+                await self.backend.drop_page(user_id, page_key)
+                continue
+            # Cursors are DynamoDB keys, so a shorter page doesn't shift the pages after it
+            rows = [row for row in entry["rows"] if row["reminder_id"] not in reminder_ids]
+            entry.update(rows=rows, version=new_version, etag=compute_etag(rows), checked_at=time.time())
+            await self.backend.set_page(user_id, page_key, entry, self.ttl)
+
+    def stats(self) -> dict:
+        return {**self.backend.stats(), "hits": self.hits, "revalidations": self.revalidations,
+                "misses": self.misses}
+
+
+def build_reminder_cache() -> ReminderCache:
+    """In-process cache, or a shared Redis-backed one when REMINDER_CACHE_REDIS_URL is set."""
+    redis_url = os.environ.get("REMINDER_CACHE_REDIS_URL")
+    backend = RedisBackend(redis_url) if redis_url else InProcessBackend()
+    return ReminderCache(
+        backend=backend,
+        ttl=int(os.environ.get("REMINDER_CACHE_TTL_SECONDS", "300")),
+        version_check_seconds=float(os.environ.get("REMINDER_CACHE_VERSION_CHECK_SECONDS", "10")),
+    )
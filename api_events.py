@@ -0,0 +1,209 @@
+import asyncio
+import json
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+class Subscription:
+    """One connected client: a bounded queue of change events for one user."""
+
+    def __init__(self, user_id: str, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.last_version = 0
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        """
+        Queues an event without blocking the publisher.
+        A client that can't keep up has its backlog replaced by a single resync event.
+        """
+        version = event.get("version")
+        if version is not None:
+            if version <= self.last_version:
+                return  # Already delivered (a replay and the watcher can overlap)
+            self.last_version = version
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait({"type": "resync", "version": event.get("version"), "reason": "backlog"})
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """Waits up to `timeout` seconds for the next event; None means nothing happened."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """
+    In-process pub/sub of per-user reminder change events.
+
+    Events come from the user's change version item (db_utils.bump_user_version), so changes made
+    by the bot and by any API worker arrive the same way. While a user has at least one subscriber,
+    a watcher task re-reads that item right away after `poke`, and every `poll_seconds` otherwise,
+    then publishes the events it hasn't seen yet. Users with no open streams cost nothing.
+
+    With `redis_url`, the hub also listens on `redis_channel`, where db_utils.publish_change
+    announces every version bump from the bot and every API worker, and pokes the matching
+    watcher. Polling then only covers a lost Redis message or connection.
+    """
+
+    def __init__(self, get_events: Callable[[str], Awaitable[Tuple[int, List[dict]]]],
+                 poll_seconds: float = 10.0, queue_size: int = 100, max_streams_per_user: int = 5,
+                 redis_url: Optional[str] = None, redis_channel: str = "prodibot:changes"):
+        self.get_events = get_events
+        self.poll_seconds = poll_seconds
+        self.queue_size = queue_size
+        self.max_streams_per_user = max_streams_per_user
+        self.redis_channel = redis_channel
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis_asyncio  # Optional: only needed for cross-process pokes
+            except ImportError:
+                raise RuntimeError("STREAM_REDIS_URL is set but the 'redis' package is not installed.")
+            self._redis = redis_asyncio.from_url(redis_url)
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+        self._pokes: Dict[str, asyncio.Event] = {}
+        self.published = 0
+        self.remote_pokes = 0
+
+    def subscribe(self, user_id: str) -> Optional[Subscription]:
+        """Opens a subscription, or returns None if the user already has too many open streams."""
+        subscribers = self._subscribers.setdefault(user_id, set())
+        if len(subscribers) >= self.max_streams_per_user:
+            return None
+        subscription = Subscription(user_id, self.queue_size)
+        subscribers.add(subscription)
+        if user_id not in self._watchers or self._watchers[user_id].done():
+            self._pokes[user_id] = asyncio.Event()
+            self._watchers[user_id] = asyncio.create_task(self._watch(user_id))
+        if self._redis is not None and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.user_id]
+            self._pokes.pop(subscription.user_id, None)
+            watcher = self._watchers.pop(subscription.user_id, None)
+            if watcher:
+                watcher.cancel()
+
+    def poke(self, user_id: str) -> None:
+        """Tells the user's watcher to check now (after a write made by this or, through Redis, another process)."""
+        poke = self._pokes.get(user_id)
+        if poke:
+            poke.set()
+
+    def publish(self, user_id: str, events: List[dict]) -> None:
+        for subscription in list(self._subscribers.get(user_id, ())):
+            for event in events:
+                subscription.offer(event)
+        self.published += len(events)
+
+    @staticmethod
+    def missed_events(since: int, version: int, recent: List[dict]) -> List[dict]:
+        """
+        Events after version `since`, each tagged with its version.
+        The version item only keeps the last few events, so anything older becomes one resync.
+        """
+        missed = version - since
+        if missed <= 0:
+            return []
+        if missed > len(recent):
+            return [{"type": "resync", "version": version, "reason": "missed events"}]
+        first = version - missed + 1
+        return [{**event, "version": first + i} for i, event in enumerate(recent[-missed:])]
+
+    async def replay(self, subscription: Subscription, last_event_id: Optional[str]) -> None:
+        """Queues whatever a reconnecting client missed since its Last-Event-ID."""
+        try:
+            since = int(last_event_id)
+        except (TypeError, ValueError):
+            return
+        version, recent = await self.get_events(subscription.user_id)
+        for event in self.missed_events(since, version, recent):
+            subscription.offer(event)
+
+    async def _watch(self, user_id: str) -> None:
+        version = None
+        poke = self._pokes[user_id]
+        while user_id in self._subscribers:
+            if version is not None:
+                try:
+                    await asyncio.wait_for(poke.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                poke.clear()
+            try:
+                new_version, recent = await self.get_events(user_id)
+            except Exception as e:
+                print("[EVENTS] Error reading events for", user_id, e)
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            if version is not None:
+                self.publish(user_id, self.missed_events(version, new_version, recent))
+            version = new_version
+
+    async def _listen(self) -> None:
+        """Pokes local watchers for the user ids published on the Redis channel; reconnects after errors."""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.redis_channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        self.remote_pokes += 1
+                        self.poke(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("[EVENTS] Redis listener error, polling until it reconnects:", e)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def close(self) -> None:
+        watchers = list(self._watchers.values())
+        if self._listener is not None:
+            watchers.append(self._listener)
+            self._listener = None
+        for watcher in watchers:
+            watcher.cancel()
+        await asyncio.gather(*watchers, return_exceptions=True)
+        self._watchers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "streams": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "remote_pokes": self.remote_pokes,
+            "dropped": sum(sub.dropped for subs in self._subscribers.values() for sub in subs),
+        }
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):  # DynamoDB hands numbers back as Decimal
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+
+def format_sse(event: dict) -> str:
+    """One Server-Sent Events message; the version doubles as the event id so reconnects can resume."""
+    lines = []
+    if event.get("version") is not None:
+        lines.append(f"id: {event['version']}")
+    lines.append("data: " + json.dumps(event, separators=(",", ":"), default=_json_default))
+    return "\n".join(lines) + "\n\n"
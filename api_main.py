@@ -1,21 +1,30 @@
 import datetime
-import dateparser
 import pytz
 import os
-import requests
-import boto3
 import json
-from fastapi import FastAPI, HTTPException, Depends, Request
-from fastapi.responses import RedirectResponse
+import base64
+import hashlib
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Query
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 import asyncio
 from magnum import Magnum
 from dotenv import load_dotenv
-from urllib.parse import quote
+from urllib.parse import parse_qs, quote
 
+if TYPE_CHECKING:
+    import httpx
+
+try:
+    import orjson  # noqa: F401  Optional: several times faster than json for large lists
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:
+    FastJSONResponse = JSONResponse
 
 
 load_dotenv()
@@ -25,14 +34,27 @@ from fastapi.middleware.cors import CORSMiddleware
 
 # Import shared DB logic
 import db_utils 
+import time_utils
+from token_cache import VerifiedTokenCache
+from api_cache import build_reminder_cache
+from api_events import EventHub, format_sse
+from rate_limit import InMemoryStore, Limit, RateLimiter, RateLimitMiddleware, RedisStore
 
 
 # --- AWS Secrets Manager Integration ---
+# PRODIBOT_LAZY_INIT=1 (meant for Lambda) defers secrets, boto3 and the DynamoDB resource to the
+# first request instead of module import. Either way secrets are fetched once per process, so a
+# warm Lambda container reuses them for every later invocation.
+LAZY_INIT = os.environ.get("PRODIBOT_LAZY_INIT") == "1"
+
+
 def load_secrets_from_aws():
     secret_name = "prodibot/secrets"
     region_name = "us-east-1"
 
     try:
+        import boto3
+
         session = boto3.session.Session()
         client = session.client(
             service_name='secretsmanager',
@@ -59,31 +81,85 @@ def load_secrets_from_aws():
     return True
 
 
-aws_success = load_secrets_from_aws()
-if not aws_success:
-    load_dotenv()
+# --- Environment Vars ---
+DISCORD_CLIENT_ID = None
+DISCORD_CLIENT_SECRET = None
+SECRET_KEY = None
 
+_config_lock = threading.Lock()
+_config_loaded = False
 
-# --- Environment Vars ---
-DISCORD_CLIENT_ID = os.environ.get("DISCORD_CLIENT_ID")
-DISCORD_CLIENT_SECRET = os.environ.get("DISCORD_CLIENT_SECRET")
-SECRET_KEY = os.environ.get("SECRET_KEY")
 
-if not all([DISCORD_CLIENT_ID, DISCORD_CLIENT_SECRET, SECRET_KEY]):
-    print("FATAL ERROR: Missing OAuth2 or SECRET_KEY environment variables!")
-    exit()
+def load_config() -> bool:
+    """
+    Loads secrets (AWS first, then .env) into the module settings, once per process.
+    Returns False if any required setting is missing.
+    """
+    global DISCORD_CLIENT_ID, DISCORD_CLIENT_SECRET, SECRET_KEY, _config_loaded
+    with _config_lock:
+        if _config_loaded:
+            return True
+
+        if not load_secrets_from_aws():
+            load_dotenv()
+
+        DISCORD_CLIENT_ID = os.environ.get("DISCORD_CLIENT_ID")
+        DISCORD_CLIENT_SECRET = os.environ.get("DISCORD_CLIENT_SECRET")
+        SECRET_KEY = os.environ.get("SECRET_KEY")
+
+        _config_loaded = all([DISCORD_CLIENT_ID, DISCORD_CLIENT_SECRET, SECRET_KEY])
+        return _config_loaded
+
+
+if not LAZY_INIT:
+    if not load_config():
+        print("FATAL ERROR: Missing OAuth2 or SECRET_KEY environment variables!")
+        exit()
+    db_utils.connect()
 
 
 # --- Config ---
 API_BASE_URL = "http://3.83.248.40:8000"
 FRONTEND_URL = "https://d1wdxkpmgii4om.cloudfront.net/"
+REMINDER_CHANNEL_ID = "321078607772385280"  # change this
 
 DISCORD_AUTH_URL = "https://discord.com/oauth2/authorize"
 DISCORD_TOKEN_URL = "https://discord.com/api/oauth2/token"
 DISCORD_API_URL = "https://discord.com/api/users/@me"
 
+# Shared HTTP client for Discord: keep-alive pooling so logins reuse TLS connections
+HTTP_TIMEOUT_SECONDS = 10.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 5.0
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+TOKEN_CACHE_SIZE = 4096  # Verified JWTs kept in memory per process
+TOKEN_RECHECK_SECONDS = 30  # Cached tokens are re-checked against the shared revocations this often, so a logout reaches every worker
+
+ADMIN_USER_IDS = {"321078607772385280", "720677158736887808"}  # Same admins as the bot
+
+# Token buckets: (requests/second, burst). Writes get their own, tighter bucket per user
+RATE_LIMIT_IP = [Limit("all", rate=20, burst=60)]
+RATE_LIMIT_USER = [
+    Limit("all", rate=10, burst=30),
+    Limit("writes", rate=1, burst=10, methods=["POST", "DELETE"]),
+]
+
+REMINDER_PAGE_DEFAULT = 50
+REMINDER_PAGE_MAX = 100
+BATCH_MAX_OPERATIONS = 500  # Per /api/reminders/batch call
+
+# How often an open stream re-reads the version item on its own. Pokes (local writes, and every bump from any
+# process when STREAM_REDIS_URL is set) wake it sooner, so with Redis this is only a fallback
+STREAM_REDIS_URL = os.environ.get("STREAM_REDIS_URL")
+STREAM_POLL_SECONDS = float(os.environ.get("STREAM_POLL_SECONDS") or (60 if STREAM_REDIS_URL else 10))
+STREAM_HEARTBEAT_SECONDS = 15.0  # Comment line sent on idle streams so proxies keep them open
+STREAM_QUEUE_SIZE = 100          # Undelivered events per client before it is told to resync
+STREAM_MAX_PER_USER = 5
+STREAM_RETRY_MS = 3000           # EventSource reconnect delay
 
 
 # --- Pydantic Models ---
@@ -103,6 +179,28 @@ class ReminderItem(BaseModel):
     recurrence_rule: Optional[str] = None
 
 
+class BatchCreateRequest(BaseModel):
+    reminders: List[ReminderRequest]
+
+
+class BatchDeleteRequest(BaseModel):
+    reminder_ids: List[str]
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    status: str  # "created", "deleted" or "error"
+    reminder_id: Optional[str] = None
+    remind_time: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
+
 class User(BaseModel):
     id: str
     username: str
@@ -110,7 +208,36 @@ class User(BaseModel):
 
 
 # --- FastAPI App ---
-app = FastAPI(title="Prodibot API", version="1.0.0")
+app = FastAPI(title="Prodibot API", version="1.0.0", default_response_class=FastJSONResponse)
+
+
+# --- Rate Limiting ---
+def build_rate_limiter() -> RateLimiter:
+    """In-process buckets, or shared Redis-backed ones when RATE_LIMIT_REDIS_URL is set (multi-worker)."""
+    redis_url = os.environ.get("RATE_LIMIT_REDIS_URL")
+    store = RedisStore(redis_url) if redis_url else InMemoryStore()
+    return RateLimiter(store, ip_limits=RATE_LIMIT_IP, user_limits=RATE_LIMIT_USER)
+
+
+def rate_limit_subject(scope: dict) -> Optional[str]:
+    """The caller's user id if their token is already in the verified-token cache, else None."""
+    token = None
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            auth = value.decode("latin-1")
+            if auth.startswith("Bearer "):
+                token = auth.split(" ", 1)[1]
+            break
+    if token is None and scope["path"] == "/api/stream":
+        token = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("token", [None])[0]
+    user = token_cache.peek(token) if token else None
+    return user.id if user else None
+
+
+rate_limiter = build_rate_limiter()
+
+# Added before CORS so CORS wraps it, and 429s still carry the CORS headers the browser needs to read them
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, identify=rate_limit_subject)
 
 app.add_middleware(
     CORSMiddleware,
@@ -118,27 +245,130 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Retry-After"],
 )
 
 
+if LAZY_INIT:
+    @app.middleware("http")
+    async def ensure_config(request: Request, call_next):
+        """Loads secrets on the first request of a cold process; a single flag check after that."""
+        if not _config_loaded and not await asyncio.to_thread(load_config):
+            print("FATAL ERROR: Missing OAuth2 or SECRET_KEY environment variables!")
+            return JSONResponse(status_code=500, content={"detail": "Server is not configured."})
+        return await call_next(request)
+
+
+# --- HTTP Client ---
+_http_client: Optional["httpx.AsyncClient"] = None
+_http_client_loop = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Returns the shared AsyncClient, creating it on first use.
+    Pooled connections belong to one event loop, so a new loop gets a new client.
+    httpx is imported here because only the OAuth callback needs it.
+    """
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _http_client_loop = loop
+    return _http_client
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
 # --- JWT Helpers ---
+token_cache = VerifiedTokenCache(
+    maxsize=TOKEN_CACHE_SIZE,
+    recheck_after=TOKEN_RECHECK_SECONDS,
+    max_token_lifetime=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
 
-    expire = datetime.utcnow() + (
+    now = datetime.utcnow()
+    expire = now + (
         expires_delta if expires_delta else timedelta(minutes=15)
     )
-    to_encode.update({"exp": expire})
+    # iat_ms lets a token issued in the same second as a "log out everywhere" still be accepted
+    to_encode.update({"exp": expire, "iat": now, "iat_ms": int(time.time() * 1000)})
 
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(request: Request) -> User:
+def get_bearer_token(request: Request) -> Optional[str]:
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
+        return None
+    return auth_header.split(" ", 1)[1]
+
+
+async def get_current_user(request: Request) -> User:
+    token = get_bearer_token(request)
+    if token is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    return await verify_token(token)
 
-    token = auth_header.split(" ", 1)[1]
+
+async def get_stream_user(request: Request, token: Optional[str] = None) -> User:
+    """
+    Same as get_current_user, but also accepts ?token= because EventSource can't send headers.
+    Only the stream endpoint uses this, to keep tokens out of other URLs and logs.
+    """
+    token = get_bearer_token(request) or token
+    if token is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await verify_token(token)
+
+
+async def is_token_revoked(token: str, payload: dict) -> bool:
+    """
+    Checks this process's revocations, then the shared ones in DynamoDB
+    (logouts handled by other workers or before a restart).
+    """
+    if token_cache.is_revoked(token, payload):
+        return True
+    try:
+        revoked_before, token_revoked = await db_utils.get_token_revocation(
+            payload["sub"], token_cache.digest(token).hex()
+        )
+    except Exception as e:
+        print("[API ERROR] Revocation check failed:", e)
+        raise HTTPException(status_code=503, detail="Could not verify token")
+    if token_revoked:
+        token_cache.revoke(token, payload)
+        return True
+    if revoked_before is not None:
+        token_cache.revoke_subject(payload["sub"], revoked_before)
+        return token_cache.is_revoked(token, payload)
+    return False
+
+
+async def verify_token(token: str) -> User:
+    # Fast path: this exact token was verified less than TOKEN_RECHECK_SECONDS ago and hasn't expired or been revoked
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -148,7 +378,12 @@ async def get_current_user(request: Request) -> User:
         if uid is None:
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        return User(id=uid, username=username)
+        if await is_token_revoked(token, payload):
+            raise HTTPException(status_code=401, detail="Token revoked")
+
+        user = User(id=uid, username=username)
+        token_cache.put(token, user, payload)
+        return user
 
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
@@ -200,8 +435,10 @@ async def auth_callback(code: str):
 
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
+    client = get_http_client()
+
     # Exchange code for token
-    token_res = requests.post(DISCORD_TOKEN_URL, data=data, headers=headers)
+    token_res = await client.post(DISCORD_TOKEN_URL, data=data, headers=headers)
     print("[OAUTH] Token response:", token_res.status_code, token_res.text)
     token_res.raise_for_status()
 
@@ -209,7 +446,7 @@ async def auth_callback(code: str):
 
     # Fetch Discord user info
     headers = {"Authorization": f"Bearer {token_json['access_token']}"}
-    user_res = requests.get(DISCORD_API_URL, headers=headers)
+    user_res = await client.get(DISCORD_API_URL, headers=headers)
     print("[OAUTH] User response:", user_res.status_code, user_res.text)
     user_res.raise_for_status()
 
@@ -240,6 +477,29 @@ async def logout():
     return RedirectResponse(url=FRONTEND_URL)
 
 
+@app.post("/api/logout")
+async def revoke_token(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Revokes the caller's token for every API worker: the revocation is stored in
+    DynamoDB, and other workers stop accepting the token within TOKEN_RECHECK_SECONDS.
+    ?everywhere=true revokes every token issued to the user so far.
+    """
+    token = get_bearer_token(request)
+    payload = jwt.get_unverified_claims(token)
+    now = time.time()
+    try:
+        if request.query_params.get("everywhere") == "true":
+            await db_utils.revoke_user_tokens(current_user.id, now, now + ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+            token_cache.revoke_subject(current_user.id, now)
+        else:
+            await db_utils.revoke_token(token_cache.digest(token).hex(), payload.get("exp", now))
+            token_cache.revoke(token, payload)
+    except Exception as e:
+        print("[API ERROR]", e)
+        raise HTTPException(503, "Could not log out; try again.")
+    return {"message": "Logged out."}
+
+
 # ==========================
 #   REMINDER API
 # ==========================
@@ -249,17 +509,11 @@ async def create_reminder_endpoint(
     reminder: ReminderRequest,
     current_user: User = Depends(get_current_user)
 ):
-    channel_id = "321078607772385280"  # change this
+    channel_id = REMINDER_CHANNEL_ID
 
     try:
         time_str = f"{reminder.dueDate} {reminder.dueTime}"
-        remind_time = dateparser.parse(
-            time_str,
-            settings={
-                "TIMEZONE": "America/Chicago",
-                "RETURN_AS_TIMEZONE_AWARE": True
-            }
-        )
+        remind_time = await time_utils.parse_time_async(time_str)
 
         if not remind_time or remind_time <= datetime.now(db_utils.LOCAL_TZ):
             raise ValueError("Invalid or past time.")
@@ -279,6 +533,9 @@ async def create_reminder_endpoint(
         if not success:
             raise HTTPException(500, "Failed to save reminder to DB.")
 
+        await reminder_cache.invalidate(current_user.id)
+        event_hub.poke(current_user.id)
+
         return {
             "message": "Reminder created",
             "task": full_task,
@@ -290,37 +547,111 @@ async def create_reminder_endpoint(
         raise HTTPException(400, f"Error: {str(e)}")
 
 
+# --- Pagination / Conditional GET Helpers ---
+reminder_cache = build_reminder_cache()
+event_hub = EventHub(
+    db_utils.get_user_events,
+    poll_seconds=STREAM_POLL_SECONDS,
+    queue_size=STREAM_QUEUE_SIZE,
+    max_streams_per_user=STREAM_MAX_PER_USER,
+    redis_url=STREAM_REDIS_URL,
+    redis_channel=db_utils.STREAM_CHANGES_CHANNEL,
+)
+
+
+def encode_cursor(last_key: Optional[dict]) -> Optional[str]:
+    if not last_key:
+        return None
+    raw = json.dumps(last_key, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], user_id: str) -> Optional[dict]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_key = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise HTTPException(400, "Invalid cursor.")
+    if not isinstance(last_key, dict) or last_key.get("user_id") != user_id:
+        raise HTTPException(400, "Invalid cursor.")
+    return last_key
+
+
+def compute_etag(payload: list) -> str:
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True, default=str).encode()
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def reminder_row(item: dict) -> dict:
+    """
+    A ReminderItem-shaped dict built straight from a DynamoDB item.
+    The types are fixed here, which is what lets the list endpoint skip pydantic entirely.
+    """
+    rule = item.get("recurrence_rule")
+    return {
+        "reminder_id": str(item["reminder_id"]),
+        "task": str(item["task"]),
+        "remind_time_utc": str(item["remind_time_utc"]),
+        "is_recurring": bool(item.get("is_recurring", False)),
+        "recurrence_rule": None if rule is None else str(rule)
+    }
+
+
 @app.get("/api/my-reminders", response_model=List[ReminderItem])
-async def get_my_reminders(current_user: User = Depends(get_current_user)):
+async def get_my_reminders(
+    request: Request,
+    limit: int = Query(REMINDER_PAGE_DEFAULT, ge=1, le=REMINDER_PAGE_MAX),
+    cursor: Optional[str] = None,
+    status: str = "PENDING",
+    current_user: User = Depends(get_current_user)
+):
+    """
+    One page of the user's reminders, soonest first.
+    The next page's cursor comes back in X-Next-Cursor; send the ETag back
+    as If-None-Match to get a 304 when nothing has changed.
+    Pages are cached per user and revalidated against the user's change version.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    page_key = f"{status}|{limit}|{cursor or ''}"
+    start_key = decode_cursor(cursor, current_user.id)
+
     try:
-        response = await asyncio.to_thread(
-            db_utils.reminders_table.query,
-            KeyConditionExpression="user_id = :uid",
-            ExpressionAttributeValues={":uid": current_user.id}
-        )
-        items = response.get("Items", [])
-
-        pending = [
-            item for item in items
-            if item.get("status", "PENDING") == "PENDING"
-        ]
-        pending.sort(key=lambda r: r["remind_time_utc"])
-
-        return [
-            ReminderItem(
-                reminder_id=item["reminder_id"],
-                task=item["task"],
-                remind_time_utc=item["remind_time_utc"],
-                is_recurring=item.get("is_recurring", False),
-                recurrence_rule=item.get("recurrence_rule")
+        entry = await reminder_cache.lookup(current_user.id, page_key, db_utils.get_user_version)
+
+        if entry is None:
+            # Read the version *before* querying, so a change landing mid-query leaves the entry stale, never wrong
+            version = await db_utils.get_user_version(current_user.id)
+            items, last_key = await db_utils.query_user_reminders(
+                current_user.id, status=status, limit=limit, start_key=start_key
+            )
+
+            rows = [reminder_row(item) for item in items]
+            entry = await reminder_cache.store(
+                current_user.id, page_key, version, compute_etag(rows), rows, encode_cursor(last_key)
             )
-            for item in pending
-        ]
 
     except Exception as e:
         print("[API ERROR]", e)
         raise HTTPException(500, f"Error: {str(e)}")
 
+    headers = {"ETag": entry["etag"]}
+    if entry["next_cursor"]:
+        headers["X-Next-Cursor"] = entry["next_cursor"]
+    if etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Rows already have ReminderItem's shape and types, so they are encoded as-is;
+    # response_model stays for the OpenAPI schema only (returning a Response skips re-validation)
+    return FastJSONResponse(entry["rows"], headers=headers)
+
 
 @app.delete("/api/delete-reminder/{reminder_id}", status_code=200)
 async def delete_reminder_endpoint(
@@ -328,17 +659,173 @@ async def delete_reminder_endpoint(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        await asyncio.to_thread(
-            db_utils.reminders_table.delete_item,
-            Key={
-                "user_id": current_user.id,
-                "reminder_id": reminder_id
-            }
-        )
+        new_version = await db_utils.delete_reminder(current_user.id, reminder_id)
+        await reminder_cache.patch_remove(current_user.id, [reminder_id], new_version, compute_etag)
+        event_hub.poke(current_user.id)
         return {"message": "Deleted."}
 
     except Exception as e:
         print("[API ERROR]", e)
         raise HTTPException(500, f"Error: {str(e)}")
 
-handler = Magnum(app)
\ No newline at end of file
+
+# --- Batch Endpoints ---
+def check_batch_size(count: int):
+    if count == 0:
+        raise HTTPException(400, "Batch is empty.")
+    if count > BATCH_MAX_OPERATIONS:
+        raise HTTPException(413, f"At most {BATCH_MAX_OPERATIONS} operations per batch.")
+
+
+def batch_response(results: List[BatchItemResult]) -> BatchResponse:
+    failed = sum(1 for r in results if r.status == "error")
+    return BatchResponse(succeeded=len(results) - failed, failed=failed, results=results)
+
+
+@app.post("/api/reminders/batch", response_model=BatchResponse)
+async def create_reminders_batch(
+    batch: BatchCreateRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Creates many reminders in one call.
+    Every item is validated first; the valid ones are written together with
+    BatchWriteItem. Results come back per item, in request order.
+    """
+    check_batch_size(len(batch.reminders))
+
+    now = datetime.now(db_utils.LOCAL_TZ)
+    remind_times = await time_utils.parse_many_async(
+        [f"{r.dueDate} {r.dueTime}" for r in batch.reminders]
+    )
+
+    results: List[BatchItemResult] = []
+    items = []
+    for index, (reminder, remind_time) in enumerate(zip(batch.reminders, remind_times)):
+        if not reminder.taskName.strip():
+            results.append(BatchItemResult(index=index, status="error", error="Task name is required."))
+            continue
+        if not remind_time or remind_time <= now:
+            results.append(BatchItemResult(index=index, status="error", error="Invalid or past time."))
+            continue
+
+        full_task = reminder.taskName
+        if reminder.taskDesc:
+            full_task += f" (Notes: {reminder.taskDesc})"
+
+        item = db_utils.build_reminder_item(current_user.id, REMINDER_CHANNEL_ID, remind_time, full_task)
+        items.append(item)
+        results.append(BatchItemResult(
+            index=index, status="created",
+            reminder_id=item["reminder_id"], remind_time=remind_time.isoformat()
+        ))
+
+    if items:
+        try:
+            failed_ids, _ = await db_utils.put_user_reminders(current_user.id, items)
+        except Exception as e:
+            print("[API ERROR]", e)
+            raise HTTPException(500, f"Error: {str(e)}")
+
+        await reminder_cache.invalidate(current_user.id)
+        event_hub.poke(current_user.id)
+        for result in results:
+            if result.reminder_id in failed_ids:
+                result.status, result.error = "error", "Failed to save reminder to DB."
+
+    return batch_response(results)
+
+
+@app.delete("/api/reminders/batch", response_model=BatchResponse)
+async def delete_reminders_batch(
+    batch: BatchDeleteRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Deletes many of the caller's reminders in one call.
+    Ids that don't exist are reported as deleted, like the single-delete endpoint.
+    """
+    check_batch_size(len(batch.reminder_ids))
+
+    results: List[BatchItemResult] = []
+    reminder_ids = []
+    seen = set()
+    for index, reminder_id in enumerate(batch.reminder_ids):
+        # BatchWriteItem rejects a batch that touches the same key twice
+        if not reminder_id or reminder_id in seen:
+            error = "Duplicate reminder id." if reminder_id else "Missing reminder id."
+            results.append(BatchItemResult(index=index, status="error", reminder_id=reminder_id or None, error=error))
+            continue
+        seen.add(reminder_id)
+        reminder_ids.append(reminder_id)
+        results.append(BatchItemResult(index=index, status="deleted", reminder_id=reminder_id))
+
+    if reminder_ids:
+        try:
+            failed_ids, new_version = await db_utils.delete_user_reminders(current_user.id, reminder_ids)
+        except Exception as e:
+            print("[API ERROR]", e)
+            raise HTTPException(500, f"Error: {str(e)}")
+
+        deleted = [rid for rid in reminder_ids if rid not in failed_ids]
+        if failed_ids:
+            await reminder_cache.invalidate(current_user.id)
+        else:
+            await reminder_cache.patch_remove(current_user.id, deleted, new_version, compute_etag)
+        event_hub.poke(current_user.id)
+        for result in results:
+            if result.status == "deleted" and result.reminder_id in failed_ids:
+                result.status, result.error = "error", "Failed to delete reminder."
+
+    return batch_response(results)
+
+
+# --- Live Updates ---
+@app.get("/api/stream")
+async def stream_events(request: Request, current_user: User = Depends(get_stream_user)):
+    """
+    Server-Sent Events stream of the caller's reminder changes
+    (created, fired, rescheduled, updated, deleted, or resync when events were missed).
+    Each event's id is the user's change version, so EventSource resumes via Last-Event-ID.
+    """
+    subscription = event_hub.subscribe(current_user.id)
+    if subscription is None:
+        raise HTTPException(429, "Too many open streams.")
+
+    async def event_stream():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            await event_hub.replay(subscription, request.headers.get("Last-Event-ID"))
+            while not await request.is_disconnected():
+                event = await subscription.next_event(STREAM_HEARTBEAT_SECONDS)
+                yield format_sse(event) if event else ": keep-alive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# --- Admin ---
+@app.get("/api/admin/stats")
+async def admin_stats(current_user: User = Depends(get_current_user)):
+    """Counters for this API process: rate limiting, caches, and live streams."""
+    if current_user.id not in ADMIN_USER_IDS:
+        raise HTTPException(403, "Admins only.")
+    return {
+        "rate_limit": rate_limiter.stats(),
+        "token_cache": token_cache.stats(),
+        "reminder_cache": reminder_cache.stats(),
+        "streams": event_hub.stats(),
+    }
+
+
+@app.on_event("shutdown")
+async def close_event_hub():
+    await event_hub.close()
+
+
+handler = Magnum(app)
@@ -0,0 +1,71 @@
+# benchmarks/bench_auth.py
+"""Microbenchmark of per-request auth overhead in api_main.get_current_user, with and without the verified-JWT cache.
+
+Usage: python benchmarks/bench_auth.py [--requests 20000] [--tokens 50] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DISCORD_CLIENT_ID", "bench-client")
+os.environ.setdefault("DISCORD_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+
+class FakeRequest:
+    def __init__(self, token):
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+
+async def measure(api_main, requests, tokens, cached):
+    api_main.token_cache.clear()
+    start = time.perf_counter()
+    for i in range(len(requests)):
+        if not cached:
+            api_main.token_cache.clear()
+        await api_main.get_current_user(requests[i])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(requests),
+        "distinct_tokens": tokens,
+        "seconds": round(elapsed, 6),
+        "us_per_request": round(elapsed / len(requests) * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--tokens", type=int, default=50, help="Distinct users cycling through the cache")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    import api_main
+
+    tokens = [
+        api_main.create_access_token({"sub": str(1000 + i), "username": f"user{i}"}, timedelta(hours=1))
+        for i in range(args.tokens)
+    ]
+    requests = [FakeRequest(tokens[i % len(tokens)]) for i in range(args.requests)]
+
+    results = {
+        "uncached": asyncio.run(measure(api_main, requests, args.tokens, cached=False)),
+        "cached": asyncio.run(measure(api_main, requests, args.tokens, cached=True)),
+    }
+    results["speedup"] = round(results["uncached"]["us_per_request"] / results["cached"]["us_per_request"], 1)
+    results["cache_stats"] = api_main.token_cache.stats()
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
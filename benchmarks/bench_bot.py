@@ -0,0 +1,200 @@
+# benchmarks/bench_bot.py
+"""Offline benchmark suite for the bot: recurrence math, memory writes, CSV/ICS imports and the dispatch loop.
+
+Everything runs against benchmarks/fakes.py (in-memory DynamoDB with both tables and their
+indexes, and a fake Discord client), so results are reproducible without AWS or Discord. Calls
+still go through asyncio.to_thread and db_utils' metrics/tracing wrappers like in production;
+--db-latency-ms adds a fixed per-call delay to model the network round trip.
+
+Sections:
+  recurrence - parse_days_string and calculate_next_occurrence
+  memory     - add_memory_message on an active task state
+  imports    - CSV (whole file and streamed) and ICS parsing plus the batch writes behind them
+  dispatch   - one full check_reminders iteration with 10/1k/100k reminders due
+
+Save results as JSON per release and compare files to catch regressions.
+
+Usage: python benchmarks/bench_bot.py [--sections recurrence,memory,imports,dispatch] [--sizes 10,1000,100000]
+                                      [--iterations 20000] [--import-rows 5000] [--db-latency-ms 0] [--json results.json]
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import time
+
+import fakes  # Also puts the repo root on sys.path
+
+import db_utils
+
+DAYS_INPUTS = ["mon,wed,fri", "everyday", "tue/thu", "mwf", "Monday Tuesday", "sat, sun", "weekdays mtwhf"]
+CHANNEL_ID = 1000
+USER_ID = 4242
+
+
+def timed(fn, inputs, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(inputs[i % len(inputs)])
+    elapsed = time.perf_counter() - start
+    return {"iterations": iterations, "seconds": round(elapsed, 6), "us_per_call": round(elapsed / iterations * 1e6, 3)}
+
+
+async def timed_async(fn, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        await fn(i)
+    elapsed = time.perf_counter() - start
+    return {"iterations": iterations, "seconds": round(elapsed, 6), "us_per_call": round(elapsed / iterations * 1e6, 3)}
+
+
+# --- Sections ---
+
+def bench_recurrence(iterations):
+    now_local = datetime.datetime.now(db_utils.LOCAL_TZ)
+    cases = [(db_utils.parse_days_string(days), datetime.time(h, m)) for days in DAYS_INPUTS for h, m in ((7, 30), (18, 0))]
+    cases = [(weekdays, at) for weekdays, at in cases if weekdays]
+    return {
+        "parse_days_string": timed(db_utils.parse_days_string, DAYS_INPUTS, iterations),
+        "calculate_next_occurrence": timed(
+            lambda case: db_utils.calculate_next_occurrence(now_local, case[0], case[1]), cases, iterations),
+    }
+
+
+async def bench_memory(iterations, db_latency):
+    fake = fakes.install_dynamodb(db_latency)
+    await db_utils.create_task_state(USER_ID, "Benchmark task", "Hey, this is your reminder to: **Benchmark task**")
+    fake.reset_counts()
+    result = await timed_async(
+        lambda i: db_utils.add_memory_message(USER_ID, "user" if i % 2 else "assistant", f"message {i}", 8), iterations)
+    result["db_calls"] = fake.call_counts()
+    return result
+
+
+def make_csv(rows):
+    lines = ["Task,Course,DueDate,DueTime"]
+    for i in range(rows):
+        lines.append(f"Assignment {i},CS {100 + i % 7},2030-{1 + i % 12:02d}-{1 + i % 28:02d},{i % 24:02d}:{i % 4 * 15:02d}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def make_ics(events):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//prodibot//bench//EN"]
+    for i in range(events):
+        lines += [
+            "BEGIN:VEVENT", f"UID:{i}@bench.prodibot", f"SUMMARY:Calendar event {i}",
+            f"DTSTART:2030{1 + i % 12:02d}{1 + i % 28:02d}T{i % 24:02d}0000Z", "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+async def bench_imports(rows, db_latency):
+    import import_utils
+
+    results = {"rows": rows}
+    now_local = datetime.datetime.now(db_utils.LOCAL_TZ)
+    csv_bytes = make_csv(rows)
+    ics_bytes = make_ics(rows)
+
+    async def run(name, parse, write):
+        fake = fakes.install_dynamodb(db_latency)
+        start = time.perf_counter()
+        entries = await asyncio.to_thread(parse) if parse else None
+        parsed = time.perf_counter()
+        added = await write(entries)
+        done = time.perf_counter()
+        results[name] = {
+            "parse_seconds": round(parsed - start, 6), "write_seconds": round(done - parsed, 6),
+            "total_seconds": round(done - start, 6), "rows_per_sec": round(rows / (done - start), 1),
+            "added": added, "stored": len(fake.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME).items),
+            "db_calls": fake.call_counts(),
+        }
+
+    async def write_entries(collected):
+        entries, past, errors = collected
+        written, failed = await import_utils.write_entries(USER_ID, CHANNEL_ID, entries)
+        return written
+
+    async def stream(_):
+        async def chunks():
+            for i in range(0, len(csv_bytes), import_utils.STREAM_CHUNK_SIZE):
+                yield csv_bytes[i:i + import_utils.STREAM_CHUNK_SIZE]
+        added, past, errors = await import_utils.stream_csv_import(chunks(), USER_ID, CHANNEL_ID)
+        return added
+
+    await run("csv", lambda: import_utils.collect_csv_entries(csv_bytes, now_local), write_entries)
+    await run("csv_streamed", None, stream)
+    await run("ics", lambda: import_utils.collect_ics_entries(ics_bytes, now_local), write_entries)
+    return results
+
+
+async def bench_dispatch(bot, sizes, db_latency):
+    results = {}
+    for size in sizes:
+        fake = fakes.install_dynamodb(db_latency)
+        discord = fakes.FakeDiscord()
+        discord.install(bot)
+        bot.series_index.loaded_at = None
+        await bot.check_reminders() # Warm-up with nothing due: loads the series index and warms the caches
+
+        due_at = datetime.datetime.now(db_utils.LOCAL_TZ) - datetime.timedelta(minutes=1)
+        # One reminder per user, so none of them is held back by another active task
+        fake.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME).load(
+            db_utils.build_reminder_item(10_000_000 + i, CHANNEL_ID, due_at, f"Due task {i}") for i in range(size)
+        )
+        fake.reset_counts()
+        start = time.perf_counter()
+        await bot.check_reminders()
+        elapsed = time.perf_counter() - start
+        results[size] = {
+            "seconds": round(elapsed, 6),
+            "us_per_reminder": round(elapsed / size * 1e6, 1),
+            "sent": dict(discord.sent),
+            "left_pending": len(fake.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME).items),
+            "task_states": sum(1 for (user_id,) in fake.Table(db_utils.DYNAMO_STATE_TABLE_NAME).items
+                               if not user_id.startswith(db_utils.VERSION_KEY_PREFIX)),
+            "db_calls": fake.call_counts(),
+        }
+    return results
+
+
+async def run(args):
+    sections = set(args.sections.split(","))
+    db_latency = args.db_latency_ms / 1000
+    results = {
+        "python": platform.python_version(), "platform": platform.platform(),
+        "db_latency_ms": args.db_latency_ms, "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    if "recurrence" in sections:
+        results["recurrence"] = bench_recurrence(args.iterations)
+    if "memory" in sections:
+        results["memory"] = await bench_memory(max(1, args.iterations // 20), db_latency)
+    if "imports" in sections:
+        results["imports"] = await bench_imports(args.import_rows, db_latency)
+    if "dispatch" in sections:
+        bot = fakes.import_bot()
+        results["dispatch"] = await bench_dispatch(bot, [int(s) for s in args.sizes.split(",")], db_latency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", default="recurrence,memory,imports,dispatch")
+    parser.add_argument("--sizes", default="10,1000,100000", help="Due reminders per check_reminders run")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--import-rows", type=int, default=5000)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="Added to every fake DynamoDB call")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
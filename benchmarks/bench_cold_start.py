@@ -0,0 +1,94 @@
+# benchmarks/bench_cold_start.py
+"""Cold-start benchmark for the API: fresh interpreters timed from process start to the first served request.
+
+Each run spawns a new Python process that imports api_main (the Lambda init phase) and then
+serves one authenticated GET /api/me through the ASGI app (the first invocation), so time
+deferred by PRODIBOT_LAZY_INIT=1 shows up in the first request instead of disappearing.
+Secrets Manager is only reached if AWS credentials are available; otherwise every run takes
+the .env fallback, so compare modes on the same machine.
+
+Usage: python benchmarks/bench_cold_start.py [--runs 10] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+import api_main
+imported = time.perf_counter()
+
+async def first_request():
+    import httpx
+    token = api_main.create_access_token({"sub": "1", "username": "bench"})
+    transport = httpx.ASGITransport(app=api_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        response = await client.get("/api/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200, response.text
+
+# In lazy mode the token can only be signed once secrets are loaded, as the first request would do
+if api_main.LAZY_INIT:
+    api_main.load_config()
+asyncio.run(first_request())
+served = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_request_ms": (served - imported) * 1000,
+                  "modules": len(sys.modules)}))
+"""
+
+
+def bench_env(lazy):
+    env = dict(os.environ)
+    env.setdefault("DISCORD_CLIENT_ID", "bench-client")
+    env.setdefault("DISCORD_CLIENT_SECRET", "bench-secret")
+    env.setdefault("SECRET_KEY", "bench-secret-key")
+    env["PRODIBOT_LAZY_INIT"] = "1" if lazy else "0"
+    return env
+
+
+def run_once(lazy):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=REPO_ROOT, env=bench_env(lazy),
+                            capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"Cold-start run failed:\n{result.stderr[-2000:]}")
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["process_wall_ms"] = wall
+    return sample
+
+
+def summarize(samples):
+    summary = {
+        key: {"median": round(statistics.median(s[key] for s in samples), 1),
+              "min": round(min(s[key] for s in samples), 1)}
+        for key in ("import_ms", "first_request_ms", "process_wall_ms")
+    }
+    summary["modules_loaded"] = samples[-1]["modules"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = {"runs": args.runs, "python": sys.version.split()[0]}
+    for mode, lazy in (("eager", False), ("lazy", True)):
+        results[mode] = summarize([run_once(lazy) for _ in range(args.runs)])
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
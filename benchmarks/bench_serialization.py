@@ -0,0 +1,128 @@
+# benchmarks/bench_serialization.py
+"""Benchmark of /api/my-reminders response serialization at 10/100/1000 reminders per page.
+
+Compares, through the ASGI app in-process:
+  validated - the previous path: a ReminderItem per row, re-validated and encoded via response_model
+  fast      - rows returned as-is through the default response class (ORJSONResponse when orjson is installed)
+  endpoint  - the real /api/my-reminders with DynamoDB stubbed out and the page cache warm
+                (only for sizes up to REMINDER_PAGE_MAX, the largest page the API serves)
+
+Usage: python benchmarks/bench_serialization.py [--requests 200] [--sizes 10,100,1000] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DISCORD_CLIENT_ID", "bench-client")
+os.environ.setdefault("DISCORD_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+
+def make_items(count):
+    return [
+        {
+            "user_id": "1000", "reminder_id": str(uuid.uuid4()), "channel_id": "1",
+            "remind_time_utc": f"2030-01-{1 + i % 28:02d}T{i % 24:02d}:00:00-06:00",
+            "task": f"Benchmark task number {i} (Notes: a few words of description)",
+            "status": "PENDING", "is_recurring": i % 5 == 0,
+            "recurrence_rule": "DAILY:09:00" if i % 5 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def build_routes(api_main, rows):
+    from fastapi import APIRouter
+
+    router = APIRouter()
+
+    @router.get("/bench/validated", response_model=List[api_main.ReminderItem])
+    async def validated():
+        return [api_main.ReminderItem(**row) for row in rows]
+
+    @router.get("/bench/fast", response_model=List[api_main.ReminderItem])
+    async def fast():
+        return api_main.FastJSONResponse(rows)
+
+    api_main.app.include_router(router)
+
+
+async def measure(client, path, headers, requests):
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    body_bytes = len(response.content)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path, headers=headers)
+    elapsed = time.perf_counter() - start
+    return {"us_per_request": round(elapsed / requests * 1e6, 1), "body_bytes": body_bytes}
+
+
+async def run(sizes, requests):
+    import httpx
+    import api_main
+    import db_utils
+
+    async def get_user_version(user_id):
+        return 1
+
+    db_utils.get_user_version = get_user_version
+    token = api_main.create_access_token({"sub": "1000", "username": "bench"}, timedelta(hours=1))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {"response_class": api_main.FastJSONResponse.__name__, "requests": requests, "sizes": {}}
+    rows_by_size = {size: [api_main.reminder_row(item) for item in make_items(size)] for size in sizes}
+    current = {"rows": []}
+    build_routes(api_main, current["rows"])
+
+    transport = httpx.ASGITransport(app=api_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        for size in sizes:
+            current["rows"][:] = rows_by_size[size]
+            items = make_items(size)
+
+            async def query_user_reminders(user_id, status="PENDING", limit=50, start_key=None):
+                return items[:limit], None
+
+            db_utils.query_user_reminders = query_user_reminders
+            await api_main.reminder_cache.invalidate("1000")
+
+            validated = await measure(client, "/bench/validated", headers, requests)
+            fast = await measure(client, "/bench/fast", headers, requests)
+            endpoint = None
+            if size <= api_main.REMINDER_PAGE_MAX:
+                endpoint = await measure(client, f"/api/my-reminders?limit={size}", headers, requests)
+            results["sizes"][size] = {
+                "validated": validated,
+                "fast": fast,
+                "endpoint": endpoint,
+                "speedup": round(validated["us_per_request"] / fast["us_per_request"], 2),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = asyncio.run(run(sizes, args.requests))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
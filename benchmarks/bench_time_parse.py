@@ -0,0 +1,62 @@
+# benchmarks/bench_time_parse.py
+"""Measures time-string parse throughput: raw dateparser vs. the time_utils fast paths and cache.
+
+Usage: python benchmarks/bench_time_parse.py [--iterations 2000] [--json results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time_utils
+
+FAST_INPUTS = [
+    "2025-12-01 14:30", "2025-12-01T09:00:00-06:00", "12/01/2025 14:30",
+    "12/01/2025 2:30 PM", "9:45", "5pm",
+]
+SLOW_INPUTS = ["tomorrow at 5pm", "next friday 9am", "in 2 hours", "Dec 3rd at noon"]
+
+
+def timed(fn, inputs, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(inputs[i % len(inputs)])
+    elapsed = time.perf_counter() - start
+    return {"iterations": iterations, "seconds": round(elapsed, 6), "parses_per_sec": round(iterations / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+
+    start = time.perf_counter()
+    time_utils._parse_slow(SLOW_INPUTS[0])
+    results["dateparser_first_call_seconds"] = round(time.perf_counter() - start, 6)
+
+    import dateparser
+    def raw(text):
+        return dateparser.parse(text, settings=time_utils.DATEPARSER_SETTINGS)
+    results["dateparser_raw_fast_inputs"] = timed(raw, FAST_INPUTS, args.iterations)
+    results["dateparser_raw_slow_inputs"] = timed(raw, SLOW_INPUTS, args.iterations)
+    results["dateparser_en_only_slow_inputs"] = timed(time_utils._parse_slow, SLOW_INPUTS, args.iterations)
+    results["fast_path_only"] = timed(time_utils.parse_fast, FAST_INPUTS, args.iterations * 10)
+
+    time_utils._parse_cached.cache_clear()
+    results["parse_time_cached_slow_inputs"] = timed(time_utils.parse_time, SLOW_INPUTS, args.iterations * 10)
+    results["cache_info"] = time_utils.cache_info()._asdict()
+
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
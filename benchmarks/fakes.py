@@ -0,0 +1,383 @@
+# benchmarks/fakes.py
+"""Offline stand-ins for DynamoDB and Discord, shared by the benchmarks and the load generator.
+
+FakeDynamoDB keeps both tables (and their GSIs) in memory and understands the key conditions,
+filters and update expressions that db_utils and bot.py actually send; install_dynamodb() swaps it in
+behind db_utils' table handles, so calls still go through asyncio.to_thread and the metrics/tracing
+wrappers exactly as they do against AWS. FakeDiscord answers fetch_user/fetch_channel and
+records what the bot sends. Both can add a fixed per-call latency to model the network.
+"""
+import asyncio
+import collections
+import functools
+import os
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Offline defaults, set before log_utils/tracing/bot read them: dummy credentials, no log or trace
+# files and no INFO console logs, unless the caller's environment asks for them
+os.environ.setdefault("DISCORD_TOKEN", "offline-token")
+os.environ.setdefault("OPENAI_API_KEY", "offline-key")
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("TRACE_FILE", "")
+
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "<=": lambda a, b: a <= b,
+    "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b,
+    ">": lambda a, b: a > b,
+}
+_CLAUSE = re.compile(r"^\s*([#\w.]+)\s*(<=|>=|=|<|>)\s*(:\w+)\s*$")
+_FUNCTION = re.compile(r"^\s*(attribute_exists|attribute_not_exists|begins_with)\((.*)\)\s*$")
+_PATH_INDEX = re.compile(r"^(\w+)\[(\d+)\]$")
+
+
+def _split_top_level(text, separator=","):
+    """Splits on `separator` outside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current)); current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [p.strip() for p in parts if p.strip()]
+
+
+class _Expression:
+    """Resolves #names and :values for one request."""
+
+    def __init__(self, names=None, values=None):
+        self.names = names or {}
+        self.values = values or {}
+
+    def name(self, token):
+        return self.names.get(token, token)
+
+    def operand(self, token, item):
+        token = token.strip()
+        if token.startswith(":"):
+            return self.values[token]
+        call = re.match(r"^(if_not_exists|list_append)\((.*)\)$", token)
+        if call:
+            args = _split_top_level(call.group(2))
+            if call.group(1) == "if_not_exists":
+                attribute = self.name(args[0])
+                return item[attribute] if attribute in item else self.operand(args[1], item)
+            return list(self.operand(args[0], item)) + list(self.operand(args[1], item))
+        return item.get(self.name(token))
+
+    def condition(self, text):
+        """A predicate for a filter/key condition, with this request's :values bound in."""
+        predicate = _compile_condition(text, tuple(sorted(self.names.items())))
+        return lambda item: predicate(item, self.values)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_condition(text, names):
+    """Compiles comparisons and functions joined by AND/OR once per expression, so scans don't re-parse per item."""
+    names = dict(names)
+    alternatives = [
+        [_compile_clause(clause, names) for clause in re.split(r"\s+AND\s+", alternative, flags=re.IGNORECASE)]
+        for alternative in re.split(r"\s+OR\s+", text, flags=re.IGNORECASE)
+    ]
+    return lambda item, values: any(all(clause(item, values) for clause in clauses) for clauses in alternatives)
+
+
+def _compile_clause(clause, names):
+    function = _FUNCTION.match(clause)
+    if function:
+        args = _split_top_level(function.group(2))
+        attribute = names.get(args[0], args[0])
+        if function.group(1) == "attribute_exists":
+            return lambda item, values: attribute in item
+        if function.group(1) == "attribute_not_exists":
+            return lambda item, values: attribute not in item
+        placeholder = args[1]
+        return lambda item, values: str(item.get(attribute, "")).startswith(values[placeholder])
+    match = _CLAUSE.match(clause)
+    if not match:
+        raise ValueError(f"FakeTable does not understand condition: {clause!r}")
+    attribute = names.get(match.group(1), match.group(1))
+    compare, placeholder = _COMPARISONS[match.group(2)], match.group(3)
+    return lambda item, values: attribute in item and compare(item[attribute], values[placeholder])
+
+
+class FakeTable:
+    """One in-memory DynamoDB table with optional GSIs ({index_name: (hash_attr, range_attr)})."""
+
+    def __init__(self, name, hash_key, range_key=None, indexes=None, latency=0.0):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.indexes = indexes or {}
+        self.latency = latency
+        self.items = {}
+        self.calls = collections.Counter()
+
+    def _key(self, key):
+        return (key[self.hash_key], key.get(self.range_key)) if self.range_key else (key[self.hash_key],)
+
+    def _call(self, operation):
+        self.calls[operation] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_item(self, Key, ProjectionExpression=None, **kwargs):
+        self._call("get_item")
+        item = self.items.get(self._key(Key))
+        if item is None:
+            return {}
+        if ProjectionExpression:
+            wanted = {p.strip() for p in ProjectionExpression.split(",")}
+            return {"Item": {k: v for k, v in item.items() if k in wanted}}
+        return {"Item": dict(item)}
+
+    def put_item(self, Item, **kwargs):
+        self._call("put_item")
+        self.items[self._key(Item)] = dict(Item)
+        return {}
+
+    def delete_item(self, Key, **kwargs):
+        self._call("delete_item")
+        self.items.pop(self._key(Key), None)
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+                    ReturnValues=None, **kwargs):
+        self._call("update_item")
+        expression = _Expression(ExpressionAttributeNames, ExpressionAttributeValues)
+        item = dict(self.items.get(self._key(Key)) or Key)
+        changed = set()
+        sections = re.split(r"\b(SET|REMOVE|ADD)\b", UpdateExpression, flags=re.IGNORECASE)
+        for action, body in zip(sections[1::2], sections[2::2]):
+            action = action.upper()
+            if action == "SET":
+                for assignment in _split_top_level(body):
+                    target, value = assignment.split("=", 1)
+                    attribute = expression.name(target.strip())
+                    item[attribute] = expression.operand(value, item); changed.add(attribute)
+            elif action == "ADD":
+                for addition in _split_top_level(body):
+                    target, value = addition.split()
+                    attribute = expression.name(target)
+                    item[attribute] = item.get(attribute, 0) + expression.values[value]; changed.add(attribute)
+            else:
+                removals = collections.defaultdict(set)
+                for path in _split_top_level(body):
+                    indexed = _PATH_INDEX.match(path)
+                    if indexed:
+                        removals[expression.name(indexed.group(1))].add(int(indexed.group(2)))
+                    else:
+                        item.pop(expression.name(path), None)
+                for attribute, positions in removals.items():
+                    # Indexes refer to the list as it was before this update, like DynamoDB
+                    item[attribute] = [v for i, v in enumerate(item.get(attribute, [])) if i not in positions]
+                    changed.add(attribute)
+        self.items[self._key(Key)] = item
+        if ReturnValues == "UPDATED_NEW":
+            return {"Attributes": {k: item[k] for k in changed if k in item}}
+        return {}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, ExpressionAttributeNames=None, IndexName=None,
+              FilterExpression=None, Limit=None, ExclusiveStartKey=None, ScanIndexForward=True, **kwargs):
+        self._call("query")
+        expression = _Expression(ExpressionAttributeNames, ExpressionAttributeValues)
+        hash_attr, range_attr = self.indexes[IndexName] if IndexName else (self.hash_key, self.range_key)
+        in_key_range = expression.condition(KeyConditionExpression)
+        matches = [item for item in self.items.values() if hash_attr in item and in_key_range(item)]
+        matches.sort(key=lambda item: (item.get(range_attr) or "", item.get(self.range_key) or ""), reverse=not ScanIndexForward)
+        return self._page(matches, expression, FilterExpression, Limit, ExclusiveStartKey)
+
+    def scan(self, FilterExpression=None, ExpressionAttributeValues=None, ExpressionAttributeNames=None,
+             Limit=None, ExclusiveStartKey=None, **kwargs):
+        self._call("scan")
+        expression = _Expression(ExpressionAttributeNames, ExpressionAttributeValues)
+        return self._page(list(self.items.values()), expression, FilterExpression, Limit, ExclusiveStartKey)
+
+    def _page(self, items, expression, filter_expression, limit, start_key):
+        # Limit counts items evaluated before the filter, and the page key is an opaque offset here
+        start = start_key["_offset"] if start_key else 0
+        end = len(items) if limit is None else min(len(items), start + limit)
+        keep = expression.condition(filter_expression) if filter_expression else None
+        page = [dict(item) for item in items[start:end] if keep is None or keep(item)]
+        response = {"Items": page, "Count": len(page), "ScannedCount": end - start}
+        if end < len(items):
+            response["LastEvaluatedKey"] = {"_offset": end}
+        return response
+
+    def load(self, items):
+        """Bulk-inserts items without counting calls (test setup)."""
+        for item in items:
+            self.items[self._key(item)] = dict(item)
+
+
+class _FakeClient:
+    def __init__(self, resource):
+        self.resource = resource
+
+    def batch_write_item(self, RequestItems, **kwargs):
+        for table_name, requests in RequestItems.items():
+            table = self.resource.Table(table_name)
+            table._call("batch_write_item")
+            for request in requests:
+                if "PutRequest" in request:
+                    table.items[table._key(request["PutRequest"]["Item"])] = dict(request["PutRequest"]["Item"])
+                else:
+                    table.items.pop(table._key(request["DeleteRequest"]["Key"]), None)
+        return {"UnprocessedItems": {}}
+
+
+class _FakeMeta:
+    def __init__(self, resource):
+        self.client = _FakeClient(resource)
+
+
+class FakeDynamoDB:
+    """Stands in for boto3.resource('dynamodb') with ProdibotDB and ProdibotStateDB and their indexes."""
+
+    def __init__(self, latency=0.0):
+        import db_utils
+
+        self.tables = {
+            db_utils.DYNAMO_REMINDER_TABLE_NAME: FakeTable(
+                db_utils.DYNAMO_REMINDER_TABLE_NAME, "user_id", "reminder_id", latency=latency, indexes={
+                    db_utils.DYNAMO_REMINDER_GSI_NAME: ("status", "remind_time_utc"),
+                    db_utils.DYNAMO_REMINDER_USER_GSI_NAME: ("user_id", "remind_time_utc"),
+                }),
+            db_utils.DYNAMO_STATE_TABLE_NAME: FakeTable(
+                db_utils.DYNAMO_STATE_TABLE_NAME, "user_id", latency=latency, indexes={
+                    db_utils.DYNAMO_STATE_GSI_NAME: ("status", "next_action_time"),
+                }),
+        }
+        self.meta = _FakeMeta(self)
+
+    def Table(self, name):
+        return self.tables[name]
+
+    def call_counts(self):
+        """{'ProdibotDB.query': n, ...} across both tables."""
+        return {f"{name}.{op}": n for name, table in self.tables.items() for op, n in sorted(table.calls.items())}
+
+    def reset_counts(self):
+        for table in self.tables.values():
+            table.calls.clear()
+
+
+def install_dynamodb(latency=0.0):
+    """Points db_utils at a fresh FakeDynamoDB, keeping its metrics/tracing wrappers. Returns the fake."""
+    import db_utils
+
+    fake = FakeDynamoDB(latency)
+    db_utils.dynamodb = db_utils._LazyResource(lambda: fake)
+    db_utils.reminders_table = db_utils._LazyResource(
+        lambda: fake.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME), metric_label="reminders")
+    db_utils.state_table = db_utils._LazyResource(
+        lambda: fake.Table(db_utils.DYNAMO_STATE_TABLE_NAME), metric_label="state")
+    return fake
+
+
+# --- Discord ---
+
+class _Typing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel:
+    def __init__(self, discord, channel_id):
+        self.discord = discord
+        self.id = channel_id
+
+    async def send(self, content=None, **kwargs):
+        return await self.discord._deliver(("channel", self.id), content)
+
+    def typing(self):
+        return _Typing()
+
+
+class FakeUser:
+    def __init__(self, discord, user_id):
+        self.discord = discord
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.bot = False
+
+    async def send(self, content=None, **kwargs):
+        return await self.discord._deliver(("dm", self.id), content)
+
+
+class FakeSentMessage:
+    def __init__(self, content):
+        self.content = content
+
+    async def edit(self, content=None, **kwargs):
+        self.content = content
+
+
+class FakeDiscord:
+    """Answers bot.fetch_user / bot.fetch_channel and counts (optionally keeps) everything sent.
+    `on_send(target, content)` lets a simulation react to outgoing messages (e.g. schedule a reply)."""
+
+    def __init__(self, latency=0.0, keep_messages=False, on_send=None):
+        self.latency = latency
+        self.keep_messages = keep_messages
+        self.on_send = on_send
+        self.users = {}
+        self.channels = {}
+        self.sent = collections.Counter()
+        self.messages = []
+        self.fetches = 0
+
+    async def _io(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def fetch_user(self, user_id):
+        self.fetches += 1
+        await self._io()
+        if user_id not in self.users:
+            self.users[user_id] = FakeUser(self, user_id)
+        return self.users[user_id]
+
+    async def fetch_channel(self, channel_id):
+        self.fetches += 1
+        await self._io()
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(self, channel_id)
+        return self.channels[channel_id]
+
+    async def _deliver(self, target, content):
+        await self._io()
+        self.sent[target[0]] += 1
+        if self.keep_messages:
+            self.messages.append((target, content))
+        if self.on_send:
+            self.on_send(target, content)
+        return FakeSentMessage(content)
+
+    def install(self, bot_module):
+        bot_module.bot.fetch_user = self.fetch_user
+        bot_module.bot.fetch_channel = self.fetch_channel
+
+
+def import_bot():
+    """Imports bot.py with the offline defaults above. Secrets Manager is still tried if AWS credentials exist."""
+    import bot
+
+    return bot
@@ -0,0 +1,155 @@
+# benchmarks/load_api.py
+"""HTTP load test for a running API server: GET /api/my-reminders and POST /api/create-reminder.
+
+Start the server the way production does, then point this at it from another shell:
+
+    SECRET_KEY=... API_WORKERS=4 python server.py
+    SECRET_KEY=... python benchmarks/load_api.py --url http://127.0.0.1:8000 --concurrency 64 --duration 30
+
+Requests are signed with a JWT made from SECRET_KEY for --user-id, so they hit the real tables:
+use a test account. Created reminders are tagged "[load-test]" and batch-deleted afterwards
+unless --keep is passed. All traffic comes from one user and one IP, so api_main's
+RATE_LIMIT_* buckets apply: 429s show up under "statuses", and measuring raw throughput
+means raising those limits on the server under test. Record the JSON output (plus worker count, instance type and
+whether uvloop/httptools were active) alongside the release being measured.
+
+Usage: python benchmarks/load_api.py [--url URL] [--concurrency 64] [--duration 30] [--user-id ID] [--keep] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+LOAD_TEST_TAG = "[load-test]"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def make_token(user_id):
+    from jose import jwt
+
+    now = datetime.utcnow()
+    claims = {"sub": user_id, "username": "load-test", "iat": now, "exp": now + timedelta(hours=2)}
+    return jwt.encode(claims, os.environ["SECRET_KEY"], algorithm="HS256")
+
+
+def create_payload(i):
+    due = datetime.now() + timedelta(days=30, minutes=i % 1440)
+    return {
+        "taskName": f"{LOAD_TEST_TAG} task {i}",
+        "taskDesc": None,
+        "dueDate": due.strftime("%Y-%m-%d"),
+        "dueTime": due.strftime("%H:%M"),
+        "priority": "low",
+    }
+
+
+async def scenario(client, name, send, concurrency, duration):
+    latencies = []; statuses = Counter(); counter = {"i": 0}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            counter["i"] += 1
+            start = time.perf_counter()
+            try:
+                response = await send(counter["i"])
+                statuses[response.status_code] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    result = {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": sum(statuses.values()),
+        "requests_per_sec": round(sum(statuses.values()) / wall, 1),
+        "statuses": {str(k): v for k, v in statuses.items()},
+    }
+    if latencies:
+        result.update({
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "max_ms": round(max(latencies) * 1000, 1),
+        })
+    return result
+
+
+async def cleanup(client):
+    """Batch-deletes every reminder this tool created for the test user."""
+    ids = []; cursor = None
+    while True:
+        params = {"limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/my-reminders", params=params)
+        response.raise_for_status()
+        ids += [r["reminder_id"] for r in response.json() if r["task"].startswith(LOAD_TEST_TAG)]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    for i in range(0, len(ids), 500):
+        await client.request("DELETE", "/api/reminders/batch", json={"reminder_ids": ids[i:i + 500]})
+    return len(ids)
+
+
+async def run(args):
+    import httpx
+
+    headers = {"Authorization": f"Bearer {make_token(args.user_id)}"}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=30.0) as client:
+        (await client.get("/api/me")).raise_for_status()
+
+        async def list_reminders(i):
+            return await client.get("/api/my-reminders")
+
+        async def create_reminder(i):
+            return await client.post("/api/create-reminder", json=create_payload(i))
+
+        results = {
+            "url": args.url,
+            "duration_seconds": args.duration,
+            "scenarios": [
+                await scenario(client, "GET /api/my-reminders", list_reminders, args.concurrency, args.duration),
+                await scenario(client, "POST /api/create-reminder", create_reminder, args.concurrency, args.duration),
+            ],
+        }
+        if not args.keep:
+            results["cleaned_up"] = await cleanup(client)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per scenario")
+    parser.add_argument("--user-id", default="load-test-user")
+    parser.add_argument("--keep", action="store_true", help="Don't delete the reminders created by the run")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    if "SECRET_KEY" not in os.environ:
+        raise SystemExit("SECRET_KEY must match the server's to sign test tokens.")
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
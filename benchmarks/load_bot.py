@@ -0,0 +1,360 @@
+# benchmarks/load_bot.py
+"""Synthetic end-to-end load for the bot: N simulated users with M reminders each, over H simulated hours.
+
+The real bot.py handlers do the work: check_reminders and check_followups run on their 15s/30s
+cadence and user replies arrive through on_message, all driven through a fake gateway with
+benchmarks/fakes.py standing in for DynamoDB and Discord and a canned LLM for OpenAI. Time is
+simulated: the clock jumps between ticks and runs at real speed while handlers execute, so a slow
+handler shows up as dispatch lag just as it would in production, while idle hours pass instantly.
+
+Each simulated user answers "Did you get that done?" after a lognormal delay, either with a done
+or a not-done phrase, sometimes chats while snoozed, and sometimes ghosts (never answers, so the
+8h nudges and the 24h despawn kick in). Per simulated hour the report gives dispatch lag
+(simulated seconds from remind_time to delivery), DM handling latency (wall clock, including the
+fake DB/LLM/Discord latencies), and DynamoDB, LLM and Discord call counts.
+
+Handlers due in the same tick run concurrently; a DM arriving while a tick is still running waits
+for the next tick, so very slow ticks slightly overstate reply latency.
+
+Usage: python benchmarks/load_bot.py [--users 1000] [--reminders 5] [--hours 24] [--seed 1]
+                                     [--db-latency-ms 5] [--llm-latency-ms 400] [--discord-latency-ms 40]
+                                     [--ghost-rate 0.1] [--done-rate 0.6] [--json results.json]
+"""
+import argparse
+import asyncio
+import collections
+import datetime
+import heapq
+import json
+import math
+import random
+import time
+import types
+
+import fakes  # Also puts the repo root on sys.path
+
+import db_utils
+import metrics
+
+CHANNEL_ID = 1000
+FIRST_USER_ID = 20_000_000
+REMINDER_TICK = datetime.timedelta(seconds=15) # bot.check_reminders cadence
+FOLLOWUP_TICK = datetime.timedelta(seconds=30) # bot.check_followups cadence
+NUDGE_MARKER = "Did you get that done?" # Every reminder and nudge the bot sends ends with this question
+DESPAWN_MARKER = "I'm going to close this reminder"
+RECURRING_RULE = "WEEKLY:0,1,2,3,4:09:00"
+
+DONE_REPLIES = ["done!", "yep, finished it", "all set", "I did it", "finished just now", "Done ✅"]
+NOT_DONE_REPLIES = ["not yet", "in a bit", "nah, later", "still working on it", "haven't started", "almost there"]
+CHATTER = ["what was this task again?", "can you check back tonight?", "ugh, busy day", "how long do I have?"]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(values, scale=1.0, digits=1):
+    if not values:
+        return None
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50) * scale, digits),
+        "p95": round(percentile(values, 95) * scale, digits),
+        "p99": round(percentile(values, 99) * scale, digits),
+        "max": round(max(values) * scale, digits),
+    }
+
+
+# --- Simulated Time ---
+
+class SimClock:
+    """Jumps forward between ticks and runs at real speed in between."""
+
+    def __init__(self, start):
+        self.base = start
+        self.anchor = time.perf_counter()
+
+    def now(self, tz=None):
+        current = self.base + datetime.timedelta(seconds=time.perf_counter() - self.anchor)
+        return current.astimezone(tz) if tz else current.replace(tzinfo=None)
+
+    def advance_to(self, moment):
+        if moment > self.now(moment.tzinfo):
+            self.base, self.anchor = moment, time.perf_counter()
+
+
+def install_clock(clock, *modules):
+    """Replaces the `datetime` module seen by `modules` with one whose datetime.now() reads `clock`."""
+    class SimDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now(tz)
+
+    shim = types.ModuleType("datetime")
+    shim.__dict__.update(vars(datetime))
+    shim.datetime = SimDatetime
+    for module in modules:
+        module.datetime = shim
+
+
+# --- LLM Stand-in ---
+
+class FakeOpenAI:
+    """Answers chat.completions.create like the OpenAI client: the classifier (max_tokens=5) recognises the
+    simulated done phrases, the chat call returns a canned nudge. Latency is slept in the calling thread."""
+
+    def __init__(self, latency, rng):
+        self.latency = latency
+        self.rng = rng
+        self.calls = collections.Counter()
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+        self._done = {reply.lower() for reply in DONE_REPLIES}
+
+    def create(self, model, messages, max_tokens=None, temperature=None, **kwargs):
+        kind = "classify" if max_tokens == 5 else "chat"
+        self.calls[kind] += 1
+        if self.latency:
+            time.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+        if kind == "classify":
+            said = messages[-1]["content"].rsplit("User now says:", 1)[-1].strip().lower()
+            content = "[TASK_DONE]" if said in self._done else "[TASK_NOT_DONE]"
+        else:
+            content = "Understood. Is the task finished yet? Let me know once it's done."
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content=content))])
+
+
+# --- Simulated Users ---
+
+class Persona:
+    def __init__(self, rng, args):
+        self.median_reply_minutes = rng.lognormvariate(math.log(args.reply_minutes), 0.6)
+        self.done_rate = min(1.0, max(0.0, rng.gauss(args.done_rate, 0.15)))
+        self.ghost_rate = args.ghost_rate
+        self.chat_rate = args.chat_rate
+
+
+class Simulation:
+    def __init__(self, bot, args):
+        self.bot = bot
+        self.args = args
+        self.rng = random.Random(args.seed)
+        random.seed(args.seed) # bot.py draws snooze lengths from the global generator
+        self.start = datetime.datetime.now(db_utils.LOCAL_TZ).replace(minute=0, second=0, microsecond=0)
+        self.end = self.start + datetime.timedelta(hours=args.hours)
+        self.clock = SimClock(self.start)
+        self.dynamodb = fakes.install_dynamodb(args.db_latency_ms / 1000)
+        self.discord = fakes.FakeDiscord(args.discord_latency_ms / 1000, on_send=self.on_bot_message)
+        self.llm = FakeOpenAI(args.llm_latency_ms / 1000, self.rng)
+        self.personas = {}
+        self.inbox = [] # heap of (sim time, seq, user id, text)
+        self.seq = 0
+        self.outcomes = collections.Counter()
+        self.hours = []
+        self.current = None
+        self.all_lag = []
+        self.all_dm_latency = []
+
+    # --- Setup ---
+
+    def install(self):
+        install_clock(self.clock, self.bot, db_utils)
+        self.discord.install(self.bot)
+        self.bot.client = self.llm
+        self.bot.bot.process_commands = self.ignore_command # Simulated users never send commands
+        self.bot.series_index.loaded_at = None
+        original_observe_lag = metrics.observe_lag
+
+        def observe_lag(kind, due_at, sent_at):
+            original_observe_lag(kind, due_at, sent_at)
+            self.current["lag"].append(max(0.0, (sent_at - due_at).total_seconds()))
+        metrics.observe_lag = observe_lag
+
+        self.dm_channel_type = self.dm_channel_class()
+        self.dm_channels = {}
+
+    @staticmethod
+    def dm_channel_class():
+        import discord
+
+        class FakeDMChannel(discord.DMChannel):
+            """Passes on_message's isinstance(DMChannel) check; sends go through FakeDiscord."""
+            def __init__(self, fake_discord, user_id):
+                self.fake_discord = fake_discord
+                self.id = user_id
+
+            async def send(self, content=None, **kwargs):
+                return await self.fake_discord._deliver(("dm", self.id), content)
+
+            def typing(self):
+                return fakes._Typing()
+
+        return FakeDMChannel
+
+    def dm_channel(self, user):
+        if user.id not in self.dm_channels:
+            self.dm_channels[user.id] = self.dm_channel_type(self.discord, user.id)
+        return self.dm_channels[user.id]
+
+    @staticmethod
+    async def ignore_command(message):
+        return None
+
+    def seed_reminders(self):
+        items = []
+        span = (self.end - self.start).total_seconds()
+        for n in range(self.args.users):
+            user_id = FIRST_USER_ID + n
+            self.personas[user_id] = Persona(self.rng, self.args)
+            for m in range(self.args.reminders):
+                remind_at = self.start + datetime.timedelta(seconds=self.rng.uniform(0, span))
+                recurring = self.rng.random() < self.args.recurring_fraction
+                items.append(db_utils.build_reminder_item(
+                    user_id, CHANNEL_ID, remind_at, f"Simulated task {m} for {user_id}",
+                    is_recurring=recurring, recurrence_rule=RECURRING_RULE if recurring else None,
+                ))
+        self.dynamodb.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME).load(items)
+        return len(items)
+
+    # --- User Behaviour ---
+
+    def schedule(self, at, user_id, text):
+        self.seq += 1
+        heapq.heappush(self.inbox, (at, self.seq, user_id, text))
+
+    def on_bot_message(self, target, content):
+        kind, user_id = target
+        if kind != "dm" or not content: return
+        if DESPAWN_MARKER in content:
+            self.outcomes["despawned"] += 1; return
+        if NUDGE_MARKER not in content: return
+        self.current["nudges"] += 1
+        persona = self.personas.get(user_id)
+        if persona is None or self.rng.random() < persona.ghost_rate:
+            self.outcomes["ghosted_nudges"] += 1; return
+        now = self.clock.now(db_utils.LOCAL_TZ)
+        reply_at = now + datetime.timedelta(minutes=self.rng.lognormvariate(math.log(persona.median_reply_minutes), 0.8))
+        if self.rng.random() < persona.done_rate:
+            self.schedule(reply_at, user_id, self.rng.choice(DONE_REPLIES))
+        else:
+            self.schedule(reply_at, user_id, self.rng.choice(NOT_DONE_REPLIES))
+            if self.rng.random() < persona.chat_rate:
+                self.schedule(reply_at + datetime.timedelta(minutes=self.rng.uniform(2, 30)), user_id, self.rng.choice(CHATTER))
+
+    async def deliver(self, user_id, text):
+        user = await self.discord.fetch_user(user_id)
+        message = types.SimpleNamespace(author=user, channel=self.dm_channel(user), content=text, attachments=[])
+        started = time.perf_counter()
+        await self.bot.on_message(message)
+        self.current["dm_latency"].append(time.perf_counter() - started)
+        self.outcomes["done_replies" if text in DONE_REPLIES else "other_replies"] += 1
+
+    # --- Per-Hour Accounting ---
+
+    def counters(self):
+        return {
+            "db": sum(self.dynamodb.call_counts().values()),
+            "db_by_operation": collections.Counter(self.dynamodb.call_counts()),
+            "llm": collections.Counter(self.llm.calls),
+            "discord_sends": sum(self.discord.sent.values()),
+        }
+
+    def open_hour(self, index):
+        self.current = {"hour": index, "lag": [], "dm_latency": [], "nudges": 0, "start": self.counters()}
+
+    def close_hour(self):
+        hour, end = self.current, self.counters()
+        start = hour["start"]
+        self.all_lag += hour["lag"]; self.all_dm_latency += hour["dm_latency"]
+        self.hours.append({
+            "hour": hour["hour"],
+            "dispatched": len(hour["lag"]),
+            "dispatch_lag_seconds": summarize(hour["lag"]),
+            "dms_handled": len(hour["dm_latency"]),
+            "dm_latency_ms": summarize(hour["dm_latency"], scale=1000),
+            "nudges_sent": hour["nudges"],
+            "db_calls": end["db"] - start["db"],
+            "db_calls_by_operation": dict(end["db_by_operation"] - start["db_by_operation"]),
+            "llm_calls": dict(end["llm"] - start["llm"]),
+            "discord_sends": end["discord_sends"] - start["discord_sends"],
+        })
+
+    def hour_of(self, moment):
+        return int((moment - self.start).total_seconds() // 3600)
+
+    # --- Main Loop ---
+
+    async def run(self):
+        self.install()
+        reminders = self.seed_reminders()
+        self.open_hour(0)
+        next_reminders = next_followups = self.start
+        wall_start = time.perf_counter()
+
+        while True:
+            upcoming = min(next_reminders, next_followups, self.inbox[0][0] if self.inbox else self.end)
+            if upcoming >= self.end: break
+            self.clock.advance_to(upcoming)
+            now = self.clock.now(db_utils.LOCAL_TZ)
+            if self.hour_of(now) != self.current["hour"]:
+                self.close_hour(); self.open_hour(self.hour_of(now))
+
+            work = []
+            while self.inbox and self.inbox[0][0] <= now:
+                _, _, user_id, text = heapq.heappop(self.inbox)
+                work.append(self.deliver(user_id, text))
+            if now >= next_reminders:
+                work.append(self.bot.check_reminders())
+                while next_reminders <= now: next_reminders += REMINDER_TICK
+            if now >= next_followups:
+                work.append(self.bot.check_followups())
+                while next_followups <= now: next_followups += FOLLOWUP_TICK
+            await asyncio.gather(*work)
+
+        self.close_hour()
+        wall = time.perf_counter() - wall_start
+        pending = sum(1 for item in self.dynamodb.Table(db_utils.DYNAMO_REMINDER_TABLE_NAME).items.values()
+                      if item.get("status") == "PENDING" and item["remind_time_utc"] <= self.end.isoformat())
+        return {
+            "config": {key: value for key, value in vars(self.args).items() if key != "json"},
+            "simulated_hours": self.args.hours,
+            "wall_seconds": round(wall, 2),
+            "speedup": round(self.args.hours * 3600 / wall, 1),
+            "reminders_seeded": reminders,
+            "due_but_undelivered_at_end": pending,
+            "dispatch_lag_seconds": summarize(self.all_lag),
+            "dm_latency_ms": summarize(self.all_dm_latency, scale=1000),
+            "outcomes": dict(self.outcomes),
+            "llm_calls": dict(self.llm.calls),
+            "db_calls": self.dynamodb.call_counts(),
+            "hours": self.hours,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--reminders", type=int, default=5, help="Reminders per user, spread over the run")
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--recurring-fraction", type=float, default=0.1)
+    parser.add_argument("--reply-minutes", type=float, default=12, help="Median reply delay of a typical user")
+    parser.add_argument("--done-rate", type=float, default=0.6, help="Chance a reply says the task is done")
+    parser.add_argument("--ghost-rate", type=float, default=0.1, help="Chance a nudge is never answered")
+    parser.add_argument("--chat-rate", type=float, default=0.2, help="Chance a not-done reply is followed by chatter")
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    parser.add_argument("--discord-latency-ms", type=float, default=40)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    bot = fakes.import_bot()
+    results = asyncio.run(Simulation(bot, args).run())
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
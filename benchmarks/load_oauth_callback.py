@@ -0,0 +1,126 @@
+# benchmarks/load_oauth_callback.py
+"""Load test for /api/auth/callback against a local stand-in for Discord's OAuth endpoints.
+
+The stand-in answers the token exchange and /users/@me after a fixed delay. Logins are fired
+concurrently at the ASGI app while a probe request measures how responsive the API stays.
+If the Discord calls blocked the event loop, total time would be roughly
+logins * 2 * delay and probe latency would grow with it.
+
+Usage: python benchmarks/load_oauth_callback.py [--logins 50] [--delay-ms 100] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# api_main refuses to import without these; the stand-in doesn't check them
+os.environ.setdefault("DISCORD_CLIENT_ID", "bench-client")
+os.environ.setdefault("DISCORD_CLIENT_SECRET", "bench-secret")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key")
+
+
+def make_stand_in(delay_seconds):
+    class DiscordStandIn(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+
+        def _reply(self, payload):
+            time.sleep(delay_seconds)
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self._reply({"access_token": "stand-in-token", "token_type": "Bearer"})
+
+        def do_GET(self):
+            self._reply({"id": "123456789", "username": "bench-user"})
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DiscordStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(logins, delay_seconds):
+    import httpx
+    import api_main
+
+    server = make_stand_in(delay_seconds)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    api_main.DISCORD_TOKEN_URL = f"{base}/api/oauth2/token"
+    api_main.DISCORD_API_URL = f"{base}/api/users/@me"
+
+    transport = httpx.ASGITransport(app=api_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        login_latencies = []; probe_latencies = []
+
+        async def login(i):
+            start = time.perf_counter()
+            response = await client.get("/api/auth/callback", params={"code": f"code-{i}"})
+            assert response.status_code == 302, response.text
+            login_latencies.append(time.perf_counter() - start)
+
+        async def probe(stop):
+            while not stop.is_set():
+                start = time.perf_counter()
+                await client.get("/api/logout")
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)))
+        wall = time.perf_counter() - start
+        stop.set(); await probe_task
+        await api_main.close_http_client()
+
+    server.shutdown()
+    return {
+        "logins": logins,
+        "stand_in_delay_ms": delay_seconds * 1000,
+        "wall_seconds": round(wall, 3),
+        "serialized_estimate_seconds": round(logins * 2 * delay_seconds, 3),
+        "logins_per_sec": round(logins / wall, 1),
+        "login_p50_ms": round(percentile(login_latencies, 50) * 1000, 1),
+        "login_p95_ms": round(percentile(login_latencies, 95) * 1000, 1),
+        "probe_p50_ms": round(statistics.median(probe_latencies) * 1000, 2) if probe_latencies else None,
+        "probe_max_ms": round(max(probe_latencies) * 1000, 2) if probe_latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--delay-ms", type=float, default=100)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.logins, args.delay_ms / 1000))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
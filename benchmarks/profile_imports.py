@@ -0,0 +1,89 @@
+# benchmarks/profile_imports.py
+"""Import-time profile of a module (api_main by default), from a fresh interpreter's -X importtime output.
+
+Lists the slowest top-level imports by cumulative time, plus the total, so init cost can be
+compared across releases and between eager and lazy (PRODIBOT_LAZY_INIT=1) modes.
+
+Usage: python benchmarks/profile_imports.py [--module api_main] [--lazy] [--top 25] [--json results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_env(lazy):
+    env = dict(os.environ)
+    # api_main refuses to start without these; real values don't matter for timing imports
+    env.setdefault("DISCORD_CLIENT_ID", "bench-client")
+    env.setdefault("DISCORD_CLIENT_SECRET", "bench-secret")
+    env.setdefault("SECRET_KEY", "bench-secret-key")
+    env["PRODIBOT_LAZY_INIT"] = "1" if lazy else "0"
+    return env
+
+
+def parse_importtime(stderr):
+    """Returns [(depth, self_us, cumulative_us, module)] from -X importtime lines."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def profile(module, lazy, top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=bench_env(lazy), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = parse_importtime(result.stderr)
+    # Lines are post-order: the module's direct imports (depth 1) come right before its own depth-0 line
+    end = max(i for i, r in enumerate(rows) if r[0] == 0 and r[3] == module)
+    children = []
+    for row in reversed(rows[:end]):
+        if row[0] == 0:
+            break
+        if row[0] == 1:
+            children.append(row)
+    top_level = sorted(children, key=lambda r: r[2], reverse=True)
+    total = rows[end][2]
+    return {
+        "module": module,
+        "lazy_init": lazy,
+        "total_ms": round(total / 1000, 1),
+        "modules_imported": len(rows),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 1), "self_ms": round(own / 1000, 1)}
+            for _, own, cum, name in top_level[:top]
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="api_main")
+    parser.add_argument("--lazy", action="store_true", help="Profile with PRODIBOT_LAZY_INIT=1")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = profile(args.module, args.lazy, args.top)
+    print(f"{results['module']} (lazy_init={results['lazy_init']}): {results['total_ms']} ms, "
+          f"{results['modules_imported']} modules")
+    for row in results["slowest"]:
+        print(f"  {row['cumulative_ms']:>9.1f} ms  {row['module']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,26 +2,33 @@ import discord
 from discord.ext import tasks, commands
 import datetime
 import asyncio
+import io
 import os
 import random
+import time
 from openai import OpenAI
-from icalendar import Calendar
 import pytz 
-import io
 import uuid
-import dateparser
-import csv
 from dotenv import load_dotenv
 import json
 import boto3  # <--- ADDED IMPORT
 
-# Basic logging setup (used throughout the file as `log`)
-import logging
-logging.basicConfig(level=logging.INFO)
-log = logging.getLogger("prodibot")
+# Logging setup (used throughout the file as `log`): JSON records, written to stdout and prodibot.log off the event loop
+import log_utils
+log = log_utils.setup_logging()
 
 # --- NEW: Import our shared database logic ---
 import db_utils
+import import_utils
+import loop_watchdog
+import memstats
+import metrics
+import perf
+import profiler
+import recurrence
+import series
+import time_utils
+import tracing
 
 # --- AWS Secrets Manager Integration ---
 def load_secrets_from_aws():
@@ -35,14 +42,14 @@ def load_secrets_from_aws():
             region_name=region_name
         )
 
-        print("Fetching secrets from AWS Secrets Manager...")
+        log.info("Fetching secrets from AWS Secrets Manager...")
         get_secret_value_response = client.get_secret_value(
             SecretId=secret_name
         )
 
     except Exception as e:
-        print(f"Error fetching secrets from AWS: {e}")
-        print("Falling back to environment variables...")
+        log.warning("Error fetching secrets from AWS: %s", e)
+        log.info("Falling back to environment variables...")
         return False
 
     secret_string = get_secret_value_response['SecretString']
@@ -51,14 +58,14 @@ def load_secrets_from_aws():
     for key, value in secrets.items():
         os.environ[key] = value
 
-    print("Successfully loaded secrets from AWS Secrets Manager.")
+    log.info("Successfully loaded secrets from AWS Secrets Manager.")
     return True
 
 # --- NEW: Load Configuration ---
 # Try to load from AWS Secrets Manager first (for EC2)
 if not load_secrets_from_aws():
     # If that fails, fall back to .env file (for local dev)
-    print("AWS load failed, attempting to load from .env file...")
+    log.info("AWS load failed, attempting to load from .env file...")
     load_dotenv()
 
 
@@ -70,7 +77,7 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 LOCAL_TZ = db_utils.LOCAL_TZ
 
 # --- DynamoDB Setup ---
-print(f"bot.py is referencing DB tables from db_utils.")
+log.info("bot.py is referencing DB tables from db_utils.")
 
 # --- Admin User List ---
 ADMIN_USER_IDS = [
@@ -79,11 +86,11 @@ ADMIN_USER_IDS = [
 ]
 
 if not DISCORD_TOKEN or not OPENAI_API_KEY:
-    print("="*50); print("ERROR: DISCORD_TOKEN or OPENAI_API_KEY is missing."); print("="*50); exit()
+    log.critical("ERROR: DISCORD_TOKEN or OPENAI_API_KEY is missing."); exit()
 try:
     client = OpenAI(api_key=OPENAI_API_KEY)
 except Exception as e:
-    print(f"Error initializing OpenAI client: {e}"); exit()
+    log.critical("Error initializing OpenAI client: %s", e); exit()
 
 intents = discord.Intents.default()
 intents.messages = True
@@ -100,11 +107,19 @@ RE_REMINDER_PHRASES = [
     "Just checking in on this again.", "Hope you haven't forgotten about this!",
 ]
 
+# --- Recurring Series Index ---
+SERIES_REFRESH_SECONDS = 300 # Reload series records from the DB this often to pick up outside edits
+
+# --- Log Sampling (1 in N of these lines is written; see log_utils.sampled) ---
+HEARTBEAT_LOG_EVERY = 20 # check_reminders runs every 15s: one heartbeat line per ~5 minutes
+DISPATCH_LOG_EVERY = 10 # Per-reminder progress lines, which flood the log when a big batch comes due
+series_index = series.SeriesIndex()
+
 # --- AI Functions (Merged) ---
 
 async def get_task_status_from_ai(user_message, user_id):
     """Classifies user's reply as DONE or NOT_DONE, using DB context."""
-    print(f"[Log] Classifying user message: '{user_message}'")
+    log.info("[Log] Classifying user message: '%s'", user_message, extra={"user_id": str(user_id)})
     
     context = await db_utils.get_task_context(user_id) 
     
@@ -122,18 +137,22 @@ async def get_task_status_from_ai(user_message, user_id):
     user_prompt = f"Task: {instruction}\n\nRecent messages (JSON list of role/content pairs):\n{history_json}\n\nUser now says: {user_message}"
 
     try:
-        completion = await asyncio.to_thread(
-            client.chat.completions.create,
-            model="gpt-4o-mini", messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            max_tokens=5, temperature=0.0
-        )
+        with tracing.span("openai.classify", model="gpt-4o-mini"), metrics.timed(metrics.OPENAI_LATENCY, metrics.OPENAI_ERRORS, call="classify"):
+            completion = await asyncio.to_thread(
+                client.chat.completions.create,
+                model="gpt-4o-mini", messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+                max_tokens=5, temperature=0.0
+            )
         response_text = completion.choices[0].message.content.strip()
         if response_text == "[TASK_DONE]":
-            print("[Log] AI classified as: [TASK_DONE]"); return "[TASK_DONE]"
+            metrics.CLASSIFIER_VERDICTS.labels(verdict="done").inc()
+            log.info("[Log] AI classified as: %s", "[TASK_DONE]", extra={"user_id": str(user_id)}); return "[TASK_DONE]"
         else:
-            print("[Log] AI classified as: [TASK_NOT_DONE]"); return "[TASK_NOT_DONE]"
+            metrics.CLASSIFIER_VERDICTS.labels(verdict="not_done").inc()
+            log.info("[Log] AI classified as: %s", "[TASK_NOT_DONE]", extra={"user_id": str(user_id)}); return "[TASK_NOT_DONE]"
     except Exception as e:
-        print(f"[Log] ERROR calling OpenAI for classification: {e}"); return "[TASK_NOT_DONE]"
+        metrics.CLASSIFIER_VERDICTS.labels(verdict="error").inc()
+        log.error("[Log] ERROR calling OpenAI for classification: %s", e, extra={"user_id": str(user_id)}); return "[TASK_NOT_DONE]"
 
 async def get_memory_chat_reply(user_id):
     """Generates a conversational reply based on the task and DB message history."""
@@ -141,14 +160,14 @@ async def get_memory_chat_reply(user_id):
     context = await db_utils.get_task_context(user_id)
     
     if not context:
-        print(f"[Log] ERROR: get_memory_chat_reply called for user {user_id} with no context.")
+        log.error("[Log] ERROR: get_memory_chat_reply called for user %s with no context.", user_id)
         return None
 
     instruction = context.get("task", "")
     messages = context.get("messages", [])
     
     if not instruction:
-        print(f"[Log] ERROR: User {user_id} has context but no task instruction.")
+        log.error("[Log] ERROR: User %s has context but no task instruction.", user_id)
         return None
     
     system_prompt = (
@@ -163,22 +182,35 @@ async def get_memory_chat_reply(user_id):
     openai_messages.extend([{"role": msg["role"], "content": msg["content"]} for msg in messages])
 
     try:
-        completion = await asyncio.to_thread(
-            client.chat.completions.create,
-            model="gpt-4o-mini", messages=openai_messages, max_tokens=200, temperature=0.7
-        )
+        with tracing.span("openai.chat", model="gpt-4o-mini"), metrics.timed(metrics.OPENAI_LATENCY, metrics.OPENAI_ERRORS, call="chat"):
+            completion = await asyncio.to_thread(
+                client.chat.completions.create,
+                model="gpt-4o-mini", messages=openai_messages, max_tokens=200, temperature=0.7
+            )
         reply = completion.choices[0].message.content.strip()
-        print(f"[Log] OpenAI chat reply: {reply[:50]}...")
+        log.info("[Log] OpenAI chat reply: %.50s...", reply, extra={"user_id": str(user_id)})
         return reply
     except Exception as e:
-        print(f"[Log] ERROR calling OpenAI for chat reply: {e}")
+        log.error("[Log] ERROR calling OpenAI for chat reply: %s", e, extra={"user_id": str(user_id)})
         return None
 
 # --- Bot Events ---
+@bot.before_invoke
+async def start_command_timer(ctx):
+    ctx.perf_started = time.perf_counter()
+
+@bot.after_invoke
+async def record_command_timing(ctx):
+    # Most commands catch their own errors and reply with them, so they mark ctx.perf_failed themselves
+    failed = ctx.command_failed or getattr(ctx, "perf_failed", False)
+    metrics.observe_command(ctx.command.qualified_name, ctx.perf_started, failed=failed)
+
 @bot.event
 async def on_ready():
-    print(f'Logged in as {bot.user.name} (ID: {bot.user.id})'); print('Bot is ready.')
+    log.info("Logged in as %s (ID: %s)", bot.user.name, bot.user.id); log.info("Bot is ready.")
     check_reminders.start(); check_followups.start()
+    loop_watchdog.start() # Logs the loop thread's stack whenever something blocks the event loop
+    await asyncio.to_thread(time_utils.warm_up)
 
 @bot.event
 async def on_message(message):
@@ -191,30 +223,23 @@ async def on_message(message):
         attachment = message.attachments[0]
         if attachment.filename.endswith(".ics"):
             await message.add_reaction("🔄") 
+            started = time.perf_counter()
             try:
                 file_content = await attachment.read()
-                gcal = Calendar.from_ical(file_content)
-                reminders_added = 0; reminders_past = 0
                 now_local = datetime.datetime.now(LOCAL_TZ) 
-                for component in gcal.walk():
-                    if component.name == "VEVENT":
-                        summary = str(component.get('summary'))
-                        dtstart = component.get('dtstart').dt
-                        if isinstance(dtstart, datetime.datetime):
-                            dtstart_local = dtstart.astimezone(LOCAL_TZ) if dtstart.tzinfo else LOCAL_TZ.localize(dtstart)
-                        elif isinstance(dtstart, datetime.date):
-                            dtstart_local = LOCAL_TZ.localize(datetime.datetime.combine(dtstart, datetime.time(23, 59, 59)))
-                        else: continue
-                        remind_time = dtstart_local - datetime.timedelta(hours=24)
-                        if remind_time > now_local: 
-                            await db_utils.add_reminder_to_db(message.author.id, message.channel.id, remind_time, f"(From Calendar) {summary}")
-                            reminders_added += 1
-                        else: reminders_past += 1
-                log.info(f"Calendar processed. Added {reminders_added}, Skipped {reminders_past}.")
-                await message.channel.send(f"✅ Calendar imported! I added **{reminders_added}** new reminders. I skipped {reminders_past} events in the past.")
+                entries, reminders_past, errors_found = await asyncio.to_thread(import_utils.collect_ics_entries, file_content, now_local)
+                progress_msg = await message.channel.send(f"🔄 Importing calendar: 0/{len(entries)} reminders written (0%)")
+                reporter = import_utils.ProgressReporter(progress_msg, "Importing calendar")
+                reminders_added, reminders_failed = await import_utils.write_entries(message.author.id, message.channel.id, entries, reporter)
+                log.info("Calendar processed. Added %d, Skipped %d, Failed %d.", reminders_added, reminders_past, reminders_failed)
+                response_msg = f"✅ Calendar imported! I added **{reminders_added}** new reminders. I skipped {reminders_past} events in the past."
+                if errors_found + reminders_failed > 0: response_msg += f" I couldn't import **{errors_found + reminders_failed}** events."
+                await progress_msg.edit(content=response_msg)
                 await message.remove_reaction("🔄", bot.user); await message.add_reaction("✅")
+                metrics.observe_command("import:ics", started)
             except Exception as e:
-                log.critical(f"FAILED to parse calendar: {e}"); await message.channel.send(f"❌ Error parsing `.ics` file. Error: {e}")
+                metrics.observe_command("import:ics", started, failed=True)
+                log.critical("FAILED to parse calendar: %s", e); await message.channel.send(f"❌ Error parsing `.ics` file. Error: {e}")
                 await message.remove_reaction("🔄", bot.user); await message.add_reaction("❌")
         else: await message.channel.send("That doesn't look like an `.ics` file. Please upload a valid calendar file.")
         return 
@@ -223,120 +248,282 @@ async def on_message(message):
         attachment = message.attachments[0]
         if attachment.filename.endswith(".csv"):
             await message.add_reaction("🔄") 
+            started = time.perf_counter()
             try:
-                file_content_bytes = await attachment.read()
-                file_content_string = file_content_bytes.decode('utf-8')
-                reader = csv.DictReader(io.StringIO(file_content_string))
-                reminders_added = 0; reminders_past = 0; errors_found = 0
-                now_local = datetime.datetime.now(LOCAL_TZ) 
-                for row in reader:
-                    try:
-                        task = row['Task']; course = row.get('Course', ''); due_date = row['DueDate']; due_time = row['DueTime']
-                        datetime_str = f"{due_date} {due_time}"
-                        due_datetime = dateparser.parse(datetime_str, settings={'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True})
-                        if not due_datetime: log.warning(f"Failed to parse date: {datetime_str}"); errors_found += 1; continue
-                        remind_time = due_datetime - datetime.timedelta(hours=48)
-                        full_task_str = f"({course}) {task}" if course else task
-                        if remind_time > now_local: 
-                            await db_utils.add_reminder_to_db(message.author.id, message.channel.id, remind_time, full_task_str)
-                            reminders_added += 1
-                        else: reminders_past += 1
-                    except Exception as e: log.warning(f"Error processing CSV row: {e} (Row: {row})"); errors_found += 1
-                log.info(f"CSV processed. Added {reminders_added}, Skipped {reminders_past}, Errors {errors_found}.")
+                if attachment.size > import_utils.STREAM_IMPORT_MIN_BYTES:
+                    # Large file: stream it in chunks so memory stays flat and parsing stays off the event loop
+                    progress_msg = await message.channel.send("🔄 Importing tasks: 0 reminders written so far")
+                    reporter = import_utils.ProgressReporter(progress_msg, "Importing tasks")
+                    chunks = import_utils.iter_attachment_chunks(attachment.url)
+                    reminders_added, reminders_past, errors_found = await import_utils.stream_csv_import(chunks, message.author.id, message.channel.id, reporter)
+                else:
+                    file_content_bytes = await attachment.read()
+                    now_local = datetime.datetime.now(LOCAL_TZ) 
+                    entries, reminders_past, errors_found = await asyncio.to_thread(import_utils.collect_csv_entries, file_content_bytes, now_local)
+                    progress_msg = await message.channel.send(f"🔄 Importing tasks: 0/{len(entries)} reminders written (0%)")
+                    reporter = import_utils.ProgressReporter(progress_msg, "Importing tasks")
+                    reminders_added, reminders_failed = await import_utils.write_entries(message.author.id, message.channel.id, entries, reporter)
+                    errors_found += reminders_failed
+                log.info("CSV processed. Added %d, Skipped %d, Errors %d.", reminders_added, reminders_past, errors_found)
                 response_msg = f"✅ CSV imported! I added **{reminders_added}** new reminders."
                 if reminders_past > 0: response_msg += f" I skipped {reminders_past} events in the past."
                 if errors_found > 0: response_msg += f" I found **{errors_found} rows** I couldn't read."
-                await message.channel.send(response_msg)
+                await progress_msg.edit(content=response_msg)
                 await message.remove_reaction("🔄", bot.user); await message.add_reaction("✅")
+                metrics.observe_command("import:csv", started)
             except Exception as e:
-                log.critical(f"FAILED to parse CSV: {e}"); await message.channel.send(f"❌ Error parsing `.csv` file. Error: {e}")
+                metrics.observe_command("import:csv", started, failed=True)
+                log.critical("FAILED to parse CSV: %s", e); await message.channel.send(f"❌ Error parsing `.csv` file. Error: {e}")
                 await message.remove_reaction("🔄", bot.user); await message.add_reaction("❌")
         else: await message.channel.send("That doesn't look like a `.csv` file. Please upload a valid CSV.")
         return 
 
     # --- DB-based DM Follow-up Logic ---
     if isinstance(message.channel, discord.DMChannel) and not message.content.startswith("!"):
-        user_id = message.author.id
-        
-        context = await db_utils.get_task_context(user_id)
-        
-        if not context:
-            if not message.content.startswith("!"):
-                await message.channel.send("I'm Prodibot! I track task completion. To start, set a reminder for yourself using `!remindme` or `!remindat` in any server channel I'm in.\n\nOnce you have an active task, I'll check on your progress here in our DMs.")
-            await bot.process_commands(message)
-            return
+        with tracing.trace("dm", user_id=str(message.author.id)):
+            await handle_dm(message)
+        return # We've handled the DM
 
-        # --- User HAS an active task. ---
-        
-        # 1. Add user's message to memory
-        log.info(f"[DM USER] {user_id}: {message.content}")
-        await db_utils.add_memory_message(user_id, "user", message.content, MAX_MEMORY_MESSAGES)
+    await bot.process_commands(message)
+
+async def handle_dm(message):
+    """Handles a DM that isn't a command: runs the classifier / chat flow if the user has an active task."""
+    user_id = message.author.id
+    
+    context = await db_utils.get_task_context(user_id)
+    
+    if not context:
+        if not message.content.startswith("!"):
+            await message.channel.send("I'm Prodibot! I track task completion. To start, set a reminder for yourself using `!remindme` or `!remindat` in any server channel I'm in.\n\nOnce you have an active task, I'll check on your progress here in our DMs.")
+        await bot.process_commands(message)
+        return
+
+    # --- User HAS an active task. ---
+    
+    # 1. Add user's message to memory
+    log.info("[DM USER] %s: %s", user_id, message.content, extra={"user_id": str(user_id)})
+    await db_utils.add_memory_message(user_id, "user", message.content, MAX_MEMORY_MESSAGES)
+    
+    # 2. ALWAYS run the classifier first
+    async with message.channel.typing():
+        status = await get_task_status_from_ai(message.content, user_id)
         
-        # 2. ALWAYS run the classifier first
-        async with message.channel.typing():
-            status = await get_task_status_from_ai(message.content, user_id)
-            
-        # 3. Handle the classifier result
-        if status == "[TASK_DONE]":
-            reply = "Great job! Way to get it done. I'll check this off the list. ✅"
+    # 3. Handle the classifier result
+    if status == "[TASK_DONE]":
+        reply = "Great job! Way to get it done. I'll check this off the list. ✅"
+        with tracing.span("discord.send"):
             await message.channel.send(reply)
-            log.info(f"[DM BOT]: {reply}")
-            await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
-            log.info(f"Task complete for user {user_id}. State deleted.")
-        
-        else: # [TASK_NOT_DONE]
-            current_status = context.get('status', 'WAITING_FOR_REPLY')
+        log.info("[DM BOT]: %s", reply, extra={"user_id": str(user_id)})
+        await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
+        log.info("Task complete for user %s. State deleted.", user_id, extra={"user_id": str(user_id)})
+    
+    else: # [TASK_NOT_DONE]
+        current_status = context.get('status', 'WAITING_FOR_REPLY')
 
-            if current_status == "WAITING_FOR_REPLY":
-                # User replied "not done" to a direct nudge. Put them in snooze.
-                reply = "Okay, no worries. I'll check in with you again in a bit!"
+        if current_status == "WAITING_FOR_REPLY":
+            # User replied "not done" to a direct nudge. Put them in snooze.
+            reply = "Okay, no worries. I'll check in with you again in a bit!"
+            with tracing.span("discord.send"):
                 await message.channel.send(reply)
-                log.info(f"[DM BOT]: {reply}")
-                await db_utils.add_memory_message(user_id, "assistant", reply, MAX_MEMORY_MESSAGES)
-                
-                now = datetime.datetime.now(LOCAL_TZ)
-                random_minutes = random.randint(15, 180)
-                next_action_time = now + datetime.timedelta(minutes=random_minutes)
-                new_despawn_time = now + datetime.timedelta(hours=24) 
-                
-                await asyncio.to_thread(
-                    db_utils.state_table.update_item,
-                    Key={'user_id': str(user_id)},
-                    UpdateExpression="SET #s = :s, #nat = :nat, #dt = :dt",
-                    ExpressionAttributeNames={
-                        '#s': 'status', 
-                        '#nat': 'next_action_time',
-                        '#dt': 'despawn_time'
-                    },
-                    ExpressionAttributeValues={
-                        ':s': 'WAITING_TO_REMIND',
-                        ':nat': next_action_time.isoformat(),
-                        ':dt': new_despawn_time.isoformat()
-                    }
-                )
-                log.info(f"User {user_id} not done. Next check-in at {next_action_time.isoformat()}")
-
-            else: # (status == "WAITING_TO_REMIND")
-                # User is "snoozing" and just sent a chat message. Use the Chatbot AI.
-                async with message.channel.typing():
-                    bot_reply = await get_memory_chat_reply(user_id)
-                
-                if bot_reply:
+            log.info("[DM BOT]: %s", reply, extra={"user_id": str(user_id)})
+            await db_utils.add_memory_message(user_id, "assistant", reply, MAX_MEMORY_MESSAGES)
+            
+            now = datetime.datetime.now(LOCAL_TZ)
+            random_minutes = random.randint(15, 180)
+            next_action_time = now + datetime.timedelta(minutes=random_minutes)
+            new_despawn_time = now + datetime.timedelta(hours=24) 
+            
+            await asyncio.to_thread(
+                db_utils.state_table.update_item,
+                Key={'user_id': str(user_id)},
+                UpdateExpression="SET #s = :s, #nat = :nat, #dt = :dt",
+                ExpressionAttributeNames={
+                    '#s': 'status', 
+                    '#nat': 'next_action_time',
+                    '#dt': 'despawn_time'
+                },
+                ExpressionAttributeValues={
+                    ':s': 'WAITING_TO_REMIND',
+                    ':nat': next_action_time.isoformat(),
+                    ':dt': new_despawn_time.isoformat()
+                }
+            )
+            log.info("User %s not done. Next check-in at %s", user_id, next_action_time.isoformat(), extra={"user_id": str(user_id)})
+
+        else: # (status == "WAITING_TO_REMIND")
+            # User is "snoozing" and just sent a chat message. Use the Chatbot AI.
+            async with message.channel.typing():
+                bot_reply = await get_memory_chat_reply(user_id)
+            
+            if bot_reply:
+                with tracing.span("discord.send"):
                     await message.channel.send(bot_reply)
-                    log.info(f"[DM BOT]: {bot_reply}")
-                    await db_utils.add_memory_message(user_id, "assistant", bot_reply, MAX_MEMORY_MESSAGES)
-                else:
-                    await message.channel.send("Sorry, I'm having trouble processing that. I'll check in with you later about your task.")
+                log.info("[DM BOT]: %s", bot_reply, extra={"user_id": str(user_id)})
+                await db_utils.add_memory_message(user_id, "assistant", bot_reply, MAX_MEMORY_MESSAGES)
+            else:
+                await message.channel.send("Sorry, I'm having trouble processing that. I'll check in with you later about your task.")
+
+async def send_reminder_message(user, author_id, channel_id, task, reminder_id):
+    """DMs the reminder, falling back to the original channel if DMs are off. Creates the task state on success.
+    Returns True if the reminder was delivered."""
+    # --- ATTEMPT 1: SEND DM ---
+    try:
+        reply_content = f"Hey {user.mention}, this is your reminder to: **{task}**\n\nDid you get that done?"
+        with tracing.span("discord.send_dm"):
+            await user.send(reply_content)
+        log.info("Successfully sent DM to user %s for reminder %s.", author_id, reminder_id, extra={"user_id": str(author_id)})
+        await db_utils.create_task_state(author_id, task, reply_content)
+        return True
+    
+    except discord.errors.Forbidden:
+        log.warning("DM FAILED for %s (Forbidden). Attempting public fallback to channel %s.", author_id, channel_id)
+        
+        # --- ATTEMPT 2: PUBLIC FALLBACK ---
+        try:
+            channel = await bot.fetch_channel(channel_id)
+            if not channel:
+                log.error("PUBLIC FALLBACK FAILED: Could not find channel with ID %s for reminder %s.", channel_id, reminder_id)
+                return False
+            
+            reply_content = f"Hey {user.mention}, I tried to DM you this reminder but your DMs are off!\n\n**Task:** {task}\n\nDid you get that done?"
+            with tracing.span("discord.send"):
+                await channel.send(reply_content)
+            log.info("Successfully sent public fallback to channel %s for user %s.", channel_id, author_id, extra={"user_id": str(author_id)})
+            await db_utils.create_task_state(author_id, task, reply_content)
+            return True
+        
+        except discord.errors.Forbidden:
+            log.error("PUBLIC FALLBACK FAILED: Bot does not have permissions in channel %s for reminder %s.", channel_id, reminder_id)
+        except Exception as e:
+            log.error("PUBLIC FALLBACK FAILED: Unknown error: %s", e)
+    
+    except Exception as e:
+        log.error("UNKNOWN DM ERROR trying to send to user %s: %s", author_id, e)
+    return False
 
-        return # We've handled the DM
+async def refresh_series_index(now_local):
+    """Reloads all series records into the in-memory index."""
+    try:
+        items = await db_utils.load_all_series()
+        series_index.load(items, now_local)
+        log.info("Loaded %d recurring series into the index.", len(series_index))
+    except Exception as e:
+        log.critical("FAILED to load recurring series: %s", e)
+
+async def fire_series(item, occurrence, now_local):
+    """Delivers one occurrence of a series to every member, then records the firing once.
+    Members who are busy with another task get a one-off PENDING reminder so the normal queue retries them."""
+    series_id = item['reminder_id']; task = item['task']; channel_id = int(item['channel_id'])
+    log.info("Firing series %s (%s) for %d member(s): '%s'", series_id, occurrence.isoformat(), len(item['members']), task)
+    for member_id in item['members']:
+        author_id = int(member_id)
+        try:
+            with tracing.span("discord.fetch_user"):
+                user = await bot.fetch_user(author_id)
+            if not user:
+                log.warning("Could not fetch user with ID %s. Skipping series %s.", author_id, series_id); continue
+            if await db_utils.get_task_context(author_id):
+                log.info("User %s has an active task. Materializing series %s occurrence as a PENDING reminder.", author_id, series_id)
+                metrics.DISPATCHED.labels(kind="series", outcome="queued").inc()
+                await db_utils.add_reminder_to_db(author_id, channel_id, occurrence, task); continue
+            if not await send_reminder_message(user, author_id, channel_id, task, series_id):
+                log.warning("Failed to send series %s to user %s. Materializing as a PENDING reminder to retry.", series_id, author_id)
+                metrics.DISPATCHED.labels(kind="series", outcome="failed").inc()
+                await db_utils.add_reminder_to_db(author_id, channel_id, occurrence, task); continue
+            metrics.DISPATCHED.labels(kind="series", outcome="sent").inc()
+            metrics.observe_lag("series", occurrence, datetime.datetime.now(LOCAL_TZ))
+        except Exception as e:
+            log.critical("CRITICAL error firing series %s for user %s: %s", series_id, author_id, e)
+    await db_utils.mark_series_fired(series_id, now_local)
+    next_fire = series_index.fired(series_id, now_local)
+    if next_fire: log.info("Series %s next fires at %s", series_id, next_fire.isoformat())
+    else: log.info("Series %s has no further occurrences. Series ended.", series_id)
+
+async def dispatch_reminder(reminder):
+    """Delivers one due PENDING reminder (or leaves it queued), then deletes or reschedules it."""
+    task = reminder['task']
+    author_id = int(reminder['user_id'])
+    reminder_id = reminder['reminder_id']
+    channel_id = int(reminder['channel_id'])
+
+    log.info("Processing reminder %s for user %s: '%s'", reminder_id, author_id, task, extra=log_utils.sampled(DISPATCH_LOG_EVERY))
 
-    await bot.process_commands(message)
+    try:
+        with tracing.span("discord.fetch_user"):
+            user = await bot.fetch_user(author_id)
+        if not user:
+            log.warning("Could not fetch user with ID %s. Skipping reminder %s.", author_id, reminder_id)
+            return
+
+        context = await db_utils.get_task_context(author_id)
+
+        # --- QUEUE LOGIC ---
+        if context:
+            log.info("User %s has an active task. Reminder %s is QUEUED. Will retry next loop.", author_id, reminder_id, extra=log_utils.sampled(DISPATCH_LOG_EVERY))
+            metrics.DISPATCHED.labels(kind="reminder", outcome="queued").inc()
+            return
+        # --- END OF QUEUE LOGIC ---
+
+        sent_successfully = await send_reminder_message(user, author_id, channel_id, task, reminder_id)
+
+        # --- Post-Send Cleanup ---
+        if sent_successfully:
+            metrics.DISPATCHED.labels(kind="reminder", outcome="sent").inc()
+            metrics.observe_lag("reminder", datetime.datetime.fromisoformat(reminder['remind_time_utc']), datetime.datetime.now(LOCAL_TZ))
+            log.info("Deleting reminder %s from database.", reminder_id, extra=log_utils.sampled(DISPATCH_LOG_EVERY))
+            await db_utils.delete_reminder(author_id, reminder_id, event_type='fired')
+
+            if reminder.get('is_recurring', False):
+                rule = reminder.get('recurrence_rule')
+                if rule and rule != 'NONE':
+                    log.info("Rescheduling recurring reminder %s with rule: %s", reminder_id, rule)
+                    try:
+                        next_remind_time = db_utils.calculate_next_from_rule(rule)
+                        if not next_remind_time:
+                            log.info("Recurring reminder %s has no further occurrences. Series ended.", reminder_id)
+                        if next_remind_time:
+                            await db_utils.add_reminder_to_db(
+                                author_id, channel_id, 
+                                next_remind_time, task, 
+                                is_recurring=True, recurrence_rule=rule, event_type='rescheduled'
+                            )
+                            log.info("Successfully rescheduled %s. Next at: %s", reminder_id, next_remind_time.isoformat())
+                    except Exception as e:
+                        log.critical("CRITICAL ERROR rescheduling reminder %s: %s", reminder_id, e)
+        else:
+            metrics.DISPATCHED.labels(kind="reminder", outcome="failed").inc()
+            log.warning("Failed to send reminder %s for user %s. Will retry next loop.", reminder_id, author_id)
+
+    except Exception as e:
+        log.critical("CRITICAL error in check_reminders sub-loop for reminder %s: %s", reminder_id, e)
+        try:
+            await db_utils.delete_reminder(reminder['user_id'], reminder['reminder_id'])
+            log.error("Deleted erroring reminder %s to prevent loop.", reminder['reminder_id'])
+        except Exception as del_e:
+            log.critical("FAILED to delete erroring reminder: %s", del_e)
 
 @tasks.loop(seconds=15)
+@metrics.timed_async(metrics.LOOP_DURATION, loop="check_reminders")
 async def check_reminders():
-    """Checks ProdibotDB for PENDING reminders to send."""
+    """Checks ProdibotDB for PENDING reminders and the series index for due occurrences."""
     now_local = datetime.datetime.now(LOCAL_TZ)
     now_local_iso = now_local.isoformat()
+    log.info("Heartbeat: Checking for reminders due before %s", now_local_iso, extra=log_utils.sampled(HEARTBEAT_LOG_EVERY))
+
+    # --- Recurring series: computed in memory, no per-occurrence rows ---
+    if series_index.loaded_at is None or (now_local - series_index.loaded_at).total_seconds() > SERIES_REFRESH_SECONDS:
+        await refresh_series_index(now_local)
+    due_series = series_index.pop_due(now_local)
+    metrics.DUE_BACKLOG.labels(kind="series").set(len(due_series))
+    for item, occurrence in due_series:
+        series_id = item.get('reminder_id')
+        try:
+            with tracing.trace("dispatch_series", series_id=series_id, members=len(item['members'])):
+                await fire_series(item, occurrence, now_local)
+        except Exception as e: # A malformed series must not stop the loop; pop_due already took it off the schedule
+            log.critical("CRITICAL error firing series %s: %s", series_id, e)
+            try: series_index.fired(series_id, now_local)
+            except Exception as schedule_e: log.critical("FAILED to reschedule series %s: %s", series_id, schedule_e)
     
     try:
         response = await asyncio.to_thread(
@@ -347,104 +534,24 @@ async def check_reminders():
             ExpressionAttributeValues={':s': 'PENDING', ':now': now_local_iso}
         )
         due_reminders = response.get('Items', [])
+        metrics.DUE_BACKLOG.labels(kind="reminder").set(len(due_reminders))
         
         if due_reminders:
-            log.info(f"FOUND {len(due_reminders)} due reminder(s)!")
+            log.info("FOUND %d due reminder(s)!", len(due_reminders))
 
         for reminder in due_reminders:
-            task = reminder['task']
-            author_id = int(reminder['user_id'])
-            reminder_id = reminder['reminder_id']
-            channel_id = int(reminder['channel_id'])
-            sent_successfully = False 
-            
-            log.info(f"Processing reminder {reminder_id} for user {author_id}: '{task}'")
-
-            try:
-                user = await bot.fetch_user(author_id)
-                if not user:
-                    log.warning(f"Could not fetch user with ID {author_id}. Skipping reminder {reminder_id}.")
-                    continue 
-
-                context = await db_utils.get_task_context(author_id)
-                
-                # --- QUEUE LOGIC ---
-                if context:
-                    log.info(f"User {author_id} has an active task. Reminder {reminder_id} is QUEUED. Will retry next loop.")
-                    continue 
-                # --- END OF QUEUE LOGIC ---
-                
-                # --- ATTEMPT 1: SEND DM ---
-                try:
-                    reply_content = f"Hey {user.mention}, this is your reminder to: **{task}**\n\nDid you get that done?"
-                    await user.send(reply_content)
-                    sent_successfully = True 
-                    log.info(f"Successfully sent DM to user {author_id} for reminder {reminder_id}.")
-                    await db_utils.create_task_state(author_id, task, reply_content)
-                
-                except discord.errors.Forbidden:
-                    log.warning(f"DM FAILED for {author_id} (Forbidden). Attempting public fallback to channel {channel_id}.")
-                    
-                    # --- ATTEMPT 2: PUBLIC FALLBACK ---
-                    try:
-                        channel = await bot.fetch_channel(channel_id)
-                        if not channel:
-                            log.error(f"PUBLIC FALLBACK FAILED: Could not find channel with ID {channel_id} for reminder {reminder_id}.")
-                            continue 
-                        
-                        reply_content = f"Hey {user.mention}, I tried to DM you this reminder but your DMs are off!\n\n**Task:** {task}\n\nDid you get that done?"
-                        await channel.send(reply_content)
-                        sent_successfully = True 
-                        log.info(f"Successfully sent public fallback to channel {channel_id} for user {author_id}.")
-                        await db_utils.create_task_state(author_id, task, reply_content)
-                    
-                    except discord.errors.Forbidden:
-                        log.error(f"PUBLIC FALLBACK FAILED: Bot does not have permissions in channel {channel_id} for reminder {reminder_id}.")
-                    except Exception as e:
-                        log.error(f"PUBLIC FALLBACK FAILED: Unknown error: {e}")
-                
-                except Exception as e:
-                    log.error(f"UNKNOWN DM ERROR trying to send to user {author_id}: {e}")
-                
-                # --- Post-Send Cleanup ---
-                if sent_successfully:
-                    log.info(f"Deleting reminder {reminder_id} from database.")
-                    await asyncio.to_thread(db_utils.reminders_table.delete_item, Key={'user_id': str(author_id), 'reminder_id': reminder_id})
-                    
-                    if reminder.get('is_recurring', False):
-                        rule = reminder.get('recurrence_rule')
-                        if rule and rule != 'NONE':
-                            log.info(f"Rescheduling recurring reminder {reminder_id} with rule: {rule}")
-                            try:
-                                next_remind_time = db_utils.calculate_next_from_rule(rule)
-                                if next_remind_time:
-                                    await db_utils.add_reminder_to_db(
-                                        author_id, channel_id, 
-                                        next_remind_time, task, 
-                                        is_recurring=True, recurrence_rule=rule
-                                    )
-                                    log.info(f"Successfully rescheduled {reminder_id}. Next at: {next_remind_time.isoformat()}")
-                            except Exception as e:
-                                log.critical(f"CRITICAL ERROR rescheduling reminder {reminder_id}: {e}")
-                else:
-                    log.warning(f"Failed to send reminder {reminder_id} for user {author_id}. Will retry next loop.")
-
-            except Exception as e:
-                log.critical(f"CRITICAL error in check_reminders sub-loop for reminder {reminder_id}: {e}")
-                try:
-                    await asyncio.to_thread(db_utils.reminders_table.delete_item, Key={'user_id': reminder['user_id'], 'reminder_id': reminder['reminder_id']})
-                    log.error(f"Deleted erroring reminder {reminder['reminder_id']} to prevent loop.")
-                except Exception as del_e:
-                    log.critical(f"FAILED to delete erroring reminder: {del_e}")
+            with tracing.trace("dispatch_reminder", reminder_id=reminder['reminder_id'], user_id=reminder['user_id']):
+                await dispatch_reminder(reminder)
 
     except Exception as e:
-        log.critical(f"An unexpected error occurred querying DynamoDB (Reminders): {e}")
+        log.critical("An unexpected error occurred querying DynamoDB (Reminders): %s", e)
 @check_reminders.before_loop
 async def before_check_reminders():
     await bot.wait_until_ready()
-    print("Reminder check loop is starting.")
+    log.info("Reminder check loop is starting.")
     
 @tasks.loop(seconds=30)
+@metrics.timed_async(metrics.LOOP_DURATION, loop="check_followups")
 async def check_followups():
     """
     Checks ProdibotStateDB for all state-based actions:
@@ -473,7 +580,7 @@ async def check_followups():
         for item in response_snooze.get('Items', []):
             user_id = int(item['user_id'])
             task = item['task']
-            print(f"[Log] Snooze over for user {user_id}. Nudging for task: {task}")
+            log.info("[Log] Snooze over for user %s. Nudging for task: %s", user_id, task, extra={"user_id": str(user_id)})
             try:
                 user = await bot.fetch_user(user_id)
                 if user:
@@ -502,7 +609,7 @@ async def check_followups():
                         }
                     )
             except Exception as e:
-                print(f"[Log] Error processing snooze for {user_id}: {e}")
+                log.error("[Log] Error processing snooze for %s: %s", user_id, e)
                 await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
 
         # --- Action 2: Handle "Ghosting" users (and final cleanup) ---
@@ -527,7 +634,7 @@ async def check_followups():
 
             # --- Sub-Action 2a: Check for FINAL deletion ---
             if despawn_time <= now:
-                print(f"[Log] Despawn time reached for user {user_id} on task: {task}. Deleting state.")
+                log.info("[Log] Despawn time reached for user %s on task: %s. Deleting state.", user_id, task, extra={"user_id": str(user_id)})
                 try:
                     user = await bot.fetch_user(user_id)
                     if user:
@@ -536,13 +643,13 @@ async def check_followups():
                     await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
                 
                 except Exception as e:
-                    print(f"[Log] Error sending final despawn message to {user_id}: {e}")
+                    log.error("[Log] Error sending final despawn message to %s: %s", user_id, e)
                     await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
                 
                 continue 
 
             # --- Sub-Action 2b: Nudge the user (they haven't despawned yet) ---
-            print(f"[Log] Ghost-nudge for user {user_id} for task: {task}")
+            log.info("[Log] Ghost-nudge for user %s for task: %s", user_id, task, extra={"user_id": str(user_id)})
             try:
                 user = await bot.fetch_user(user_id)
                 if user:
@@ -562,16 +669,16 @@ async def check_followups():
                         ExpressionAttributeValues={':nat': next_nudge_time.isoformat()}
                     )
             except Exception as e:
-                print(f"[Log] Error ghost-nudging {user_id}: {e}")
+                log.error("[Log] Error ghost-nudging %s: %s", user_id, e)
                 await asyncio.to_thread(db_utils.state_table.delete_item, Key={'user_id': str(user_id)})
 
     except Exception as e:
-        print(f"[Log] An unexpected error occurred querying DynamoDB (State): {e}")
+        log.critical("[Log] An unexpected error occurred querying DynamoDB (State): %s", e)
 
 @check_followups.before_loop
 async def before_check_followups():
     await bot.wait_until_ready()
-    print("Follow-up check loop is starting.")
+    log.info("Follow-up check loop is starting.")
 
 # --- Bot Commands ---
 
@@ -590,7 +697,8 @@ async def listreminders(ctx):
             ExpressionAttributeValues={':uid': str(ctx.author.id)}
         )
         items = response.get('Items', [])
-        if not items:
+        member_series = series_index.for_member(ctx.author.id)
+        if not items and not member_series:
             await ctx.send("You have no reminders assigned to *you* in the database!"); return
         
         items.sort(key=lambda r: r['remind_time_utc'])
@@ -605,8 +713,17 @@ async def listreminders(ctx):
             response_message += f"**{i+1}.** {task}{recur_str}\n    *Due: {time_str}*\n    *ID: `{reminder_id_short}`*\n"
             if len(response_message) > 1800:
                 await ctx.send(response_message); response_message = ""
+        if member_series:
+            response_message += f"\n**You are in {len(member_series)} recurring series:**\n\n"
+        now_local = datetime.datetime.now(LOCAL_TZ)
+        for item in member_series:
+            upcoming = series_index.upcoming(item['reminder_id'], now_local, 2)
+            when = ", ".join(f"<t:{int(t.timestamp())}:f>" for t in upcoming) or "no further occurrences"
+            response_message += f"- {item['task']} (🔄 Series)\n    *Next: {when}*\n    *ID: `{item['reminder_id'].split('-')[0]}`*\n"
+            if len(response_message) > 1800:
+                await ctx.send(response_message); response_message = ""
         if response_message: await ctx.send(response_message)
-    except Exception as e: await ctx.send(f"An error occurred while fetching reminders: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred while fetching reminders: {e}")
 
 @bot.command(name='importcalendar', help='(Admin only) Upload your .ics calendar file to import all deadlines.')
 @admin_only()
@@ -625,83 +742,91 @@ async def remindme(ctx, minutes: int, *, task: str):
         remind_time = now + datetime.timedelta(minutes=minutes)
         if await db_utils.add_reminder_to_db(ctx.author.id, ctx.channel.id, remind_time, task):
             await ctx.send(f"Okay, {ctx.author.mention}! I'll remind you to **{task}** at <t:{int(remind_time.timestamp())}:f>.")
-        else: await ctx.send("Sorry, I had an error saving that reminder to the database.")
-    except Exception as e: await ctx.send(f"An error occurred: {e}")
+        else: ctx.perf_failed = True; await ctx.send("Sorry, I had an error saving that reminder to the database.")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred: {e}")
 
 @bot.command(name='remindat', help='Sets a reminder. Usage: !remindat "<time>" <task>')
 async def remindat(ctx, time_str: str, *, task: str):
     try:
-        remind_time = dateparser.parse(time_str, settings={'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True})
+        remind_time = await time_utils.parse_time_async(time_str)
         if not remind_time: await ctx.send(f'Sorry, I couldn\'t understand the time "{time_str}".'); return
         if remind_time <= datetime.datetime.now(LOCAL_TZ): await ctx.send(f"That time is in the past! Please provide a future time."); return
         if await db_utils.add_reminder_to_db(ctx.author.id, ctx.channel.id, remind_time, task):
              await ctx.send(f"Got it, {ctx.author.mention}! I'll remind you to **{task}** at <t:{int(remind_time.timestamp())}:f>.")
-        else: await ctx.send("Sorry, I had an error saving that reminder to the database.")
-    except Exception as e: await ctx.send(f"An error occurred: {e}")
+        else: ctx.perf_failed = True; await ctx.send("Sorry, I had an error saving that reminder to the database.")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred: {e}")
 
 @bot.command(name='setreminder', help='(Admin only) Sets a reminder for users. Usage: !setreminder <@user1 ...> "<time>" <task>')
 @admin_only()
 async def setreminder(ctx, users: commands.Greedy[discord.User], time_str: str, *, task: str):
     if not users: await ctx.send("You must specify at least one user!"); return
     try:
-        remind_time = dateparser.parse(time_str, settings={'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True})
+        remind_time = await time_utils.parse_time_async(time_str)
         if not remind_time: await ctx.send(f'Sorry, I couldn\'t understand the time "{time_str}".'); return
         if remind_time <= datetime.datetime.now(LOCAL_TZ): await ctx.send(f"That time is in the past!"); return
         success_users = []; fail_users = []
         for user in users:
             if await db_utils.add_reminder_to_db(user.id, ctx.channel.id, remind_time, task): success_users.append(user.mention)
-            else: fail_users.append(user.mention)
+            else: fail_users.append(user.mention); ctx.perf_failed = True
         response_msg = ""
         if success_users: response_msg += f"✅ Got it! I'll remind {', '.join(success_users)} to **{task}** at <t:{int(remind_time.timestamp())}:f>.\n"
         if fail_users: response_msg += f"❌ I failed to set a reminder for {', '.join(fail_users)}."
         await ctx.send(response_msg)
-    except Exception as e: await ctx.send(f"An error occurred: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred: {e}")
 
-@bot.command(name='routinereminder', help='(Admin only) Sets a recurring reminder. Usage: !routinereminder <@user1 ...> "<days>" "<time>" <task>')
+@bot.command(name='routinereminder', help='(Admin only) Sets a recurring reminder. Usage: !routinereminder <@user1 ...> "<days or RRULE>" "<time>" <task>')
 @admin_only()
 async def routinereminder(ctx, users: commands.Greedy[discord.User], days_str: str, time_str: str, *, task: str):
     if not users: await ctx.send("You must specify at least one user!"); return
     try:
-        target_weekdays = db_utils.parse_days_string(days_str)
-        if not target_weekdays: await ctx.send(f"I couldn't understand the days: \"{days_str}\"."); return
-        parsed_time = dateparser.parse(time_str, settings={'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True})
+        parsed_time = await time_utils.parse_time_async(time_str)
         if not parsed_time: await ctx.send(f"I couldn't understand the time: \"{time_str}\"."); return
         target_time = parsed_time.time()
-        rule_str = f"WEEKLY:{','.join(map(str, target_weekdays))}:{target_time.strftime('%H:%M')}"
-        first_occurrence_time = db_utils.calculate_next_occurrence(datetime.datetime.now(LOCAL_TZ), target_weekdays, target_time)
-        success_users = []; fail_users = []
-        for user in users:
-            if await db_utils.add_reminder_to_db(user.id, ctx.channel.id, first_occurrence_time, task, is_recurring=True, recurrence_rule=rule_str):
-                success_users.append(user.mention)
-            else: fail_users.append(user.mention)
-        day_names = ['Mon', 'Tues', 'Wed', 'Thurs', 'Fri', 'Sat', 'Sun']
-        human_days = ", ".join([day_names[d] for d in target_weekdays]) if len(target_weekdays) < 7 else "everyday"
-        response_msg = ""
-        if success_users:
-            response_msg += f"✅ Set recurring reminder for {', '.join(success_users)}: **{task}**\n"
-            response_msg += f"   *When:* {human_days} at {target_time.strftime('%I:%M %p %Z')}\n"
-            response_msg += f"   *First one is:* <t:{int(first_occurrence_time.timestamp())}:f>"
-        if fail_users: response_msg += f"\n❌ I failed to set the recurring reminder for {', '.join(fail_users)}."
+        now_local = datetime.datetime.now(LOCAL_TZ)
+        if recurrence.is_rrule(days_str):
+            # RFC 5545 rule, e.g. "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO" or "FREQ=MONTHLY;BYMONTHDAY=1;COUNT=6"
+            rule_str = recurrence.build_rrule(days_str, target_time, now_local)
+        else:
+            target_weekdays = db_utils.parse_days_string(days_str)
+            if not target_weekdays: await ctx.send(f"I couldn't understand the days: \"{days_str}\"."); return
+            rule_str = f"WEEKLY:{','.join(map(str, target_weekdays))}:{target_time.strftime('%H:%M')}"
+        try:
+            rule = recurrence.compile_rule(rule_str)
+        except ValueError as e:
+            await ctx.send(f"I couldn't understand that recurrence rule: {e}"); return
+        first_occurrence_time = rule.next_after(now_local)
+        if not first_occurrence_time: await ctx.send("That rule never fires in the future!"); return
+        # One series record for every user; occurrences are computed by the scheduler, not stored
+        series_item = db_utils.build_series_item([user.id for user in users], ctx.channel.id, task, rule_str, now_local)
+        if not await db_utils.add_series_to_db(series_item):
+            ctx.perf_failed = True
+            await ctx.send(f"❌ I failed to set the recurring reminder for {', '.join(user.mention for user in users)}."); return
+        series_index.upsert(series_item, now_local)
+        response_msg = f"✅ Set recurring reminder for {', '.join(user.mention for user in users)}: **{task}**\n"
+        response_msg += f"   *When:* {rule.describe()} {first_occurrence_time.strftime('%Z')}\n"
+        response_msg += f"   *First one is:* <t:{int(first_occurrence_time.timestamp())}:f>\n"
+        response_msg += f"   *Series ID:* `{series_item['reminder_id'].split('-')[0]}`"
         await ctx.send(response_msg)
-    except Exception as e: await ctx.send(f"An error occurred: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred: {e}")
 
-@bot.command(name='deletereminder', help='(Admin only) Deletes a reminder. Usage: !deletereminder <id>')
+@bot.command(name='deletereminder', help='(Admin only) Deletes a reminder or recurring series. Usage: !deletereminder <id>')
 @admin_only()
 async def deletereminder(ctx, short_id: str):
-    item, error = db_utils.find_reminder_by_id(short_id)
+    item, error = await db_utils.find_reminder_by_id(short_id)
     if error: await ctx.send(error); return
     try:
-        await asyncio.to_thread(
-            db_utils.reminders_table.delete_item,
-            Key={'user_id': item['user_id'], 'reminder_id': item['reminder_id']}
-        )
+        await db_utils.delete_reminder(item['user_id'], item['reminder_id'])
+        if item.get('status') == db_utils.SERIES_STATUS:
+            series_index.remove(item['reminder_id'])
+            members = ", ".join(f"<@{m}>" for m in item.get('members', []))
+            await ctx.send(f"✅ Successfully cancelled recurring series: **{item['task']}** (for {members})"); return
         await ctx.send(f"✅ Successfully deleted reminder: **{item['task']}** (for user <@{item['user_id']}>)")
-    except Exception as e: await ctx.send(f"An error occurred while deleting: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred while deleting: {e}")
 
 @bot.command(name='updatetask', help='(Admin only) Updates a task. Usage: !updatetask <id> <new task>')
 @admin_only()
 async def updatetask(ctx, short_id: str, *, new_task: str):
-    item, error = db_utils.find_reminder_by_id(short_id)
+    item, error = await db_utils.find_reminder_by_id(short_id)
     if error: await ctx.send(error); return
     try:
         await asyncio.to_thread(
@@ -709,16 +834,22 @@ async def updatetask(ctx, short_id: str, *, new_task: str):
             Key={'user_id': item['user_id'], 'reminder_id': item['reminder_id']},
             UpdateExpression="set task = :t", ExpressionAttributeValues={':t': new_task}
         )
+        if item.get('status') == db_utils.SERIES_STATUS:
+            series_item = series_index.get(item['reminder_id'])
+            if series_item: series_item['task'] = new_task
+        else: await db_utils.bump_user_version(item['user_id'], db_utils.make_event('updated', reminder_id=item['reminder_id'], task=new_task))
         await ctx.send(f"✅ Task updated for `{short_id}`!\n**Old:** {item['task']}\n**New:** {new_task}")
-    except Exception as e: await ctx.send(f"An error occurred while updating: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred while updating: {e}")
 
 @bot.command(name='updatetime', help='(Admin only) Updates time. Usage: !updatetime <id> "<time>"')
 @admin_only()
 async def updatetime(ctx, short_id: str, time_str: str):
-    item, error = db_utils.find_reminder_by_id(short_id)
+    item, error = await db_utils.find_reminder_by_id(short_id)
     if error: await ctx.send(error); return
+    if item.get('status') == db_utils.SERIES_STATUS:
+        await ctx.send("That's a recurring series; its times come from its rule. Delete it and create a new `!routinereminder` instead."); return
     try:
-        new_remind_time = dateparser.parse(time_str, settings={'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True})
+        new_remind_time = await time_utils.parse_time_async(time_str)
         if not new_remind_time: await ctx.send(f'Sorry, I couldn\'t understand the time "{time_str}".'); return
         if new_remind_time <= datetime.datetime.now(LOCAL_TZ): await ctx.send(f"That time is in the past!"); return
 
@@ -732,10 +863,13 @@ async def updatetime(ctx, short_id: str, time_str: str):
             db_utils.reminders_table.put_item(Item=item)
 
         await asyncio.to_thread(update_item_in_db)
+        await db_utils.bump_user_version(item['user_id'], db_utils.make_event(
+            'rescheduled', reminder_id=item['reminder_id'], task=item['task'], remind_time_utc=new_remind_time_iso
+        ))
         
         new_time_discord = f"<t:{int(new_remind_time.timestamp())}:f>"
         await ctx.send(f"✅ Time updated for **{item['task']}**!\n**New Time:** {new_time_discord}\n*(Note: This action made the reminder non-recurring.)*")
-    except Exception as e: await ctx.send(f"An error occurred while updating: {e}")
+    except Exception as e: ctx.perf_failed = True; await ctx.send(f"An error occurred while updating: {e}")
 
 @bot.command(name='memdump', help='(Admin only) Shows active task state for a user. Usage: !memdump <@user>')
 @admin_only()
@@ -787,16 +921,69 @@ async def memclear(ctx, user: discord.User):
             Key={'user_id': str(user.id)}
         )
         await ctx.send(f"✅ Successfully cleared the active task state for {user.mention}.")
-        print(f"[Log] Admin {ctx.author.id} cleared state for {user.id}")
+        log.info("[Log] Admin %s cleared state for %s", ctx.author.id, user.id)
     except Exception as e:
+        ctx.perf_failed = True
         await ctx.send(f"An error occurred while clearing state: {e}")
-        print(f"[Log] ERROR clearing state for {user.id}: {e}")
+        log.error("[Log] ERROR clearing state for %s: %s", user.id, e)
+
+@bot.command(name='perf', help='(Admin only) Shows recent p50/p95/p99 timings and errors for commands, loops, DB and LLM calls.')
+@admin_only()
+async def perf_stats(ctx):
+    lag = loop_watchdog.stats()
+    response_msg = perf.format_table() + f"\n\nevent loop: {lag['stalls']} stall(s), max lag {lag['max_lag_ms']:.0f} ms"
+    chunk = ""
+    for line in response_msg.split("\n"):
+        if len(chunk) + len(line) > 1900:
+            await ctx.send(f"```\n{chunk}```"); chunk = ""
+        chunk += line + "\n"
+    if chunk: await ctx.send(f"```\n{chunk}```")
+
+@bot.command(name='memstats', help='(Admin only) Shows RSS, cache sizes and allocation growth since the last call. Usage: !memstats [stop]')
+@admin_only()
+async def memstats_cmd(ctx, action: str = ""):
+    if action == "stop":
+        memstats.stop(); await ctx.send("tracemalloc stopped and its baseline dropped."); return
+    diff_lines, traced = await asyncio.to_thread(memstats.allocation_diff) # Snapshotting walks every traced block
+    gc_info = await asyncio.to_thread(memstats.gc_summary)
+    parse_cache, rule_cache = time_utils.cache_info(), recurrence.cache_info()
+    response_msg = (
+        f"rss: {memstats.format_bytes(memstats.rss_bytes())}  traced: {memstats.format_bytes(traced)}\n"
+        f"gc: {gc_info['objects']} objects, gen counts {gc_info['counts']}, {gc_info['garbage']} uncollectable\n\n"
+        f"-- discord.py caches --\n"
+        f"guilds {len(bot.guilds)}, users {len(bot.users)}, members {sum(len(g.members) for g in bot.guilds)}, "
+        f"messages {len(bot.cached_messages)}, private channels {len(bot.private_channels)}\n\n"
+        f"-- our caches --\n"
+        f"time parse cache {parse_cache.currsize}/{parse_cache.maxsize} (hits {parse_cache.hits}, misses {parse_cache.misses})\n"
+        f"recurrence rules {rule_cache.currsize}/{rule_cache.maxsize} (hits {rule_cache.hits}, misses {rule_cache.misses})\n"
+        f"series index {len(series_index)}, perf series {len(perf.snapshot())}, queued spans {tracing.stats()['queued']}\n\n"
+        f"-- top allocation growth since last !memstats --\n" + "\n".join(diff_lines)
+    )
+    await ctx.send(f"```\n{response_msg[:1980]}```")
+
+@bot.command(name='profile', help='(Admin only) Samples every thread for N seconds and uploads a flamegraph file. Usage: !profile <seconds>')
+@admin_only()
+async def profile(ctx, seconds: float = 10.0):
+    if not 0 < seconds <= profiler.PROFILE_MAX_SECONDS:
+        await ctx.send(f"Pick a window between 0 and {profiler.PROFILE_MAX_SECONDS} seconds."); return
+    await ctx.send(f"🔬 Profiling for {seconds:g}s...")
+    result = await asyncio.to_thread(profiler.profile, seconds) # The sampler runs on a worker thread, so the loop it watches keeps running
+    if result is None: await ctx.send("A profile is already running; try again when it finishes."); return
+    stamp = datetime.datetime.now(LOCAL_TZ).strftime('%Y%m%d-%H%M%S')
+    flamegraph = discord.File(io.BytesIO(result.collapsed().encode('utf-8')), filename=f"profile-{stamp}.collapsed")
+    summary = result.summary()
+    if len(summary) > 1900: summary = summary[:1900] + "\n..."
+    await ctx.send(f"```\n{summary}\n```\nFlamegraph input attached (`flamegraph.pl` or https://speedscope.app).", file=flamegraph)
+    log.info("[Log] Admin %s ran a %gs profile (%s samples)", ctx.author.id, seconds, result.samples)
 
 # --- Run the Bot ---
 if __name__ == "__main__":
+    memstats.maybe_start()
+    db_utils.connect()
+    metrics.start_server()
     try:
-        bot.run(DISCORD_TOKEN)
+        bot.run(DISCORD_TOKEN, log_handler=None) # discord.py's own logs go through log_utils' queue like ours
     except discord.errors.LoginFailure:
-        print("="*50); print("ERROR: Invalid DISCORD_TOKEN."); print("="*50)
+        log.critical("ERROR: Invalid DISCORD_TOKEN.")
     except Exception as e:
-        print(f"An error occurred while running the bot: {e}")
\ No newline at end of file
+        log.critical("An error occurred while running the bot: %s", e)
\ No newline at end of file
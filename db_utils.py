@@ -1,39 +1,77 @@
 # db_utils.py
 import datetime
 import pytz
-import boto3
 import uuid
-import dateparser
 import os
 import asyncio # <-- Added asyncio
+import collections
+import functools
+import logging
+import random
 from dotenv import load_dotenv
 
+import log_utils
+import metrics
+import recurrence
+import tracing
+
 load_dotenv()
 
+log = logging.getLogger("prodibot.db")
+
 # --- Set our "home" timezone ---
 LOCAL_TZ = pytz.timezone('America/Chicago')
 
 # --- DynamoDB Setup ---
-try:
-    dynamodb = boto3.resource('dynamodb', region_name="us-east-1") 
-    
-    # Table for PENDING reminders
-    DYNAMO_REMINDER_TABLE_NAME = 'ProdibotDB'
-    DYNAMO_REMINDER_GSI_NAME = 'StatusandTime'
-    reminders_table = dynamodb.Table(DYNAMO_REMINDER_TABLE_NAME)
-    
-    # Table for ACTIVE conversations and follow-up states
-    DYNAMO_STATE_TABLE_NAME = 'ProdibotStateDB'
-    DYNAMO_STATE_GSI_NAME = 'StatusandTime'
-    state_table = dynamodb.Table(DYNAMO_STATE_TABLE_NAME)
-    
-    print(f"[db_utils] Successfully connected to DynamoDB tables: {DYNAMO_REMINDER_TABLE_NAME} and {DYNAMO_STATE_TABLE_NAME}")
-
-except Exception as e:
-    print(f"[db_utils] ERROR: Could not connect to DynamoDB. {e}"); exit()
+# Table for PENDING reminders
+DYNAMO_REMINDER_TABLE_NAME = 'ProdibotDB'
+DYNAMO_REMINDER_GSI_NAME = 'StatusandTime'
+DYNAMO_REMINDER_USER_GSI_NAME = 'UserandTime' # user_id (HASH) + remind_time_utc (RANGE)
+
+# Table for ACTIVE conversations and follow-up states
+DYNAMO_STATE_TABLE_NAME = 'ProdibotStateDB'
+DYNAMO_STATE_GSI_NAME = 'StatusandTime'
+
+class _LazyResource:
+    """Stands in for a boto3 resource and builds it on first attribute access.
+    Importing boto3 and creating the resource is most of this module's import time, which matters on Lambda cold starts.
+    With a `metric_label`, every method call (get_item, query, ...) is timed into metrics.DB_LATENCY."""
+    def __init__(self, factory, metric_label=None):
+        self._factory = factory; self._resource = None; self._metric_label = metric_label
+    def resolve(self):
+        if self._resource is None: self._resource = self._factory()
+        return self._resource
+    def __getattr__(self, name):
+        attr = getattr(self.resolve(), name)
+        if self._metric_label is None or not callable(attr): return attr
+        return functools.partial(_timed_db_call, self._metric_label, name, attr)
+
+def _timed_db_call(table, operation, func, *args, **kwargs):
+    with tracing.span(f"dynamodb.{operation}", table=table), \
+         metrics.timed(metrics.DB_LATENCY, metrics.DB_ERRORS, table=table, operation=operation):
+        return func(*args, **kwargs)
+
+def _connect_dynamodb():
+    import boto3
+    return boto3.resource('dynamodb', region_name="us-east-1")
+
+dynamodb = _LazyResource(_connect_dynamodb)
+_TABLE_LABELS = {DYNAMO_REMINDER_TABLE_NAME: 'reminders', DYNAMO_STATE_TABLE_NAME: 'state'}
+reminders_table = _LazyResource(lambda: dynamodb.Table(DYNAMO_REMINDER_TABLE_NAME), metric_label=_TABLE_LABELS[DYNAMO_REMINDER_TABLE_NAME])
+state_table = _LazyResource(lambda: dynamodb.Table(DYNAMO_STATE_TABLE_NAME), metric_label=_TABLE_LABELS[DYNAMO_STATE_TABLE_NAME])
+
+def connect():
+    """Creates the DynamoDB resource and tables now instead of on first use. Exits if that fails (bot startup)."""
+    try:
+        reminders_table.resolve(); state_table.resolve()
+        log.info("[db_utils] Successfully connected to DynamoDB tables: %s and %s", DYNAMO_REMINDER_TABLE_NAME, DYNAMO_STATE_TABLE_NAME)
+    except Exception as e:
+        log.critical("[db_utils] ERROR: Could not connect to DynamoDB. %s", e); exit()
 
 # --- DB-based Memory Helpers (Now Async) ---
 
+MEMORY_LOG_EVERY = 10 # Every DM turn writes memory twice; log 1 in N of those lines
+
 async def get_task_context(user_id):
     """(Async) Fetches the active task state from DynamoDB."""
     try:
@@ -43,7 +81,7 @@ async def get_task_context(user_id):
         )
         return response.get('Item', None)
     except Exception as e:
-        print(f"[db_utils] ERROR fetching context for user {user_id}: {e}")
+        log.error("[db_utils] ERROR fetching context for user %s: %s", user_id, e)
         return None
 
 async def add_memory_message(user_id, role, content, max_messages=8):
@@ -69,9 +107,9 @@ async def add_memory_message(user_id, role, content, max_messages=8):
                 Key={'user_id': str(user_id)},
                 UpdateExpression="REMOVE messages[0]"
             )
-        print(f"[db_utils] Added memory message for {user_id}. Role: {role}")
+        log.info("[db_utils] Added memory message for %s. Role: %s", user_id, role, extra=log_utils.sampled(MEMORY_LOG_EVERY))
     except Exception as e:
-        print(f"[db_utils] ERROR adding memory message for {user_id}: {e}")
+        log.error("[db_utils] ERROR adding memory message for %s: %s", user_id, e)
 
 async def create_task_state(user_id, task, initial_message_content):
     """(Async) Creates a new state item in DynamoDB when a reminder is sent."""
@@ -95,10 +133,10 @@ async def create_task_state(user_id, task, initial_message_content):
         
         await asyncio.to_thread(state_table.put_item, Item=state_item)
         
-        print(f"[db_utils] Created task state for {user_id}. First nudge at: {next_nudge_time.isoformat()}")
+        log.info("[db_utils] Created task state for %s. First nudge at: %s", user_id, state_item['next_action_time'], extra={"user_id": str(user_id)})
         return True
     except Exception as e:
-        print(f"[db_utils] ERROR creating task state for {user_id}: {e}")
+        log.error("[db_utils] ERROR creating task state for %s: %s", user_id, e)
         return False
 
 # --- Recurring Reminder Helpers (Sync - No I/O) ---
@@ -139,38 +177,320 @@ def calculate_next_occurrence(now_local, target_weekdays, target_time):
     next_datetime_naive = datetime.datetime.combine(next_date, target_time)
     return LOCAL_TZ.localize(next_datetime_naive)
 
-def calculate_next_from_rule(rule_str):
+def calculate_next_from_rule(rule_str, after=None):
+    """Next occurrence of a stored recurrence rule (legacy WEEKLY or RRULE) after `after` (default: now).
+    Returns None if the rule is invalid or has ended."""
+    try:
+        rule = recurrence.compile_rule(rule_str)
+        return rule.next_after(after or datetime.datetime.now(LOCAL_TZ))
+    except Exception as e: log.error("[db_utils] Error parsing rule %s: %s", rule_str, e); return None
+
+# --- Per-User Change Versions (Async) ---
+# Every change to a user's reminders bumps a counter stored in the state table under 'VERSION#<user_id>'.
+# The API compares it against cached responses, so bot-side changes invalidate API caches too.
+# Each bump also appends one event (created/fired/rescheduled/deleted/...) to 'recent_events', which the
+# API's /api/stream relays to the dashboard. Version items have no status attribute, so they never appear in the follow-up GSI.
+VERSION_KEY_PREFIX = 'VERSION#'
+RECENT_EVENTS_MAX = 20 # Events always kept per user; a client that falls further behind just reloads
+RECENT_EVENTS_TRIM_AT = 2 * RECENT_EVENTS_MAX # The list grows to this before one REMOVE cuts it back to RECENT_EVENTS_MAX
+# With STREAM_REDIS_URL set, every bump is also announced on a Redis channel, so API workers with open
+# /api/stream connections re-read the version item right away instead of waiting for their next poll
+STREAM_REDIS_URL = os.environ.get('STREAM_REDIS_URL')
+STREAM_CHANGES_CHANNEL = 'prodibot:changes'
+_change_publisher = None
+
+def make_event(event_type, **fields):
+    """Builds a change event. Pass reminder_id/task/remind_time_utc for single reminders, or count for batches."""
+    event = {'type': event_type, 'at': datetime.datetime.now(LOCAL_TZ).isoformat()}
+    event.update({k: v for k, v in fields.items() if v is not None})
+    return event
+
+async def publish_change(user_id):
+    """(Async) Announces that a user's version moved. A no-op without STREAM_REDIS_URL; failures only cost a poll interval."""
+    global _change_publisher
+    if not STREAM_REDIS_URL: return
     try:
-        parts = rule_str.split(':')
-        if parts[0] != 'WEEKLY' or len(parts) != 3: print(f"[db_utils] Invalid rule format: {rule_str}"); return None
-        target_weekdays = [int(d) for d in parts[1].split(',')]
-        target_time = datetime.datetime.strptime(parts[2], '%H:%M').time()
-        now_local = datetime.datetime.now(LOCAL_TZ)
-        return calculate_next_occurrence(now_local, target_weekdays, target_time)
-    except Exception as e: print(f"[db_utils] Error parsing rule {rule_str}: {e}"); return None
+        if _change_publisher is None:
+            import redis.asyncio as redis_asyncio # Optional: only needed for cross-process stream pokes
+            _change_publisher = redis_asyncio.from_url(STREAM_REDIS_URL)
+        await _change_publisher.publish(STREAM_CHANGES_CHANNEL, str(user_id))
+    except Exception as e:
+        log.warning("[db_utils] Could not publish change for user %s: %s", user_id, e)
+
+async def bump_user_version(user_id, event=None):
+    """(Async) Increments a user's change version and records `event`. Returns the new version, or None on error."""
+    key = {'user_id': f"{VERSION_KEY_PREFIX}{user_id}"}
+    event = event or make_event('changed')
+    try:
+        response = await asyncio.to_thread(
+            state_table.update_item,
+            Key=key,
+            UpdateExpression="ADD version :one SET updated_at = :t, recent_events = list_append(if_not_exists(recent_events, :empty), :e)",
+            ExpressionAttributeValues={':one': 1, ':t': event['at'], ':e': [event], ':empty': []},
+            ReturnValues="UPDATED_NEW"
+        )
+        attributes = response['Attributes']
+        length = len(attributes.get('recent_events', []))
+        if length > RECENT_EVENTS_TRIM_AT:
+            # Trimming in batches costs one extra write per RECENT_EVENTS_MAX bumps instead of one per bump.
+            # Appends only ever land at the end, so trimming from the front never drops a newer event than intended;
+            # two bumps racing past the threshold can over-trim, which only costs a connected client one resync
+            overflow = length - RECENT_EVENTS_MAX
+            await asyncio.to_thread(
+                state_table.update_item, Key=key,
+                UpdateExpression="REMOVE " + ", ".join(f"recent_events[{i}]" for i in range(overflow))
+            )
+        await publish_change(user_id)
+        return int(attributes['version'])
+    except Exception as e:
+        log.error("[db_utils] ERROR bumping version for user %s: %s", user_id, e); return None
+
+async def get_user_version(user_id):
+    """(Async) Returns a user's current change version (0 if nothing has changed yet)."""
+    response = await asyncio.to_thread(
+        state_table.get_item,
+        Key={'user_id': f"{VERSION_KEY_PREFIX}{user_id}"},
+        ProjectionExpression='version'
+    )
+    return int(response.get('Item', {}).get('version', 0))
+
+async def get_user_events(user_id):
+    """(Async) Returns (version, recent_events) for a user; the last event belongs to the current version."""
+    response = await asyncio.to_thread(
+        state_table.get_item,
+        Key={'user_id': f"{VERSION_KEY_PREFIX}{user_id}"},
+        ProjectionExpression='version, recent_events'
+    )
+    item = response.get('Item', {})
+    return int(item.get('version', 0)), item.get('recent_events', [])
+
+# --- Token Revocations (Async) ---
+# A logout has to reach every API worker and survive restarts, so revocations live in the state table:
+# 'REVOKED#<sha256 hex of the token>' for one token, 'REVOKED#USER#<user_id>' for "log out everywhere".
+# Both carry expires_at (epoch seconds) for DynamoDB TTL: after that the tokens they cover have expired anyway.
+REVOKED_KEY_PREFIX = 'REVOKED#'
+
+async def revoke_token(token_digest, expires_at):
+    """(Async) Revokes one token (by SHA-256 hex digest) until its own expiry."""
+    await asyncio.to_thread(
+        state_table.put_item, Item={'user_id': f"{REVOKED_KEY_PREFIX}{token_digest}", 'expires_at': int(expires_at) + 1}
+    )
+
+async def revoke_user_tokens(user_id, revoked_before, expires_at):
+    """(Async) Revokes every token of a user issued at or before `revoked_before` (epoch seconds, kept to the millisecond)."""
+    await asyncio.to_thread(
+        state_table.put_item,
+        Item={'user_id': f"{REVOKED_KEY_PREFIX}USER#{user_id}", 'revoked_before_ms': int(revoked_before * 1000), 'expires_at': int(expires_at) + 1}
+    )
+
+async def get_token_revocation(user_id, token_digest):
+    """(Async) Returns (revoked_before in epoch seconds or None, token_revoked) for one token of a user."""
+    user_item, token_item = await asyncio.gather(
+        asyncio.to_thread(state_table.get_item, Key={'user_id': f"{REVOKED_KEY_PREFIX}USER#{user_id}"}, ProjectionExpression='revoked_before_ms, revoked_before'),
+        asyncio.to_thread(state_table.get_item, Key={'user_id': f"{REVOKED_KEY_PREFIX}{token_digest}"}, ProjectionExpression='expires_at'),
+    )
+    user_item = user_item.get('Item', {})
+    if 'revoked_before_ms' in user_item: return int(user_item['revoked_before_ms']) / 1000, 'Item' in token_item
+    revoked_before = user_item.get('revoked_before') # Whole seconds, written before revocations kept milliseconds
+    return (int(revoked_before) if revoked_before is not None else None), 'Item' in token_item
+
+async def delete_reminder(user_id, reminder_id, event_type='deleted'):
+    """(Async) Deletes one reminder and bumps the owner's version. Returns the new version.
+    Raises if the delete itself fails."""
+    await asyncio.to_thread(reminders_table.delete_item, Key={'user_id': str(user_id), 'reminder_id': reminder_id})
+    return await bump_user_version(user_id, make_event(event_type, reminder_id=reminder_id))
 
 # --- Add Reminder to DB (Now Async) ---
-async def add_reminder_to_db(author_id, channel_id, remind_time, task, is_recurring=False, recurrence_rule=None):
+def build_reminder_item(author_id, channel_id, remind_time, task, is_recurring=False, recurrence_rule=None):
+    """Builds the PENDING reminder item exactly as it is stored in the reminders table."""
+    item = {
+        'user_id': str(author_id), 'reminder_id': str(uuid.uuid4()),
+        'channel_id': str(channel_id), 
+        'remind_time_utc': remind_time.isoformat(), 
+        'task': task, 'status': 'PENDING'
+    }
+    if is_recurring:
+        item['is_recurring'] = True
+        item['recurrence_rule'] = recurrence_rule
+    return item
+
+async def add_reminder_to_db(author_id, channel_id, remind_time, task, is_recurring=False, recurrence_rule=None, event_type='created'):
     """(Async) Adds a PENDING reminder to the database."""
     try:
-        reminder_id = str(uuid.uuid4())
-        remind_time_iso = remind_time.isoformat()
-        item_to_put = {
-            'user_id': str(author_id), 'reminder_id': reminder_id,
-            'channel_id': str(channel_id), 
-            'remind_time_utc': remind_time_iso, 
-            'task': task, 'status': 'PENDING'
-        }
-        if is_recurring:
-            item_to_put['is_recurring'] = True
-            item_to_put['recurrence_rule'] = recurrence_rule
+        item_to_put = build_reminder_item(author_id, channel_id, remind_time, task, is_recurring, recurrence_rule)
         
         await asyncio.to_thread(reminders_table.put_item, Item=item_to_put)
+        await bump_user_version(author_id, make_event(
+            event_type, reminder_id=item_to_put['reminder_id'], task=task, remind_time_utc=item_to_put['remind_time_utc']
+        ))
         
-        print(f"[db_utils] Added {'RECURRING' if is_recurring else ''} reminder to DB. User: {author_id}, ID: {reminder_id}, Time: {remind_time_iso}")
+        log.info("[db_utils] Added %s reminder to DB. User: %s, ID: %s, Time: %s", 'RECURRING' if is_recurring else '', author_id, item_to_put['reminder_id'], item_to_put['remind_time_utc'])
+        return True
+    except Exception as e:
+        log.error("[db_utils] ERROR adding reminder to DB: %s", e); return False
+
+# --- Per-User Reminder Pages (Async) ---
+USER_QUERY_MAX_PAGES = 10 # DynamoDB pages read per call before handing back a cursor
+
+async def query_user_reminders(user_id, status='PENDING', limit=50, start_key=None):
+    """(Async) Reads one page of a user's reminders, oldest remind_time first, from the UserandTime index.
+    Status is filtered by DynamoDB (items without a status count as PENDING, like before).
+    Returns (items, last_evaluated_key); last_evaluated_key is None when there is nothing left."""
+    kwargs = {
+        'IndexName': DYNAMO_REMINDER_USER_GSI_NAME,
+        'KeyConditionExpression': 'user_id = :uid',
+        'ExpressionAttributeValues': {':uid': str(user_id)},
+        'ScanIndexForward': True
+    }
+    if status:
+        kwargs['FilterExpression'] = '#s = :s' if status != 'PENDING' else 'attribute_not_exists(#s) OR #s = :s'
+        kwargs['ExpressionAttributeNames'] = {'#s': 'status'}
+        kwargs['ExpressionAttributeValues'][':s'] = status
+    items = []; last_key = start_key
+    for _ in range(USER_QUERY_MAX_PAGES):
+        if last_key: kwargs['ExclusiveStartKey'] = last_key
+        # Limit caps items *evaluated*, so a page never returns more matches than we still need
+        kwargs['Limit'] = limit - len(items)
+        response = await asyncio.to_thread(reminders_table.query, **kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key or len(items) >= limit: break
+    return items, last_key
+
+# --- Batch Writes (Async) ---
+BATCH_WRITE_MAX_ITEMS = 25     # Hard DynamoDB limit per BatchWriteItem call
+BATCH_WRITE_CONCURRENCY = 4    # Batches in flight at once
+BATCH_WRITE_MAX_RETRIES = 6    # Retries for UnprocessedItems before giving up
+BATCH_WRITE_BASE_DELAY = 0.05  # Seconds; doubled on every retry
+
+async def _batch_write_with_backoff(table_name, requests):
+    """(Async) Sends one BatchWriteItem call, retrying UnprocessedItems with jittered exponential backoff.
+    Returns the list of write requests that could not be written."""
+    pending = requests
+    for attempt in range(BATCH_WRITE_MAX_RETRIES + 1):
+        response = await asyncio.to_thread(
+            _timed_db_call, _TABLE_LABELS.get(table_name, table_name), 'batch_write_item',
+            dynamodb.meta.client.batch_write_item, RequestItems={table_name: pending}
+        )
+        pending = response.get('UnprocessedItems', {}).get(table_name, [])
+        if not pending: return []
+        if attempt < BATCH_WRITE_MAX_RETRIES:
+            delay = BATCH_WRITE_BASE_DELAY * (2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
+    log.warning("[db_utils] WARNING: %d write(s) still unprocessed after %d retries.", len(pending), BATCH_WRITE_MAX_RETRIES)
+    return pending
+
+async def write_batches(table_name, requests, concurrency=BATCH_WRITE_CONCURRENCY, on_progress=None):
+    """(Async) Writes PutRequest/DeleteRequest entries in 25-item batches, several batches at a time.
+    `on_progress(done, failed, total)` is awaited after every batch. Returns the requests that were not written."""
+    total = len(requests)
+    chunks = [requests[i:i + BATCH_WRITE_MAX_ITEMS] for i in range(0, total, BATCH_WRITE_MAX_ITEMS)]
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {'written': 0, 'failed': 0}
+    not_written = []
+
+    async def write_chunk(chunk):
+        async with semaphore:
+            try:
+                unprocessed = await _batch_write_with_backoff(table_name, chunk)
+            except Exception as e:
+                log.error("[db_utils] ERROR in batch write of %d item(s): %s", len(chunk), e)
+                unprocessed = chunk
+        counts['written'] += len(chunk) - len(unprocessed)
+        counts['failed'] += len(unprocessed)
+        not_written.extend(unprocessed)
+        if on_progress:
+            await on_progress(counts['written'] + counts['failed'], counts['failed'], total)
+
+    await asyncio.gather(*(write_chunk(chunk) for chunk in chunks))
+    return not_written
+
+async def batch_write_requests(table_name, requests, concurrency=BATCH_WRITE_CONCURRENCY, on_progress=None):
+    """(Async) Same as write_batches, but returns (written, failed) counts."""
+    not_written = await write_batches(table_name, requests, concurrency, on_progress)
+    return len(requests) - len(not_written), len(not_written)
+
+async def add_reminders_batch(items, concurrency=BATCH_WRITE_CONCURRENCY, on_progress=None):
+    """(Async) Writes many items built by build_reminder_item using BatchWriteItem. Returns (written, failed)."""
+    requests = [{'PutRequest': {'Item': item}} for item in items]
+    written, failed = await batch_write_requests(DYNAMO_REMINDER_TABLE_NAME, requests, concurrency, on_progress)
+    for user_id, count in collections.Counter(item['user_id'] for item in items).items():
+        await bump_user_version(user_id, make_event('created', count=count))
+    log.info("[db_utils] Batch added %d reminder(s) to DB. Failed: %d", written, failed)
+    return written, failed
+
+async def put_user_reminders(user_id, items):
+    """(Async) Writes one user's new reminders with BatchWriteItem and bumps their version once.
+    Returns (failed_reminder_ids, new_version)."""
+    not_written = await write_batches(DYNAMO_REMINDER_TABLE_NAME, [{'PutRequest': {'Item': item}} for item in items])
+    failed_ids = {r['PutRequest']['Item']['reminder_id'] for r in not_written}
+    written = len(items) - len(failed_ids)
+    new_version = await bump_user_version(user_id, make_event('created', count=written)) if written else None
+    log.info("[db_utils] Batch created %d reminder(s) for %s. Failed: %d", written, user_id, len(failed_ids))
+    return failed_ids, new_version
+
+async def delete_user_reminders(user_id, reminder_ids):
+    """(Async) Deletes many of one user's reminders with BatchWriteItem and bumps their version once.
+    Ids that don't exist count as deleted, like delete_item. Returns (failed_reminder_ids, new_version)."""
+    requests = [{'DeleteRequest': {'Key': {'user_id': str(user_id), 'reminder_id': rid}}} for rid in reminder_ids]
+    not_written = await write_batches(DYNAMO_REMINDER_TABLE_NAME, requests)
+    failed_ids = {r['DeleteRequest']['Key']['reminder_id'] for r in not_written}
+    deleted = len(reminder_ids) - len(failed_ids)
+    new_version = await bump_user_version(user_id, make_event('deleted', count=deleted)) if deleted else None
+    log.info("[db_utils] Batch deleted %d reminder(s) for %s. Failed: %d", deleted, user_id, len(failed_ids))
+    return failed_ids, new_version
+
+# --- Recurring Series (Async) ---
+# A series is ONE record for a recurring schedule, however many users it reminds.
+# It lives in the reminders table under its own partition and has no remind_time_utc,
+# so it never shows up in the PENDING due-reminder query.
+SERIES_PARTITION = 'SERIES'
+SERIES_STATUS = 'SERIES'
+
+def build_series_item(member_ids, channel_id, task, recurrence_rule, created_at):
+    """Builds a series record. `last_fired_utc` starts at creation so the first firing is the next occurrence."""
+    return {
+        'user_id': SERIES_PARTITION, 'reminder_id': str(uuid.uuid4()),
+        'members': [str(m) for m in member_ids],
+        'channel_id': str(channel_id),
+        'task': task, 'status': SERIES_STATUS,
+        'recurrence_rule': recurrence_rule,
+        'last_fired_utc': created_at.isoformat()
+    }
+
+async def add_series_to_db(series_item):
+    """(Async) Writes a series record. One write no matter how many members it has."""
+    try:
+        await asyncio.to_thread(reminders_table.put_item, Item=series_item)
+        log.info("[db_utils] Added series %s for %d member(s). Rule: %s", series_item['reminder_id'], len(series_item['members']), series_item['recurrence_rule'])
+        return True
+    except Exception as e:
+        log.error("[db_utils] ERROR adding series to DB: %s", e); return False
+
+async def load_all_series():
+    """(Async) Returns every series record (one partition query, paginated)."""
+    items = []; kwargs = {
+        'KeyConditionExpression': 'user_id = :p',
+        'ExpressionAttributeValues': {':p': SERIES_PARTITION}
+    }
+    while True:
+        response = await asyncio.to_thread(reminders_table.query, **kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response: return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+async def mark_series_fired(series_id, fired_at):
+    """(Async) Records the latest firing of a series so a restart doesn't fire it again."""
+    try:
+        await asyncio.to_thread(
+            reminders_table.update_item,
+            Key={'user_id': SERIES_PARTITION, 'reminder_id': series_id},
+            UpdateExpression="SET last_fired_utc = :t",
+            ExpressionAttributeValues={':t': fired_at.isoformat()}
+        )
         return True
     except Exception as e:
-        print(f"[db_utils] ERROR adding reminder to DB: {e}"); return False
+        log.error("[db_utils] ERROR marking series %s fired: %s", series_id, e); return False
 
 # --- Helper for Admin Update/Delete (Now Async) ---
 async def find_reminder_by_id(short_id):
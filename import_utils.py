@@ -0,0 +1,246 @@
+# import_utils.py
+import datetime
+import asyncio
+import codecs
+import concurrent.futures
+import csv
+import io
+import time
+import aiohttp
+from icalendar import Calendar
+
+import db_utils
+import time_utils
+
+LOCAL_TZ = db_utils.LOCAL_TZ
+
+CSV_REMIND_BEFORE = datetime.timedelta(hours=48)  # CSV tasks are reminded 2 days before they are due
+ICS_REMIND_BEFORE = datetime.timedelta(hours=24)  # Calendar events are reminded 1 day before they start
+PROGRESS_EDIT_INTERVAL = 1.5                      # Seconds between progress message edits
+
+# --- Streaming Import Settings ---
+STREAM_IMPORT_MIN_BYTES = 512 * 1024  # Attachments larger than this are streamed instead of read whole
+STREAM_CHUNK_SIZE = 64 * 1024         # Bytes read from the attachment per chunk
+STREAM_PARSE_BATCH_ROWS = 500         # CSV records handed to a parse worker at a time
+STREAM_PARSE_WORKERS = 4              # Threads parsing rows off the event loop
+STREAM_QUEUE_MAXSIZE = 8              # 25-item write batches buffered between parsers and writers
+
+# --- Row Validation (Sync - No I/O) ---
+
+def parse_csv_row(row, now_local):
+    """Validates one CSV row. Returns (status, remind_time, task) where status is 'ok', 'past' or 'error'."""
+    try:
+        task = row['Task']; course = row.get('Course', ''); due_date = row['DueDate']; due_time = row['DueTime']
+        datetime_str = f"{due_date} {due_time}"
+        due_datetime = time_utils.parse_time(datetime_str)
+        if not due_datetime:
+            print(f"[import_utils] Failed to parse date: {datetime_str}"); return 'error', None, None
+        remind_time = due_datetime - CSV_REMIND_BEFORE
+        full_task_str = f"({course}) {task}" if course else task
+        if remind_time <= now_local: return 'past', None, None
+        return 'ok', remind_time, full_task_str
+    except Exception as e:
+        print(f"[import_utils] Error processing CSV row: {e} (Row: {row})"); return 'error', None, None
+
+def parse_ics_event(component, now_local):
+    """Validates one VEVENT. Returns (status, remind_time, task) where status is 'ok', 'past' or 'error'."""
+    try:
+        summary = str(component.get('summary'))
+        dtstart = component.get('dtstart').dt
+        if isinstance(dtstart, datetime.datetime):
+            dtstart_local = dtstart.astimezone(LOCAL_TZ) if dtstart.tzinfo else LOCAL_TZ.localize(dtstart)
+        elif isinstance(dtstart, datetime.date):
+            dtstart_local = LOCAL_TZ.localize(datetime.datetime.combine(dtstart, datetime.time(23, 59, 59)))
+        else: return 'error', None, None
+        remind_time = dtstart_local - ICS_REMIND_BEFORE
+        if remind_time <= now_local: return 'past', None, None
+        return 'ok', remind_time, f"(From Calendar) {summary}"
+    except Exception as e:
+        print(f"[import_utils] Error processing calendar event: {e}"); return 'error', None, None
+
+def collect_csv_entries(file_content_bytes, now_local):
+    """Parses a whole CSV file. Returns (entries, past, errors) where entries is a list of (remind_time, task)."""
+    reader = csv.DictReader(io.StringIO(file_content_bytes.decode('utf-8')))
+    entries = []; past = 0; errors = 0
+    for row in reader:
+        status, remind_time, task = parse_csv_row(row, now_local)
+        if status == 'ok': entries.append((remind_time, task))
+        elif status == 'past': past += 1
+        else: errors += 1
+    return entries, past, errors
+
+def parse_csv_batch(records, fieldnames, now_local):
+    """Parses a list of complete CSV records (no header). Returns (entries, past, errors) like collect_csv_entries."""
+    entries = []; past = 0; errors = 0
+    reader = csv.DictReader(records, fieldnames=fieldnames)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e: # e.g. a field over csv.field_size_limit(); the reader moves on to the next record
+            print(f"[import_utils] Unreadable CSV record: {e}"); errors += 1; continue
+        status, remind_time, task = parse_csv_row(row, now_local)
+        if status == 'ok': entries.append((remind_time, task))
+        elif status == 'past': past += 1
+        else: errors += 1
+    return entries, past, errors
+
+def collect_ics_entries(file_content, now_local):
+    """Parses a whole .ics file. Returns (entries, past, errors) where entries is a list of (remind_time, task)."""
+    gcal = Calendar.from_ical(file_content)
+    entries = []; past = 0; errors = 0
+    for component in gcal.walk():
+        if component.name != "VEVENT": continue
+        status, remind_time, task = parse_ics_event(component, now_local)
+        if status == 'ok': entries.append((remind_time, task))
+        elif status == 'past': past += 1
+        else: errors += 1
+    return entries, past, errors
+
+# --- Progress Reporting ---
+
+class ProgressReporter:
+    """Edits a single Discord message with import progress, at most once every PROGRESS_EDIT_INTERVAL seconds."""
+
+    def __init__(self, message, label):
+        self.message = message
+        self.label = label
+        self._last_edit = 0.0
+
+    async def update(self, done, failed, total, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_edit < PROGRESS_EDIT_INTERVAL: return
+        self._last_edit = now
+        if total is None:
+            text = f"🔄 {self.label}: {done} reminders written so far"
+        else:
+            percent = int(done * 100 / total) if total else 100
+            text = f"🔄 {self.label}: {done}/{total} reminders written ({percent}%)"
+        if failed: text += f", {failed} failed"
+        try:
+            await self.message.edit(content=text)
+        except Exception as e:
+            print(f"[import_utils] Could not edit progress message: {e}")
+
+# --- Import Pipeline (Async) ---
+
+async def write_entries(author_id, channel_id, entries, reporter=None):
+    """(Async) Batch-writes (remind_time, task) entries for one user. Returns (written, failed)."""
+    if not entries: return 0, 0
+    items = [db_utils.build_reminder_item(author_id, channel_id, remind_time, task) for remind_time, task in entries]
+    written, failed = await db_utils.add_reminders_batch(items, on_progress=reporter.update if reporter else None)
+    if reporter: await reporter.update(written + failed, failed, len(items), force=True)
+    return written, failed
+
+# --- Streaming CSV Import (Async) ---
+
+_parse_pool = None
+
+def _get_parse_pool():
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = concurrent.futures.ThreadPoolExecutor(max_workers=STREAM_PARSE_WORKERS, thread_name_prefix="csv-parse")
+    return _parse_pool
+
+async def iter_attachment_chunks(url, chunk_size=STREAM_CHUNK_SIZE):
+    """(Async) Yields the raw bytes of a Discord attachment URL, chunk_size bytes at a time."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+async def iter_csv_records(chunks, batch_rows=STREAM_PARSE_BATCH_ROWS):
+    """(Async) Decodes byte chunks incrementally and yields lists of complete CSV records.
+    A record may span several physical lines when a quoted field contains a newline."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    partial_line = ''; record_lines = []; in_quotes = False; batch = []
+    async for chunk in chunks:
+        lines = (partial_line + decoder.decode(chunk)).split('\n')
+        partial_line = lines.pop()
+        for line in lines:
+            record_lines.append(line)
+            if line.count('"') % 2: in_quotes = not in_quotes
+            if in_quotes: continue
+            record = '\n'.join(record_lines).rstrip('\r'); record_lines = []
+            if record: batch.append(record)
+        if len(batch) >= batch_rows:
+            yield batch; batch = []
+    tail = partial_line + decoder.decode(b'', final=True)
+    if tail: record_lines.append(tail)
+    if record_lines:
+        record = '\n'.join(record_lines).rstrip('\r')
+        if record: batch.append(record)
+    if batch: yield batch
+
+async def stream_csv_import(chunks, author_id, channel_id, reporter=None):
+    """(Async) Imports a CSV from an async iterator of byte chunks with flat memory use.
+    Records are parsed in a worker pool and fed through a bounded queue to concurrent batch writers,
+    so a slow database pauses parsing and a slow parser pauses reading. Returns (added, past, errors)."""
+    loop = asyncio.get_running_loop()
+    now_local = datetime.datetime.now(LOCAL_TZ)
+    write_queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAXSIZE)
+    parse_slots = asyncio.Semaphore(STREAM_PARSE_WORKERS)
+    counts = {'written': 0, 'failed': 0, 'past': 0, 'errors': 0}
+    failure = loop.create_future() # Holds the first exception raised by any parser or writer
+
+    def on_done(task):
+        if task.cancelled() or task.exception() is None or failure.done(): return
+        failure.set_exception(task.exception())
+
+    async def guarded(awaitable):
+        """Awaits `awaitable`, but raises a parser's or writer's failure as soon as there is one.
+        Without this a dead writer leaves everything blocked on the full write queue."""
+        waiter = asyncio.ensure_future(awaitable)
+        done, _ = await asyncio.wait({waiter, failure}, return_when=asyncio.FIRST_COMPLETED)
+        if failure in done:
+            waiter.cancel(); failure.result()
+        return waiter.result()
+
+    async def writer():
+        while True:
+            items = await write_queue.get()
+            if items is None: return
+            written, failed = await db_utils.batch_write_requests(
+                db_utils.DYNAMO_REMINDER_TABLE_NAME, [{'PutRequest': {'Item': item}} for item in items], concurrency=1
+            )
+            counts['written'] += written; counts['failed'] += failed
+            if reporter: await reporter.update(counts['written'], counts['failed'], None)
+
+    async def parse_and_enqueue(records, fieldnames):
+        try:
+            entries, past, errors = await loop.run_in_executor(_get_parse_pool(), parse_csv_batch, records, fieldnames, now_local)
+            counts['past'] += past; counts['errors'] += errors
+            items = [db_utils.build_reminder_item(author_id, channel_id, remind_time, task) for remind_time, task in entries]
+            for i in range(0, len(items), db_utils.BATCH_WRITE_MAX_ITEMS):
+                await write_queue.put(items[i:i + db_utils.BATCH_WRITE_MAX_ITEMS])
+        finally:
+            parse_slots.release()
+
+    writers = [asyncio.create_task(writer()) for _ in range(db_utils.BATCH_WRITE_CONCURRENCY)]
+    for task in writers: task.add_done_callback(on_done)
+    parsers = set()
+    try:
+        fieldnames = None
+        async for records in iter_csv_records(chunks):
+            if failure.done(): failure.result()
+            if fieldnames is None:
+                fieldnames = next(csv.reader(records[:1])); records = records[1:]
+                if not records: continue
+            await guarded(parse_slots.acquire())
+            task = asyncio.create_task(parse_and_enqueue(records, fieldnames))
+            # on_done runs before discard, so a batch that fails while the file is still being read isn't lost
+            parsers.add(task); task.add_done_callback(on_done); task.add_done_callback(parsers.discard)
+        await guarded(asyncio.gather(*parsers))
+        for _ in writers: await guarded(write_queue.put(None))
+        await guarded(asyncio.gather(*writers))
+    except BaseException:
+        for task in list(parsers) + writers: task.cancel()
+        if failure.done(): failure.exception() # Already raised one way or another; marks it retrieved
+        raise
+
+    if counts['written']: await db_utils.bump_user_version(author_id, db_utils.make_event('created', count=counts['written']))
+    if reporter: await reporter.update(counts['written'], counts['failed'], None, force=True)
+    print(f"[import_utils] Streamed CSV import for {author_id}. Added {counts['written']}, Past {counts['past']}, Errors {counts['errors'] + counts['failed']}")
+    return counts['written'], counts['past'], counts['errors'] + counts['failed']
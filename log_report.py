@@ -0,0 +1,275 @@
+# log_report.py
+"""Latency and funnel reports from prodibot.log, in either the JSON-lines format or the old text one.
+
+Files are streamed line by line, so memory stays flat however big the logs are: latencies go into
+fixed log-spaced buckets (perf.BOUNDS), and only DMs still in flight are held. Given prodibot.log,
+the rotated prodibot.log.N ... prodibot.log.1 next to it (or prodibot.log.N.gz if they were
+compressed) are read first, oldest to newest.
+
+    python log_report.py [prodibot.log ...] [--slowest 5] [--timelines dms.jsonl] [--json]
+
+Each DM becomes a timeline: [DM USER] -> classifier start -> OpenAI HTTP response(s) -> verdict ->
+[DM BOT] -> check-in scheduled / task complete. Text-format lines without a user id (httpx's
+"HTTP Request: POST https://api.openai.com/...", old [DM BOT] lines) go to the oldest DM waiting
+for that step, which is exact while DMs are handled one at a time. Lines logged with sample_every
+count that many times.
+"""
+import bisect
+import collections
+import datetime
+import glob
+import gzip
+import heapq
+import json
+import os
+import re
+
+import perf
+
+DM_TIMEOUT_SECONDS = 600 # A DM with no closing line after this long is closed where it stands
+
+_TEXT_LINE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) \[(\w+)\] (.*)$')
+_DM_USER = re.compile(r'^\[DM USER\] (\d+): ')
+_CLASSIFYING = re.compile(r'^\[Log\] Classifying user message')
+_VERDICT = re.compile(r'^\[Log\] AI classified as: (\S+)')
+_CLASSIFY_ERROR = re.compile(r'^\[Log\] ERROR calling OpenAI for classification')
+_OPENAI_HTTP = re.compile(r'^HTTP Request: POST https://api\.openai\.com\S* "HTTP/[\d.]+ (\d{3})')
+_DM_BOT = re.compile(r'^\[DM BOT\]')
+_NEXT_CHECKIN = re.compile(r'^User (\d+) not done\. Next check-in at')
+_TASK_COMPLETE = re.compile(r'^Task complete for user (\d+)')
+_SENT = re.compile(r'^Successfully sent (?:DM to user|public fallback to channel \d+ for user) (\d+)')
+_NUDGE = re.compile(r'^\[Log\] (?:Snooze over|Ghost-nudge) for user (\d+)')
+_DESPAWN = re.compile(r'^\[Log\] Despawn time reached for user (\d+)')
+
+FUNNEL_STAGES = ("sent", "nudged", "replied", "said_done", "said_not_done", "completed", "despawned")
+
+# --- Reading ---
+
+_ROTATION_SUFFIX = re.compile(r'\.(\d+)(?:\.gz)?$')
+
+def expand_paths(paths):
+    """Each path, preceded by its numbered rotations (path.N ... path.1, gzipped or not) so lines come out oldest first."""
+    for path in paths:
+        rotated = []
+        for candidate in glob.glob(glob.escape(path) + ".*"):
+            match = _ROTATION_SUFFIX.fullmatch(candidate[len(path):])
+            if match: rotated.append((int(match.group(1)), candidate))
+        yield from (candidate for _, candidate in sorted(rotated, reverse=True))
+        if os.path.exists(path): yield path
+
+def parse_line(line):
+    """(timestamp, level, message, user_id or None, weight), or None for continuation lines (tracebacks)."""
+    if line.startswith("{"):
+        try:
+            entry = json.loads(line)
+            ts = datetime.datetime.fromisoformat(entry["ts"]).replace(tzinfo=None) # The writer's wall clock, like the text format
+        except (ValueError, KeyError, TypeError):
+            return None
+        user_id = entry.get("user_id")
+        return ts, entry.get("level"), entry.get("msg", ""), str(user_id) if user_id else None, entry.get("sample_every", 1)
+    match = _TEXT_LINE.match(line)
+    if not match: return None
+    ts = datetime.datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S,%f")
+    return ts, match.group(2), match.group(3), None, 1
+
+def read_lines(paths):
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parsed = parse_line(line.rstrip("\n"))
+                if parsed: yield parsed
+
+# --- Aggregation ---
+
+class Histogram:
+    """Counts in perf.BOUNDS buckets: constant memory, percentiles within one bucket (20%)."""
+    def __init__(self):
+        self.counts = [0] * (len(perf.BOUNDS) + 1)
+        self.n = 0; self.sum = 0.0; self.max = 0.0
+
+    def add(self, seconds, weight=1):
+        self.counts[bisect.bisect_left(perf.BOUNDS, seconds)] += weight
+        self.n += weight; self.sum += seconds * weight; self.max = max(self.max, seconds)
+
+    def summary(self):
+        if not self.n: return {"count": 0}
+        result = {"count": self.n, "mean_ms": round(self.sum / self.n * 1000, 1), "max_ms": round(self.max * 1000, 1)}
+        for q in (0.5, 0.9, 0.95, 0.99):
+            result[f"p{int(q * 100)}_ms"] = round(min(perf.quantile(self.counts, self.n, q), self.max) * 1000, 1) # Bucket bounds can overshoot
+        return result
+
+class DM:
+    """One user message and everything the bot did about it."""
+    __slots__ = ("user_id", "start", "last_mark", "step", "events", "replied_at", "verdict", "chat_called", "outcome")
+
+    def __init__(self, user_id, start):
+        self.user_id = user_id; self.start = start; self.last_mark = start; self.step = "classify"
+        self.events = []; self.replied_at = None; self.verdict = None; self.chat_called = False; self.outcome = None
+
+    def add(self, ts, label):
+        self.events.append((round((ts - self.start).total_seconds() * 1000, 1), label))
+
+    def to_dict(self):
+        return {
+            "user_id": self.user_id, "start": self.start.isoformat(timespec="milliseconds"),
+            "reply_ms": round((self.replied_at - self.start).total_seconds() * 1000, 1) if self.replied_at else None,
+            "verdict": self.verdict, "outcome": self.outcome, "events": self.events,
+        }
+
+class Report:
+    def __init__(self, slowest=5, timelines_out=None):
+        self.open = collections.OrderedDict() # user_id -> DM in flight, oldest first
+        self.llm = collections.defaultdict(Histogram) # "classify" / "chat" -> latency
+        self.llm_status = collections.Counter()
+        self.reply = Histogram()
+        self.verdicts = collections.Counter()
+        self.funnel = collections.defaultdict(collections.Counter) # day -> stage -> count
+        self.slowest = [] # min-heap of (reply seconds, tiebreak, timeline), size <= `slowest`
+        self.slowest_n = slowest
+        self.timelines_out = timelines_out
+        self.dms = 0; self.lines = 0; self.first = None; self.last = None
+
+    # --- DM tracking ---
+
+    def _waiting(self, user_id, ready):
+        """The DM a line belongs to: by user id when the line has one, else the oldest one `ready` accepts."""
+        if user_id: return self.open.get(user_id)
+        return next((dm for dm in self.open.values() if ready(dm)), None)
+
+    def _close(self, dm, outcome):
+        self.open.pop(dm.user_id, None)
+        dm.outcome = dm.outcome or outcome
+        self.dms += 1
+        if self.timelines_out: self.timelines_out.write(json.dumps(dm.to_dict()) + "\n")
+        if dm.replied_at and self.slowest_n:
+            entry = ((dm.replied_at - dm.start).total_seconds(), self.dms, dm.to_dict())
+            if len(self.slowest) < self.slowest_n: heapq.heappush(self.slowest, entry)
+            else: heapq.heappushpop(self.slowest, entry)
+
+    def _expire(self, now):
+        while self.open:
+            dm = next(iter(self.open.values()))
+            if (now - dm.start).total_seconds() < DM_TIMEOUT_SECONDS: break
+            self._close(dm, "timed_out")
+
+    # --- Lines ---
+
+    def feed(self, ts, level, msg, user_id, weight):
+        self.lines += 1
+        self.first = self.first or ts; self.last = ts
+        self._expire(ts)
+        day = self.funnel[ts.date().isoformat()]
+
+        match = _DM_USER.match(msg)
+        if match:
+            user_id = match.group(1)
+            if user_id in self.open: self._close(self.open[user_id], "superseded")
+            dm = self.open[user_id] = DM(user_id, ts); dm.add(ts, "dm_user")
+            day["replied"] += weight; return
+        if _CLASSIFYING.match(msg):
+            dm = self._waiting(user_id, lambda dm: dm.step == "classify" and not dm.events[1:])
+            if dm: dm.last_mark = ts; dm.add(ts, "classify_start")
+            return
+        match = _OPENAI_HTTP.match(msg)
+        if match:
+            status = match.group(1)
+            dm = self._waiting(user_id, lambda dm: dm.replied_at is None)
+            call = dm.step if dm else "unattributed"
+            self.llm_status[(call, status)] += weight
+            if dm:
+                self.llm[call].add((ts - dm.last_mark).total_seconds(), weight)
+                dm.last_mark = ts; dm.add(ts, f"openai_{call}_{status}")
+                if call == "chat": dm.chat_called = True
+            return
+        match = _VERDICT.match(msg)
+        if match or _CLASSIFY_ERROR.match(msg):
+            verdict = match.group(1) if match else "error"
+            self.verdicts[verdict] += weight
+            if verdict == "[TASK_DONE]": day["said_done"] += weight
+            else: day["said_not_done"] += weight
+            dm = self._waiting(user_id, lambda dm: dm.verdict is None)
+            if dm: dm.verdict = verdict; dm.step = "chat"; dm.last_mark = ts; dm.add(ts, "verdict")
+            return
+        if _DM_BOT.match(msg):
+            dm = self._waiting(user_id, lambda dm: dm.replied_at is None)
+            if dm is None: return
+            dm.add(ts, "dm_bot")
+            if dm.replied_at is None:
+                dm.replied_at = ts; self.reply.add((ts - dm.start).total_seconds(), weight)
+            if dm.chat_called: self._close(dm, "chat_reply")
+            return
+        match = _NEXT_CHECKIN.match(msg) or _TASK_COMPLETE.match(msg)
+        if match:
+            completed = msg.startswith("Task complete")
+            if completed: day["completed"] += weight
+            dm = self.open.get(match.group(1))
+            if dm: dm.add(ts, "task_complete" if completed else "checkin_scheduled"); self._close(dm, "completed" if completed else "snoozed")
+            return
+        match = _SENT.match(msg)
+        if match: day["sent"] += weight; return
+        if _NUDGE.match(msg): day["nudged"] += weight; return
+        if _DESPAWN.match(msg): day["despawned"] += weight
+
+    def finish(self):
+        for dm in list(self.open.values()): self._close(dm, "open_at_end")
+
+    # --- Output ---
+
+    def results(self):
+        funnel = {}
+        for day, counts in sorted(self.funnel.items()):
+            if not counts: continue
+            row = {stage: counts.get(stage, 0) for stage in FUNNEL_STAGES}
+            sent = row["sent"]
+            row["completion_rate"] = round(row["completed"] / sent, 3) if sent else None
+            funnel[day] = row
+        return {
+            "lines": self.lines, "dms": self.dms,
+            "from": self.first.isoformat() if self.first else None, "to": self.last.isoformat() if self.last else None,
+            "llm_latency": {call: h.summary() for call, h in sorted(self.llm.items())},
+            "llm_status": {f"{call} {status}": n for (call, status), n in sorted(self.llm_status.items())},
+            "reply_latency": self.reply.summary(),
+            "verdicts": dict(self.verdicts.most_common()),
+            "funnel": funnel,
+            "slowest_dms": [t for _, _, t in sorted(self.slowest, reverse=True)],
+        }
+
+def format_text(results):
+    def latency(s):
+        if not s.get("count"): return "no samples"
+        return (f"n={s['count']}  p50 {s['p50_ms']:.0f}  p90 {s['p90_ms']:.0f}  p95 {s['p95_ms']:.0f}  "
+                f"p99 {s['p99_ms']:.0f}  max {s['max_ms']:.0f} ms")
+
+    lines = [f"{results['lines']} log lines, {results['dms']} DMs, {results['from']} .. {results['to']}", "", "LLM latency:"]
+    lines += [f"  {call:<13} {latency(s)}" for call, s in results["llm_latency"].items()] or ["  no samples"]
+    lines += ["", "LLM responses:"] + [f"  {key:<22} {n}" for key, n in results["llm_status"].items()]
+    lines += ["", "Reply latency (DM in -> first bot reply):", f"  {latency(results['reply_latency'])}"]
+    lines += ["", "Verdicts:"] + [f"  {verdict:<16} {n}" for verdict, n in results["verdicts"].items()]
+    lines += ["", "Funnel by day:", "  " + "day".ljust(11) + "".join(f"{stage:>14}" for stage in FUNNEL_STAGES) + "  complete%"]
+    for day, row in results["funnel"].items():
+        rate = f"{row['completion_rate']:.1%}" if row["completion_rate"] is not None else "-"
+        lines.append("  " + day.ljust(11) + "".join(f"{row[stage]:>14}" for stage in FUNNEL_STAGES) + f"  {rate:>9}")
+    if results["slowest_dms"]:
+        lines += ["", "Slowest DMs:"]
+        for dm in results["slowest_dms"]:
+            lines.append(f"  {dm['start']} user {dm['user_id']}: reply {dm['reply_ms']:.0f} ms, {dm['verdict']}, {dm['outcome']}")
+            lines += [f"    {offset:>9.1f} ms  {label}" for offset, label in dm["events"]]
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Latency and funnel reports from prodibot.log.")
+    parser.add_argument("files", nargs="*", default=["prodibot.log"], help="Log files; rotations of each are included")
+    parser.add_argument("--slowest", type=int, default=5, help="Print the timelines of the N slowest DMs")
+    parser.add_argument("--timelines", help="Write every DM timeline to this file as JSON lines")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    out = open(args.timelines, "w", encoding="utf-8") if args.timelines else None
+    report = Report(args.slowest, out)
+    for entry in read_lines(list(expand_paths(args.files))): report.feed(*entry)
+    report.finish()
+    if out: out.close()
+    results = report.results()
+    print(json.dumps(results, indent=2) if args.json else format_text(results))
@@ -0,0 +1,135 @@
+# log_utils.py
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+LOG_FILE = os.environ.get("LOG_FILE", "prodibot.log") # Empty disables the file handler
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json") # prodibot.log: "json" (one object per line) or "text" (the old format)
+LOG_CONSOLE_FORMAT = os.environ.get("LOG_CONSOLE_FORMAT", "text") # stdout is for humans watching the process
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", str(20 * 1024 * 1024))) # Rotate prodibot.log at this size...
+LOG_BACKUP_COUNT = int(os.environ.get("LOG_BACKUP_COUNT", "5")) # ...keeping prodibot.log.1 to .5
+LOG_QUEUE_SIZE = 10000 # Records waiting for the writer thread; beyond this new records are dropped, never blocked on
+LOG_SAMPLING = os.environ.get("LOG_SAMPLING", "1") != "0" # "0" keeps every sampled line (e.g. while debugging)
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came in through `extra=` and goes into the JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener = None
+_setup_lock = threading.Lock()
+
+# --- Formatting ---
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, any `extra=` fields, and the traceback if there is one."""
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def _formatter(kind):
+    return JsonFormatter() if kind == "json" else logging.Formatter(TEXT_FORMAT)
+
+# --- Sampling ---
+
+def sampled(every):
+    """`extra=` for a high-volume line: only 1 in `every` of them is written. Usage: log.info("...", x, extra=sampled(20))"""
+    return {"sample_every": every}
+
+class SampleFilter(logging.Filter):
+    """Keeps the 1st, (N+1)th, ... record of each sampled call site, keyed by its unformatted template.
+    Kept records carry `sample_every` so counts read from the log can be scaled back up. WARNING and above always pass."""
+    def __init__(self):
+        super().__init__()
+        self.seen = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, "sample_every", 1)
+        if every <= 1 or record.levelno >= logging.WARNING: return True
+        if not LOG_SAMPLING:
+            record.sample_every = 1; return True
+        key = (record.name, record.msg)
+        with self.lock:
+            count = self.seen.get(key, 0)
+            self.seen[key] = count + 1
+        return count % every == 0
+
+# --- Queue Handler ---
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread as they are. The stock QueueHandler formats the message
+    (and the traceback) on the caller's thread before enqueueing; here that's left to the listener,
+    so a log call on the event loop costs a filter check and a queue put."""
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def setup_logging(level=LOG_LEVEL, log_file=LOG_FILE):
+    """Routes the root logger through a queue to a writer thread that owns stdout and the rotating
+    prodibot.log. Safe to call more than once. Returns the "prodibot" logger."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None: return logging.getLogger("prodibot")
+
+        handlers = []
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(_formatter(LOG_CONSOLE_FORMAT))
+        handlers.append(console)
+        if log_file:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+            )
+            file_handler.setFormatter(_formatter(LOG_FORMAT))
+            handlers.append(file_handler)
+
+        queue_handler = _NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        queue_handler.addFilter(SampleFilter())
+        root = logging.getLogger()
+        for handler in list(root.handlers): root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging) # Flushes whatever is still queued on exit
+    return logging.getLogger("prodibot")
+
+def shutdown_logging():
+    """Stops the writer thread after it has written every queued record."""
+    global _listener
+    with _setup_lock:
+        if _listener is None: return
+        _listener.stop(); _listener = None
+
+def dropped_records():
+    """Records discarded because the queue was full (0 if logging isn't set up)."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _NonBlockingQueueHandler): return handler.dropped
+    return 0
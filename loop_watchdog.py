@@ -0,0 +1,96 @@
+# loop_watchdog.py
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+import metrics
+
+LOOP_PROBE_INTERVAL = float(os.environ.get("LOOP_PROBE_INTERVAL", "0.5")) # Seconds between heartbeats on the loop
+LOOP_LAG_THRESHOLD_MS = float(os.environ.get("LOOP_LAG_THRESHOLD_MS", "250")) # A heartbeat this late counts as a stall
+STACK_DEPTH = 30 # Innermost frames kept from the blocked loop thread's stack
+
+log = logging.getLogger("prodibot.watchdog")
+
+# --- Watchdog ---
+
+class LoopWatchdog:
+    """Measures how late the event loop runs a heartbeat scheduled every `interval` seconds.
+
+    The heartbeat coroutine records the lag of every beat. A separate thread watches the time
+    since the last beat: if the loop goes quiet for longer than the threshold it is blocked right
+    now, so the thread grabs the loop thread's current stack (sys._current_frames) and logs it
+    while the offender is still on it. When the loop comes back, the full stall length is logged."""
+
+    def __init__(self, interval=LOOP_PROBE_INTERVAL, threshold_ms=LOOP_LAG_THRESHOLD_MS):
+        self.interval = interval
+        self.threshold = threshold_ms / 1000
+        self.loop_thread_id = None
+        self.last_beat = None
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.last_stall = None # {"at", "lag_ms", "stack"} of the most recent stall
+        self._stack = None     # Captured by the thread during the current stall, None while healthy
+        self._lock = threading.Lock()
+        self._task = None
+        self._thread = None
+
+    def start(self, loop=None):
+        """Starts the heartbeat on `loop` (the running loop by default) and the watcher thread. Idempotent."""
+        if self._task is not None and not self._task.done(): return
+        loop = loop or asyncio.get_running_loop()
+        self.last_beat = time.monotonic()
+        self._task = loop.create_task(self._heartbeat())
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+        log.info("Loop watchdog started (probe every %.2fs, stall threshold %.0f ms)", self.interval, self.threshold * 1000)
+
+    async def _heartbeat(self):
+        self.loop_thread_id = threading.get_ident()
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            with self._lock:
+                self.last_beat = now
+                stack, self._stack = self._stack, None
+            metrics.LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag < self.threshold: continue
+            self.stalls += 1; metrics.LOOP_STALLS.inc()
+            self.last_stall = {"at": time.time(), "lag_ms": round(lag * 1000, 1), "stack": stack}
+            if stack:
+                log.warning("Event loop was blocked for %.0f ms (stack logged above)", lag * 1000, extra={"lag_ms": round(lag * 1000, 1)})
+            else: # Too short for the thread to catch it in the act
+                log.warning("Event loop was blocked for %.0f ms", lag * 1000, extra={"lag_ms": round(lag * 1000, 1)})
+
+    def _watch(self):
+        poll = min(self.interval, self.threshold) / 2
+        while True:
+            time.sleep(poll)
+            with self._lock:
+                if self.loop_thread_id is None or self._stack is not None: continue
+                silent = time.monotonic() - self.last_beat - self.interval
+                if silent < self.threshold: continue
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is None: continue
+                self._stack = "".join(traceback.format_stack(frame)[-STACK_DEPTH:])
+            log.warning("Event loop blocked for %.0f ms so far; loop thread stack:\n%s", silent * 1000, self._stack,
+                        extra={"lag_ms": round(silent * 1000, 1)})
+
+    def stats(self):
+        """Counters for admin/debug output."""
+        return {"stalls": self.stalls, "max_lag_ms": round(self.max_lag * 1000, 1), "last_stall": self.last_stall}
+
+_watchdog = LoopWatchdog()
+
+def start(loop=None):
+    _watchdog.start(loop)
+
+def stats():
+    return _watchdog.stats()
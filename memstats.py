@@ -0,0 +1,81 @@
+# memstats.py
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+
+TRACEMALLOC_FRAMES = int(os.environ.get("TRACEMALLOC_FRAMES", "0")) # >0 starts tracemalloc at boot with this many frames per allocation
+DIFF_FRAMES = 5 # Frames kept when tracemalloc is started on demand by !memstats
+TOP_N = 10
+
+# Allocations made by tracemalloc itself or the import machinery aren't interesting in a diff
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_previous = None # Snapshot the next diff is taken against
+_lock = threading.Lock()
+
+# --- Process ---
+
+def rss_bytes():
+    """Current resident set size from /proc (Linux), else the peak from getrusage, else None."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"): return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024 # bytes on macOS, KiB elsewhere
+    except (ImportError, OSError):
+        return None
+
+def format_bytes(n):
+    if n is None: return "?"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(n) < 1024: return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.2f} GiB"
+
+def gc_summary():
+    return {"objects": len(gc.get_objects()), "counts": gc.get_count(), "garbage": len(gc.garbage)}
+
+# --- tracemalloc Diffs ---
+
+def maybe_start():
+    """Starts tracemalloc at boot when TRACEMALLOC_FRAMES is set, so the first diff covers startup too."""
+    if TRACEMALLOC_FRAMES > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+def allocation_diff(top=TOP_N):
+    """Takes a snapshot and returns (lines, traced bytes) of the top-N growth since the previous one.
+    The first call starts tracemalloc if needed and only records a baseline. Slow on big heaps: run it in a thread."""
+    global _previous
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(DIFF_FRAMES)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        previous, _previous = _previous, snapshot
+        traced = tracemalloc.get_traced_memory()[0]
+        if previous is None:
+            return ["Baseline snapshot taken; run !memstats again for a diff against it."], traced
+        lines = []
+        for stat in snapshot.compare_to(previous, "lineno")[:top]:
+            frame = stat.traceback[0]
+            lines.append(f"{format_bytes(stat.size_diff):>11} {stat.count_diff:+7d}  {os.path.basename(frame.filename)}:{frame.lineno}")
+        return lines or ["No allocation changes since the previous snapshot."], traced
+
+def stop():
+    """Stops tracemalloc and drops the baseline, giving back its memory overhead."""
+    global _previous
+    with _lock:
+        _previous = None
+        if tracemalloc.is_tracing(): tracemalloc.stop()
@@ -0,0 +1,111 @@
+# metrics.py
+import contextlib
+import functools
+import os
+import time
+
+import perf
+
+try:
+    import prometheus_client # Optional: without it every metric below is a no-op
+except ImportError:
+    prometheus_client = None
+
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1") # Local only; scrape through the host or a sidecar
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9108")) # 0 disables the endpoint
+
+# Seconds. Dispatch lag spans "on time" (one 15s loop tick) up to reminders that were queued for hours
+LAG_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 900, 1800, 3600, 4 * 3600, 12 * 3600)
+CALL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# --- No-op Fallback ---
+
+class _NoopMetric:
+    """Accepts the prometheus_client calls we use and does nothing."""
+    def labels(self, *args, **kwargs): return self
+    def observe(self, value): pass
+    def inc(self, amount=1): pass
+    def dec(self, amount=1): pass
+    def set(self, value): pass
+
+_PERF_KINDS = {} # id(histogram) -> perf kind, for histograms that also feed the !perf rolling windows
+
+def _histogram(name, doc, labels=(), buckets=CALL_BUCKETS, perf_kind=None):
+    metric = _NoopMetric() if prometheus_client is None else prometheus_client.Histogram(name, doc, labels, buckets=buckets)
+    if perf_kind: _PERF_KINDS[id(metric)] = perf_kind
+    return metric
+
+def _counter(name, doc, labels=()):
+    if prometheus_client is None: return _NoopMetric()
+    return prometheus_client.Counter(name, doc, labels)
+
+def _gauge(name, doc, labels=()):
+    if prometheus_client is None: return _NoopMetric()
+    return prometheus_client.Gauge(name, doc, labels)
+
+# --- Metrics ---
+
+DISPATCH_LAG = _histogram("prodibot_dispatch_lag_seconds", "Actual send time minus remind_time_utc.", ["kind"], LAG_BUCKETS)
+DISPATCHED = _counter("prodibot_reminders_dispatched_total", "Reminders delivered, by kind and outcome.", ["kind", "outcome"])
+LOOP_DURATION = _histogram("prodibot_loop_duration_seconds", "Duration of one background loop iteration.", ["loop"], perf_kind="loop")
+DUE_BACKLOG = _gauge("prodibot_due_backlog", "Reminders due but not yet delivered at the start of the last check.", ["kind"])
+DB_LATENCY = _histogram("prodibot_db_call_seconds", "DynamoDB call latency, by table and operation.", ["table", "operation"], perf_kind="db")
+DB_ERRORS = _counter("prodibot_db_errors_total", "DynamoDB calls that raised, by table and operation.", ["table", "operation"])
+OPENAI_LATENCY = _histogram("prodibot_openai_call_seconds", "OpenAI call latency, by call.", ["call"], perf_kind="llm")
+OPENAI_ERRORS = _counter("prodibot_openai_errors_total", "OpenAI calls that raised, by call.", ["call"])
+COMMAND_LATENCY = _histogram("prodibot_command_seconds", "Bot command and attachment import duration.", ["command"], CALL_BUCKETS + (60, 300), perf_kind="command")
+COMMAND_ERRORS = _counter("prodibot_command_errors_total", "Bot commands and imports that failed.", ["command"])
+CLASSIFIER_VERDICTS = _counter("prodibot_classifier_verdicts_total", "Task-status classifier results.", ["verdict"])
+LOOP_LAG = _histogram("prodibot_event_loop_lag_seconds", "How late the event loop ran the watchdog heartbeat.", buckets=LOOP_LAG_BUCKETS)
+LOOP_STALLS = _counter("prodibot_event_loop_stalls_total", "Heartbeats later than the watchdog's stall threshold.")
+
+# --- Helpers ---
+
+@contextlib.contextmanager
+def timed(histogram, errors=None, **labels):
+    """Observes the block's duration in `histogram`; counts it in `errors` too if it raises."""
+    start = time.perf_counter(); failed = False
+    try:
+        yield
+    except BaseException:
+        failed = True
+        if errors is not None: errors.labels(**labels).inc()
+        raise
+    finally:
+        _observe(histogram, labels, time.perf_counter() - start, failed)
+
+def _observe(histogram, labels, seconds, failed):
+    histogram.labels(**labels).observe(seconds)
+    kind = _PERF_KINDS.get(id(histogram))
+    if kind: perf.record(kind, ".".join(str(v) for v in labels.values()), seconds, failed)
+
+def timed_async(histogram, **labels):
+    """Decorator version of `timed` for coroutine functions (e.g. a tasks.loop body)."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(histogram, **labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def observe_lag(kind, due_at, sent_at):
+    """Records dispatch lag for one delivered reminder (both aware datetimes)."""
+    DISPATCH_LAG.labels(kind=kind).observe(max(0.0, (sent_at - due_at).total_seconds()))
+
+def observe_command(command, started, failed=False):
+    """Records one command or import that began at time.perf_counter() value `started`."""
+    if failed: COMMAND_ERRORS.labels(command=command).inc()
+    _observe(COMMAND_LATENCY, {"command": command}, time.perf_counter() - started, failed)
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+    """Serves /metrics from a background thread. Returns False if disabled or unavailable."""
+    if not port: return False
+    if prometheus_client is None:
+        print("[metrics] prometheus_client is not installed; metrics are disabled."); return False
+    try:
+        prometheus_client.start_http_server(port, addr=host)
+        print(f"[metrics] Serving metrics on http://{host}:{port}/metrics"); return True
+    except OSError as e:
+        print(f"[metrics] ERROR starting metrics server on {host}:{port}: {e}"); return False
@@ -0,0 +1,98 @@
+# perf.py
+import bisect
+import os
+import threading
+import time
+
+PERF_WINDOW_MINUTES = int(os.environ.get("PERF_WINDOW_MINUTES", "15")) # Percentiles cover this many trailing minutes
+MAX_SERIES = 256 # Distinct (kind, name) pairs tracked; later ones are ignored so memory stays bounded
+
+# Log-spaced upper bounds from 1ms to ~20min, 20% apart: any percentile read from them is within 20% of the truth
+BOUNDS = tuple(0.001 * 1.2 ** i for i in range(78))
+
+_series = {}
+_lock = threading.Lock()
+
+# --- Rolling Histograms ---
+
+class RollingHistogram:
+    """Bucket counts for the last PERF_WINDOW_MINUTES, one slot per minute reused in a ring.
+    Memory is fixed at minutes x buckets no matter how many observations come in."""
+
+    def __init__(self, minutes=PERF_WINDOW_MINUTES):
+        self.minutes = minutes
+        self.slots = [None] * minutes # [minute, bucket counts, errors] or None
+        self.total = 0
+        self.total_errors = 0
+
+    def _slot(self, minute):
+        index = minute % self.minutes
+        slot = self.slots[index]
+        if slot is None or slot[0] != minute:
+            slot = self.slots[index] = [minute, [0] * (len(BOUNDS) + 1), 0]
+        return slot
+
+    def observe(self, seconds, failed=False, now=None):
+        slot = self._slot(int((now or time.time()) // 60))
+        slot[1][bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.total += 1
+        if failed:
+            slot[2] += 1; self.total_errors += 1
+
+    def window(self, now=None):
+        """(bucket counts, errors) summed over the slots still inside the window."""
+        current = int((now or time.time()) // 60)
+        counts, errors = [0] * (len(BOUNDS) + 1), 0
+        for slot in self.slots:
+            if slot is None or current - slot[0] >= self.minutes: continue
+            counts = [a + b for a, b in zip(counts, slot[1])]; errors += slot[2]
+        return counts, errors
+
+    def snapshot(self, quantiles=(0.5, 0.95, 0.99), now=None):
+        counts, errors = self.window(now)
+        n = sum(counts)
+        result = {"count": n, "errors": errors, "total": self.total, "total_errors": self.total_errors}
+        for q in quantiles:
+            result[f"p{int(q * 100)}"] = quantile(counts, n, q)
+        return result
+
+def quantile(counts, n, q):
+    """Upper bound of the bucket holding the q-th observation, in seconds (None if empty)."""
+    if not n: return None
+    rank, seen = q * n, 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= rank: return BOUNDS[index] if index < len(BOUNDS) else float("inf")
+    return float("inf")
+
+# --- Registry ---
+
+def record(kind, name, seconds, failed=False):
+    """Adds one timing. kind groups the output: "command", "loop", "db" or "llm"."""
+    key = (kind, name)
+    with _lock:
+        histogram = _series.get(key)
+        if histogram is None:
+            if len(_series) >= MAX_SERIES: return
+            histogram = _series[key] = RollingHistogram()
+        histogram.observe(seconds, failed)
+
+def snapshot():
+    """{(kind, name): snapshot dict} for every series, sorted by kind then name."""
+    with _lock:
+        return {key: _series[key].snapshot() for key in sorted(_series)}
+
+def format_table(kinds=None):
+    """Fixed-width text table of the current window, for a Discord code block."""
+    def ms(value):
+        if value is None: return "-"
+        return ">20m" if value == float("inf") else f"{value * 1000:.0f}"
+
+    rows = [f"{'name':<30} {'n':>6} {'err':>4} {'p50':>7} {'p95':>7} {'p99':>7}"]
+    current_kind = None
+    for (kind, name), s in snapshot().items():
+        if kinds and kind not in kinds: continue
+        if kind != current_kind:
+            rows.append(f"-- {kind} (ms, last {PERF_WINDOW_MINUTES}m) --"); current_kind = kind
+        rows.append(f"{name[:30]:<30} {s['count']:>6} {s['errors']:>4} {ms(s['p50']):>7} {ms(s['p95']):>7} {ms(s['p99']):>7}")
+    return "\n".join(rows) if current_kind else "No timings recorded yet."
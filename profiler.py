@@ -0,0 +1,92 @@
+# profiler.py
+import collections
+import os
+import sys
+import threading
+import time
+
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.01")) # Seconds between samples of every thread
+PROFILE_MAX_SECONDS = 120
+TOP_N = 15
+
+# Leaf Python frames of a thread that is blocked rather than working. A blocking C call (SimpleQueue.get,
+# time.sleep, epoll) has no frame of its own, so the leaf is the Python function that made it:
+#   selectors.py select       - the event loop (and the metrics server) waiting for I/O
+#   thread.py _worker         - an idle to_thread/executor worker in its work queue's get()
+#   threading.py wait         - the log writer and trace exporter parked on a queue.Queue
+#   loop_watchdog.py _watch   - the watchdog thread between polls, in time.sleep()
+IDLE_LEAVES = {("selectors.py", "select"), ("thread.py", "_worker"), ("threading.py", "wait"), ("queue.py", "get"),
+               ("loop_watchdog.py", "_watch")}
+
+_profile_lock = threading.Lock()
+
+# --- Sampling ---
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Samples the stack of every thread in the process via sys._current_frames() at a fixed
+    interval, from its own thread. Nothing is hooked into the profiled code, so the overhead is
+    one stack walk per thread per sample and the event loop runs as usual meanwhile."""
+
+    def __init__(self, interval=PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter() # "thread;outer;...;leaf" -> samples
+        self.samples = 0
+        self.elapsed = 0.0
+
+    def run(self, seconds):
+        """Samples for `seconds` on the calling thread (call it through asyncio.to_thread)."""
+        own = threading.get_ident()
+        start = time.perf_counter(); deadline = start + seconds
+        while time.perf_counter() < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own: continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame)); frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    # --- Output ---
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed-stack format, readable by flamegraph.pl, speedscope and inferno."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _is_idle(self, stack):
+        leaf = stack.rsplit(";", 1)[-1]
+        name, _, location = leaf.partition(" (")
+        return (location.split(":", 1)[0], name) in IDLE_LEAVES
+
+    def summary(self, top=TOP_N):
+        """Top functions by self and total samples, counting only threads that were busy."""
+        own, total = collections.Counter(), collections.Counter()
+        busy = 0
+        for stack, count in self.stacks.items():
+            if self._is_idle(stack): continue
+            frames = stack.split(";")[1:]
+            if not frames: continue
+            busy += count
+            own[frames[-1]] += count
+            for frame in set(frames): total[frame] += count
+        lines = [f"{self.samples} samples over {self.elapsed:.1f}s ({busy} busy thread-samples)", "", "Self:"]
+        lines += [f"{count / busy:6.1%}  {frame}" for frame, count in own.most_common(top)] if busy else ["  (idle)"]
+        lines += ["", "Total:"]
+        lines += [f"{count / busy:6.1%}  {frame}" for frame, count in total.most_common(top)] if busy else ["  (idle)"]
+        return "\n".join(lines)
+
+def profile(seconds, interval=PROFILE_INTERVAL):
+    """Runs one profile and returns the finished SamplingProfiler, or None if one is already running."""
+    if not _profile_lock.acquire(blocking=False): return None
+    try:
+        return SamplingProfiler(interval).run(min(seconds, PROFILE_MAX_SECONDS))
+    finally:
+        _profile_lock.release()
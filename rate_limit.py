@@ -0,0 +1,184 @@
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Limit:
+    """A token bucket: `rate` requests per second on average, bursts of up to `burst`."""
+
+    def __init__(self, name: str, rate: float, burst: int, methods: Optional[Iterable[str]] = None):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.methods = {m.upper() for m in methods} if methods else None
+
+    def applies_to(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+
+class InMemoryStore:
+    """Buckets held in this process, LRU-bounded. Each API worker limits on its own."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated_at)
+
+    async def take_all(self, buckets: List[Tuple[str, float, int]], now: Optional[float] = None) -> List[float]:
+        """
+        Takes one token from every (key, rate, burst) bucket, but only if all of them have one,
+        so a request denied by one bucket doesn't use up the others. Returns the seconds until
+        each bucket has a token (all 0 when the request was allowed and charged).
+        """
+        now = time.monotonic() if now is None else now
+        refilled = []
+        for key, rate, burst in buckets:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            refilled.append(min(burst, tokens + (now - updated_at) * rate))
+        waits = [0.0 if tokens >= 1 else (1 - tokens) / rate for tokens, (_, rate, _) in zip(refilled, buckets)]
+        charge = 0 if any(waits) else 1
+        for tokens, (key, _, _) in zip(refilled, buckets):
+            self._buckets[key] = (tokens - charge, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return waits
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Same check-then-charge as InMemoryStore, run atomically inside Redis so every worker shares the buckets.
+# KEYS are the buckets; ARGV is now, then rate and burst for each key. One script touches every bucket of a
+# request, so this needs a single Redis server (on Redis Cluster the keys would have to share a hash slot)
+_REDIS_TAKE_ALL = """
+local now = tonumber(ARGV[1])
+local tokens, waits, denied = {}, {}, false
+for i, key in ipairs(KEYS) do
+  local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+  local bucket = redis.call('HMGET', key, 'tokens', 'updated_at')
+  local updated_at = tonumber(bucket[2]) or now
+  tokens[i] = math.min(burst, (tonumber(bucket[1]) or burst) + math.max(0, now - updated_at) * rate)
+  if tokens[i] >= 1 then waits[i] = '0' else waits[i] = tostring((1 - tokens[i]) / rate); denied = true end
+end
+if not denied then
+  for i, key in ipairs(KEYS) do
+    local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'updated_at', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+  end
+end
+return waits
+"""
+
+
+class RedisStore:
+    """Shared buckets for multi-worker deployments (one Redis hash per key)."""
+
+    def __init__(self, url: str, prefix: str = "prodibot:ratelimit:"):
+        try:
+            import redis.asyncio as redis_asyncio  # Optional: only needed for the shared store
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the 'redis' package is not installed.")
+        self.client = redis_asyncio.from_url(url)
+        self.prefix = prefix
+        self._take_all = self.client.register_script(_REDIS_TAKE_ALL)
+
+    async def take_all(self, buckets: List[Tuple[str, float, int]], now: Optional[float] = None) -> List[float]:
+        now = time.time() if now is None else now
+        args = [now] + [value for _, rate, burst in buckets for value in (rate, burst)]
+        waits = await self._take_all(keys=[self.prefix + key for key, _, _ in buckets], args=args)
+        return [float(wait) for wait in waits]
+
+    def __len__(self) -> int:
+        return 0
+
+
+class RateLimiter:
+    """Token-bucket limits per client IP and per user, with counters of what was allowed and limited."""
+
+    def __init__(self, store, ip_limits: List[Limit], user_limits: List[Limit]):
+        self.store = store
+        self.ip_limits = ip_limits
+        self.user_limits = user_limits
+        self.counters: Dict[str, int] = {"allowed": 0}
+        self.store_errors = 0
+
+    async def check(self, method: str, ip: Optional[str], user_id: Optional[str]) -> float:
+        """Returns 0 if the request may go ahead, otherwise the seconds to wait (Retry-After)."""
+        checks = []
+        if ip:
+            checks += [("ip", ip, limit) for limit in self.ip_limits if limit.applies_to(method)]
+        if user_id:
+            checks += [("user", user_id, limit) for limit in self.user_limits if limit.applies_to(method)]
+
+        try:
+            waits = await self.store.take_all(
+                [(f"{scope}:{limit.name}:{subject}", limit.rate, limit.burst) for scope, subject, limit in checks]
+            ) if checks else []
+        except Exception as e:
+            # A broken shared store must not take the API down with it: fail open
+            self.store_errors += 1
+            print("[RATE LIMIT] Store error:", e)
+            waits = []
+
+        if any(waits):
+            for (scope, _, limit), wait in zip(checks, waits):
+                if wait:
+                    counter = f"{scope}:{limit.name}"
+                    self.counters[counter] = self.counters.get(counter, 0) + 1
+            return max(waits)  # Every bucket has to allow the retry
+
+        self.counters["allowed"] += 1
+        return 0.0
+
+    def stats(self) -> dict:
+        limited = {k: v for k, v in self.counters.items() if k != "allowed"}
+        return {"allowed": self.counters["allowed"], "limited": limited,
+                "store_errors": self.store_errors, "tracked_keys": len(self.store)}
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that runs every request through a RateLimiter.
+
+    The user is only known when `identify(scope)` can resolve it without work, i.e. from the
+    verified-token cache; requests with unknown tokens are still covered by the IP limits, and
+    their token gets cached by the route that verifies it. Limited requests get a 429 with
+    Retry-After. Written as plain ASGI (not BaseHTTPMiddleware) so streaming responses pass
+    straight through.
+    """
+
+    def __init__(self, app, limiter: RateLimiter, identify: Callable[[dict], Optional[str]],
+                 exempt_paths: Iterable[str] = ()):
+        self.app = app
+        self.limiter = limiter
+        self.identify = identify
+        self.exempt_paths = set(exempt_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        retry_after = await self.limiter.check(scope["method"], client[0] if client else None, self.identify(scope))
+        if retry_after:
+            await self.reject(send, retry_after)
+            return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def reject(send, retry_after: float) -> None:
+        body = json.dumps({"detail": "Too many requests."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
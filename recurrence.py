@@ -0,0 +1,259 @@
+# recurrence.py
+import datetime
+import functools
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
+import pytz
+
+# --- Set our "home" timezone (same as db_utils) ---
+LOCAL_TZ = pytz.timezone('America/Chicago')
+
+RULE_CACHE_SIZE = 1024
+MAX_MONTH_SCAN = 120  # Months searched for a valid BYMONTHDAY before a rule is considered exhausted
+
+WEEKDAY_CODES = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+DAY_NAMES = ['Mon', 'Tues', 'Wed', 'Thurs', 'Fri', 'Sat', 'Sun']
+NATIVE_PARTS = {'FREQ', 'INTERVAL', 'BYDAY', 'BYMONTHDAY', 'BYHOUR', 'BYMINUTE', 'BYSECOND', 'COUNT', 'UNTIL', 'WKST'}
+
+# --- Compiled Rules ---
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """An immutable, pre-computed recurrence rule. All arithmetic happens in Chicago wall time."""
+    source: str
+    freq: str                                   # 'DAILY', 'WEEKLY', 'MONTHLY', or 'RRULE' (dateutil fallback)
+    time_of_day: Optional[datetime.time] = None
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()              # WEEKLY: sorted weekday numbers (Mon=0)
+    monthdays: Tuple[int, ...] = ()             # MONTHLY: day numbers, negatives count from month end
+    anchor: Optional[datetime.datetime] = None  # Naive local DTSTART; None means "no lower bound"
+    until: Optional[datetime.datetime] = None   # Naive local, inclusive
+    next_in_week: Tuple[Optional[int], ...] = field(default=(), repr=False)  # weekday -> next target weekday later that week
+    _rrule: object = field(default=None, repr=False, compare=False)
+
+    def next_after(self, after):
+        """Returns the first occurrence strictly after `after` (aware) as an aware Chicago datetime, or None if the rule has ended."""
+        after_local = after.astimezone(LOCAL_TZ).replace(tzinfo=None)
+        if self.anchor is not None and after_local < self.anchor:
+            after_local = self.anchor - datetime.timedelta(microseconds=1)
+        if self.freq == 'RRULE':
+            naive = self._rrule.after(after_local)
+        else:
+            naive = _NEXT_BY_FREQ[self.freq](self, after_local)
+        if naive is None or (self.until is not None and naive > self.until):
+            return None
+        return LOCAL_TZ.localize(naive)
+
+    def upcoming(self, after, limit):
+        """Returns up to `limit` occurrences strictly after `after`."""
+        occurrences = []
+        current = after
+        while len(occurrences) < limit:
+            current = self.next_after(current)
+            if current is None: break
+            occurrences.append(current)
+        return occurrences
+
+    def describe(self):
+        """Short human-readable summary used in bot replies."""
+        at = f" at {self.time_of_day.strftime('%I:%M %p')}" if self.time_of_day else ""
+        every = f"every {self.interval} " if self.interval > 1 else ""
+        if self.freq == 'DAILY':
+            text = f"{every}days{at}" if every else f"everyday{at}"
+        elif self.freq == 'WEEKLY':
+            days = "everyday" if len(self.weekdays) == 7 else ", ".join(DAY_NAMES[d] for d in self.weekdays)
+            text = f"{days}{at}" + (f" ({every}weeks)" if every else "")
+        elif self.freq == 'MONTHLY':
+            days = ", ".join("last day" if d == -1 else f"day {d}" for d in self.monthdays)
+            text = f"{days} of every {self.interval} months{at}" if every else f"{days} of every month{at}"
+        else:
+            text = self.source
+        if self.until is not None: text += f" until {self.until.strftime('%b %d, %Y')}"
+        return text
+
+# --- Next-Occurrence Math (Sync - No I/O) ---
+
+def _next_daily(rule, after_local):
+    candidate = after_local.date()
+    if after_local.time() >= rule.time_of_day: candidate += datetime.timedelta(days=1)
+    if rule.interval > 1 and rule.anchor is not None:
+        offset = (candidate - rule.anchor.date()).days % rule.interval
+        if offset: candidate += datetime.timedelta(days=rule.interval - offset)
+    return datetime.datetime.combine(candidate, rule.time_of_day)
+
+def _next_weekly(rule, after_local):
+    day = after_local.date()
+    weekday = day.weekday()
+    week_start = day - datetime.timedelta(days=weekday)
+    week_offset = 0
+    if rule.interval > 1 and rule.anchor is not None:
+        anchor_week = rule.anchor.date() - datetime.timedelta(days=rule.anchor.weekday())
+        week_offset = ((week_start - anchor_week).days // 7) % rule.interval
+    if week_offset == 0:
+        if weekday in rule.weekdays and after_local.time() < rule.time_of_day:
+            return datetime.datetime.combine(day, rule.time_of_day)
+        later = rule.next_in_week[weekday]
+        if later is not None:
+            return datetime.datetime.combine(week_start + datetime.timedelta(days=later), rule.time_of_day)
+    weeks_ahead = rule.interval - week_offset
+    next_week = week_start + datetime.timedelta(weeks=weeks_ahead)
+    return datetime.datetime.combine(next_week + datetime.timedelta(days=rule.weekdays[0]), rule.time_of_day)
+
+def _days_in_month(year, month):
+    following = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return (following - datetime.timedelta(days=1)).day
+
+def _next_monthly(rule, after_local):
+    year, month = after_local.year, after_local.month
+    if rule.interval > 1 and rule.anchor is not None:
+        offset = ((year * 12 + month) - (rule.anchor.year * 12 + rule.anchor.month)) % rule.interval
+        if offset:
+            month += rule.interval - offset
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    for _ in range(MAX_MONTH_SCAN):
+        length = _days_in_month(year, month)
+        days = sorted({d if d > 0 else length + d + 1 for d in rule.monthdays if 1 <= (d if d > 0 else length + d + 1) <= length})
+        for day in days:
+            candidate = datetime.datetime(year, month, day, rule.time_of_day.hour, rule.time_of_day.minute, rule.time_of_day.second)
+            if candidate > after_local: return candidate
+        month += rule.interval
+        year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+    return None
+
+_NEXT_BY_FREQ = {'DAILY': _next_daily, 'WEEKLY': _next_weekly, 'MONTHLY': _next_monthly}
+
+# --- Rule Parsing ---
+
+def _week_table(weekdays):
+    return tuple(next((d for d in weekdays if d > wd), None) for wd in range(7))
+
+def _parse_rfc_datetime(value, tzid=None):
+    """Parses an RFC 5545 DATE or DATE-TIME into a naive Chicago wall time."""
+    value = value.strip()
+    if len(value) == 8:
+        return datetime.datetime.strptime(value, '%Y%m%d')
+    utc = value.endswith('Z')
+    parsed = datetime.datetime.strptime(value.rstrip('Z'), '%Y%m%dT%H%M%S')
+    if utc:
+        return pytz.utc.localize(parsed).astimezone(LOCAL_TZ).replace(tzinfo=None)
+    if tzid:
+        return pytz.timezone(tzid).localize(parsed).astimezone(LOCAL_TZ).replace(tzinfo=None)
+    return parsed
+
+def _compile_legacy_weekly(rule_str):
+    # Format: WEEKLY:<d,d,...>:<HH:MM> (the time itself contains a colon)
+    parts = rule_str.split(':', 2)
+    if len(parts) != 3: raise ValueError(f"Invalid WEEKLY rule: {rule_str}")
+    weekdays = tuple(sorted({int(d) for d in parts[1].split(',') if d.strip()}))
+    if not weekdays or any(d < 0 or d > 6 for d in weekdays): raise ValueError(f"Invalid weekdays in rule: {rule_str}")
+    time_of_day = datetime.datetime.strptime(parts[2], '%H:%M').time()
+    return CompiledRule(source=rule_str, freq='WEEKLY', time_of_day=time_of_day, weekdays=weekdays, next_in_week=_week_table(weekdays))
+
+def _compile_rrule(rule_str):
+    anchor = None; rrule_line = None
+    for line in rule_str.replace('\\n', '\n').splitlines():
+        line = line.strip()
+        if not line: continue
+        upper = line.upper()
+        if upper.startswith('DTSTART'):
+            params, _, value = line.partition(':')
+            tzid = next((p.split('=', 1)[1] for p in params.split(';')[1:] if p.upper().startswith('TZID=')), None)
+            anchor = _parse_rfc_datetime(value, tzid)
+        elif upper.startswith('RRULE:'):
+            rrule_line = line[len('RRULE:'):]
+        elif upper.startswith('FREQ='):
+            rrule_line = line
+        else:
+            raise ValueError(f"Unsupported recurrence line: {line}")
+    if not rrule_line: raise ValueError(f"No RRULE found in: {rule_str}")
+
+    parts = {}
+    for part in rrule_line.split(';'):
+        if not part: continue
+        key, _, value = part.partition('=')
+        parts[key.strip().upper()] = value.strip().upper()
+
+    freq = parts.get('FREQ')
+    interval = int(parts.get('INTERVAL', '1'))
+    if interval < 1: raise ValueError("INTERVAL must be at least 1")
+    until = _parse_rfc_datetime(parts['UNTIL']) if 'UNTIL' in parts else None
+    if until is not None and len(parts['UNTIL']) == 8: until = until.replace(hour=23, minute=59, second=59)
+
+    hours = parts.get('BYHOUR', '').split(',') if parts.get('BYHOUR') else []
+    minutes = parts.get('BYMINUTE', '').split(',') if parts.get('BYMINUTE') else []
+    seconds = parts.get('BYSECOND', '').split(',') if parts.get('BYSECOND') else []
+    byday = [d for d in parts.get('BYDAY', '').split(',') if d]
+    native = (
+        freq in _NEXT_BY_FREQ and set(parts) <= NATIVE_PARTS and len(hours) <= 1 and len(minutes) <= 1 and len(seconds) <= 1
+        and parts.get('WKST', 'MO') == 'MO'
+        and all(d in WEEKDAY_CODES for d in byday) and (freq == 'WEEKLY' or not byday)
+    )
+    if native and (hours or anchor is not None):
+        # Like RFC 5545 (and dateutil), each missing BYxxx part comes from DTSTART independently
+        time_of_day = datetime.time(
+            int(hours[0]) if hours else anchor.hour,
+            int(minutes[0]) if minutes else (anchor.minute if anchor is not None else 0),
+            int(seconds[0]) if seconds else (anchor.second if anchor is not None else 0)
+        )
+        weekdays = (); monthdays = ()
+        if freq == 'WEEKLY':
+            weekdays = tuple(sorted({WEEKDAY_CODES.index(d) for d in byday})) if byday else None
+            if weekdays is None:
+                if anchor is None: raise ValueError("WEEKLY rules need BYDAY or DTSTART")
+                weekdays = (anchor.weekday(),)
+        elif freq == 'MONTHLY':
+            monthdays = tuple(int(d) for d in parts['BYMONTHDAY'].split(',')) if 'BYMONTHDAY' in parts else None
+            if monthdays is None:
+                if anchor is None: raise ValueError("MONTHLY rules need BYMONTHDAY or DTSTART")
+                monthdays = (anchor.day,)
+            if any(d == 0 or abs(d) > 31 for d in monthdays): raise ValueError("BYMONTHDAY out of range")
+        rule = CompiledRule(
+            source=rule_str, freq=freq, time_of_day=time_of_day, interval=interval,
+            weekdays=weekdays, monthdays=monthdays, anchor=anchor, until=until,
+            next_in_week=_week_table(weekdays) if weekdays else ()
+        )
+        if 'COUNT' in parts:
+            # Resolve COUNT into an inclusive UNTIL once, so every later query stays O(1)
+            count = int(parts['COUNT'])
+            if count < 1 or anchor is None: raise ValueError("COUNT needs a positive value and a DTSTART")
+            occurrences = rule.upcoming(LOCAL_TZ.localize(anchor) - datetime.timedelta(microseconds=1), count)
+            last = occurrences[-1].replace(tzinfo=None) if occurrences else anchor
+            rule = replace(rule, until=min(last, until) if until else last)
+        return rule
+
+    # Anything the native engine doesn't cover (BYSETPOS, ordinal BYDAY, YEARLY, HOURLY, ...) goes to dateutil
+    from dateutil import rrule as dateutil_rrule
+    if anchor is None: raise ValueError("This recurrence rule needs a DTSTART")
+    naive_rule = rrule_line if 'UNTIL' not in parts else ';'.join(p for p in rrule_line.split(';') if not p.upper().startswith('UNTIL='))
+    compiled = dateutil_rrule.rrulestr(naive_rule, dtstart=anchor, cache=True)
+    return CompiledRule(source=rule_str, freq='RRULE', anchor=anchor, until=until, interval=interval, _rrule=compiled)
+
+@functools.lru_cache(maxsize=RULE_CACHE_SIZE)
+def compile_rule(rule_str):
+    """Compiles a recurrence rule string once; repeated calls return the same cached object.
+    Accepts the legacy 'WEEKLY:d,d:HH:MM' format and RFC 5545 text ('[DTSTART:...\\n]RRULE:FREQ=...').
+    Raises ValueError if the rule can't be understood."""
+    rule_str = rule_str.strip()
+    if rule_str.upper().startswith('WEEKLY:'):
+        return _compile_legacy_weekly(rule_str)
+    return _compile_rrule(rule_str)
+
+def is_rrule(text):
+    """True if the text looks like RFC 5545 recurrence text rather than a days string."""
+    return text.strip().upper().startswith(('RRULE:', 'FREQ=', 'DTSTART'))
+
+def build_rrule(rule_text, target_time, dtstart):
+    """Completes user-supplied RRULE text: adds whichever of BYHOUR/BYMINUTE/BYSECOND is missing from
+    target_time, and a DTSTART anchor if missing."""
+    lines = [l.strip() for l in rule_text.replace('\\n', '\n').splitlines() if l.strip()]
+    rrule_line = next(l for l in lines if not l.upper().startswith('DTSTART'))
+    if not rrule_line.upper().startswith('RRULE:'): rrule_line = 'RRULE:' + rrule_line
+    for part, value in (('BYHOUR', target_time.hour), ('BYMINUTE', target_time.minute), ('BYSECOND', target_time.second)):
+        if part + '=' not in rrule_line.upper(): rrule_line += f";{part}={value}"
+    dtstart_line = next((l for l in lines if l.upper().startswith('DTSTART')), None)
+    if dtstart_line is None:
+        dtstart_line = f"DTSTART;TZID={LOCAL_TZ.zone}:{dtstart.strftime('%Y%m%dT%H%M%S')}"
+    return f"{dtstart_line}\n{rrule_line}"
+
+def cache_info():
+    return compile_rule.cache_info()
@@ -0,0 +1,89 @@
+# series.py
+import datetime
+import heapq
+import itertools
+
+import recurrence
+
+# --- In-Memory Series Index ---
+
+class SeriesIndex:
+    """Holds every recurring series record in memory, plus ONLY its next firing time.
+    Upcoming occurrences beyond the next one are computed on demand from the compiled rule."""
+
+    def __init__(self):
+        self._series = {}  # series_id -> series item
+        self._next = {}    # series_id -> next firing (aware datetime)
+        self._heap = []    # (next firing, tiebreak, series_id); stale entries are skipped lazily
+        self._counter = itertools.count()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._series)
+
+    def _schedule(self, series_id, after):
+        item = self._series[series_id]
+        try:
+            next_fire = recurrence.compile_rule(item['recurrence_rule']).next_after(after)
+        except ValueError as e:
+            print(f"[series] Invalid rule on series {series_id}: {e}"); next_fire = None
+        if next_fire is None:
+            self._next.pop(series_id, None); return None
+        self._next[series_id] = next_fire
+        heapq.heappush(self._heap, (next_fire, next(self._counter), series_id))
+        return next_fire
+
+    def load(self, items, now):
+        """Replaces the index with freshly loaded series records."""
+        self._series = {}; self._next = {}; self._heap = []
+        for item in items:
+            try:
+                self.upsert(item, now)
+            except Exception as e: # Skip a malformed record rather than leave every series after it unloaded
+                print(f"[series] Skipping malformed series {item.get('reminder_id')}: {e}")
+                self.remove(item.get('reminder_id'))
+        self.loaded_at = now
+
+    def upsert(self, item, now):
+        """Adds or replaces a series. Its next firing is the first occurrence after its last firing."""
+        series_id = item['reminder_id']
+        self._series[series_id] = item
+        last_fired = item.get('last_fired_utc')
+        after = datetime.datetime.fromisoformat(last_fired) if last_fired else now
+        return self._schedule(series_id, after)
+
+    def remove(self, series_id):
+        self._series.pop(series_id, None); self._next.pop(series_id, None)
+
+    def get(self, series_id):
+        return self._series.get(series_id)
+
+    def pop_due(self, now):
+        """Removes and returns [(series item, occurrence)] for every series due at or before `now`."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_fire, _, series_id = heapq.heappop(self._heap)
+            if self._next.get(series_id) != next_fire: continue  # Stale entry (series removed or rescheduled)
+            del self._next[series_id]
+            due.append((self._series[series_id], next_fire))
+        return due
+
+    def fired(self, series_id, fired_at):
+        """Records a firing in memory and materializes the following occurrence. Returns it (or None if ended)."""
+        item = self._series.get(series_id)
+        if item is None: return None
+        item['last_fired_utc'] = fired_at.isoformat()
+        return self._schedule(series_id, fired_at)
+
+    def next_fire(self, series_id):
+        return self._next.get(series_id)
+
+    def upcoming(self, series_id, after, limit):
+        """Computes the next `limit` occurrences of a series on demand; nothing is stored."""
+        item = self._series.get(series_id)
+        if item is None: return []
+        return recurrence.compile_rule(item['recurrence_rule']).upcoming(after, limit)
+
+    def for_member(self, user_id):
+        """All series that remind `user_id`."""
+        return [item for item in self._series.values() if str(user_id) in item.get('members', [])]
@@ -0,0 +1,99 @@
+"""
+Production entrypoint for running the API outside Lambda (EC2, containers).
+
+    python server.py
+
+Settings come from the environment:
+    API_HOST / API_PORT             bind address (default 0.0.0.0:8000)
+    API_WORKERS                     worker processes (default: one per usable CPU core)
+    API_BACKLOG                     listen() backlog for pending connections
+    API_KEEPALIVE_SECONDS           idle keep-alive timeout
+    API_LIMIT_CONCURRENCY           per-worker cap on in-flight connections before answering 503
+    API_MAX_REQUESTS                recycle a worker after this many requests (0 = never)
+    API_GRACEFUL_SHUTDOWN_SECONDS   how long in-flight requests (and open /api/stream
+                                    connections) get to finish after SIGTERM
+    API_ACCESS_LOG                  "1" to enable uvicorn's per-request access log
+    API_FORWARDED_ALLOW_IPS         comma-separated proxy addresses whose X-Forwarded-For is trusted
+                                    (default 127.0.0.1; "*" only if nothing can reach the API directly).
+                                    The per-IP rate limits use the client address this yields
+
+uvloop and httptools are used when installed and fall back to asyncio/h11 otherwise.
+
+Every worker is its own process with its own in-memory state: the verified-token cache, the
+reminder page cache and the /api/stream hub. Set REMINDER_CACHE_REDIS_URL to share the page cache,
+and STREAM_REDIS_URL (for the bot too) so open streams hear about changes made by other processes
+right away; without it they only notice them every STREAM_POLL_SECONDS.
+Logouts are stored in DynamoDB, so they reach every worker: the worker that handled the logout
+rejects the token at once, and the others within TOKEN_RECHECK_SECONDS (the longest they trust
+a cached token before checking it against DynamoDB again).
+"""
+import importlib.util
+import inspect
+import os
+
+import uvicorn
+
+APP = "api_main:app"
+MAX_DEFAULT_WORKERS = 8  # Each worker holds its own caches and DynamoDB connections
+
+
+def usable_cores() -> int:
+    """CPU cores this process may run on (respects container/affinity limits where the OS exposes them)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def default_workers() -> int:
+    # The app is async and spends most of its time waiting on DynamoDB and Discord,
+    # so one worker per core keeps every core busy without oversubscribing them
+    return min(usable_cores(), MAX_DEFAULT_WORKERS)
+
+
+def fastest_loop() -> str:
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def fastest_http() -> str:
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def server_options() -> dict:
+    max_requests = env_int("API_MAX_REQUESTS", 0)
+    options = {
+        "host": os.environ.get("API_HOST", "0.0.0.0"),
+        "port": env_int("API_PORT", 8000),
+        "workers": env_int("API_WORKERS", default_workers()),
+        "loop": fastest_loop(),
+        "http": fastest_http(),
+        "backlog": env_int("API_BACKLOG", 2048),
+        "timeout_keep_alive": env_int("API_KEEPALIVE_SECONDS", 5),
+        "limit_concurrency": env_int("API_LIMIT_CONCURRENCY", 1000),
+        "limit_max_requests": max_requests or None,
+        "timeout_graceful_shutdown": env_int("API_GRACEFUL_SHUTDOWN_SECONDS", 20),
+        "access_log": os.environ.get("API_ACCESS_LOG") == "1",
+        "proxy_headers": True,
+        "forwarded_allow_ips": os.environ.get("API_FORWARDED_ALLOW_IPS", "127.0.0.1"),
+        "lifespan": "on",
+    }
+    # Older uvicorn releases don't know every option (e.g. timeout_graceful_shutdown); drop what they'd reject
+    supported = inspect.signature(uvicorn.Config.__init__).parameters
+    return {key: value for key, value in options.items() if key in supported}
+
+
+def main():
+    options = server_options()
+    print(f"[SERVER] Starting {APP} with {options.get('workers')} worker(s), "
+          f"loop={options.get('loop')}, http={options.get('http')}, on {options['host']}:{options['port']}")
+    # uvicorn's supervisor forwards SIGINT/SIGTERM to the workers, which stop accepting connections
+    # and drain in-flight requests for up to timeout_graceful_shutdown before exiting
+    uvicorn.run(APP, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import asyncio
+import concurrent.futures
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import loop_watchdog
+import profiler
+
+
+def test_idle_pool_and_watchdog_are_not_hotspots():
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    list(pool.map(abs, range(8)))  # Start the workers, then leave them parked in their queue
+
+    async def run():
+        watchdog = loop_watchdog.LoopWatchdog(interval=0.05, threshold_ms=1000)
+        watchdog.start()
+        return await asyncio.to_thread(profiler.profile, 0.3)
+
+    try:
+        result = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert result.samples > 0
+    assert "(idle)" in result.summary()
+    assert any("_worker (thread.py" in stack for stack in result.stacks)  # Still in the flamegraph
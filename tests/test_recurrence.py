@@ -0,0 +1,50 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pytz")
+import recurrence
+
+START = datetime.datetime(2024, 1, 15, 20, 30, 15)
+RULES = [
+    "FREQ=DAILY;BYHOUR=8",
+    "FREQ=DAILY;BYMINUTE=45",
+    "FREQ=DAILY;BYHOUR=8;BYMINUTE=5;BYSECOND=0",
+    "FREQ=DAILY;INTERVAL=3;BYHOUR=23;BYMINUTE=59",
+    "FREQ=WEEKLY;BYDAY=MO,WE,FR;BYHOUR=9",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,SU;BYHOUR=18;BYMINUTE=0",
+    "FREQ=WEEKLY;COUNT=5",
+    "FREQ=MONTHLY;BYMONTHDAY=1,15,-1;BYHOUR=12",
+    "FREQ=MONTHLY;BYMONTHDAY=31;BYHOUR=7;BYMINUTE=15",
+    "FREQ=MONTHLY;INTERVAL=2;UNTIL=20250101T000000",
+]
+
+
+def _rule_text(rrule):
+    return f"DTSTART;TZID={recurrence.LOCAL_TZ.zone}:{START.strftime('%Y%m%dT%H%M%S')}\nRRULE:{rrule}"
+
+
+def test_byhour_without_byminute_keeps_dtstart_minute():
+    rule = recurrence.compile_rule("DTSTART:20240115T203000\nRRULE:FREQ=DAILY;BYHOUR=8")
+    first = rule.next_after(recurrence.LOCAL_TZ.localize(datetime.datetime(2024, 1, 15, 21, 0)))
+    assert first.replace(tzinfo=None) == datetime.datetime(2024, 1, 16, 8, 30)
+
+
+def test_build_rrule_only_adds_missing_parts():
+    text = recurrence.build_rrule("FREQ=DAILY;BYHOUR=8", datetime.time(17, 45), START)
+    assert "BYHOUR=8;BYMINUTE=45;BYSECOND=0" in text and "BYHOUR=17" not in text
+
+
+@pytest.mark.parametrize("rrule", RULES)
+def test_compiled_rules_match_dateutil(rrule):
+    dateutil_rrule = pytest.importorskip("dateutil.rrule")
+    rule = recurrence.compile_rule(_rule_text(rrule))
+    assert rule.freq != "RRULE"  # Exercise the native engine, not the dateutil fallback
+    expected = dateutil_rrule.rrulestr(rrule, dtstart=START)
+    after = recurrence.LOCAL_TZ.localize(START - datetime.timedelta(days=1))
+    got = [d.replace(tzinfo=None) for d in rule.upcoming(after, 12)]
+    assert got == list(expected.xafter(START - datetime.timedelta(days=1), count=12))
@@ -0,0 +1,100 @@
+# time_utils.py
+import datetime
+import asyncio
+import functools
+import re
+import time
+import pytz
+
+# --- Set our "home" timezone (same as db_utils) ---
+LOCAL_TZ = pytz.timezone('America/Chicago')
+
+DATEPARSER_SETTINGS = {'TIMEZONE': 'America/Chicago', 'RETURN_AS_TIMEZONE_AWARE': True}
+DATEPARSER_LANGUAGES = ['en']  # Skips language auto-detection, which is most of dateparser's cost
+NOW_BUCKET_SECONDS = 30        # Relative phrases ("in 2 hours") are cached for at most this long
+PARSE_CACHE_SIZE = 4096
+
+# --- Strict Fast Paths ---
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{1,2}:\d{2}(:\d{2}(\.\d{1,6})?)?(Z|[+-]\d{2}:?\d{2})?$')
+_US_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([ap]m)?$', re.IGNORECASE)
+_CLOCK_RE = re.compile(r'^(\d{1,2})(?::(\d{2}))?\s*([ap]m)?$', re.IGNORECASE)
+
+def _to_local(dt):
+    """Naive datetimes are Chicago wall time; aware ones are converted to Chicago."""
+    return dt.astimezone(LOCAL_TZ) if dt.tzinfo else LOCAL_TZ.localize(dt)
+
+def _hour_24(hour, meridiem):
+    if not meridiem: return hour
+    if not 1 <= hour <= 12: raise ValueError("hour out of range for am/pm")
+    return hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+
+def parse_fast(text, now_local=None):
+    """Parses ISO-8601, MM/DD/YYYY HH:MM[ am|pm] and bare clock times ("9:30", "5pm") without dateparser.
+    Returns an aware Chicago datetime, or None when the text is not in one of those exact formats."""
+    try:
+        if _ISO_RE.match(text):
+            return _to_local(datetime.datetime.fromisoformat(text))
+        match = _US_RE.match(text)
+        if match:
+            month, day, year, hour, minute, second, meridiem = match.groups()
+            naive = datetime.datetime(int(year), int(month), int(day), _hour_24(int(hour), meridiem), int(minute), int(second or 0))
+            return LOCAL_TZ.localize(naive)
+        match = _CLOCK_RE.match(text)
+        if match and (match.group(2) or match.group(3)):
+            hour, minute, meridiem = match.groups()
+            now_local = now_local or datetime.datetime.now(LOCAL_TZ)
+            clock = datetime.time(_hour_24(int(hour), meridiem), int(minute or 0))
+            return LOCAL_TZ.localize(datetime.datetime.combine(now_local.date(), clock))
+    except ValueError:
+        return None  # Looked like a fast-path format but wasn't a real date; let dateparser decide
+    return None
+
+# --- dateparser Fallback ---
+
+def _parse_slow(text):
+    import dateparser  # Imported on first use; it is slow to import and rarely needed
+    parsed = dateparser.parse(text, languages=DATEPARSER_LANGUAGES, settings=DATEPARSER_SETTINGS)
+    return _to_local(parsed) if parsed else None
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(text, now_bucket):
+    return parse_fast(text) or _parse_slow(text)
+
+def _normalize(text):
+    return ' '.join(text.split()) if text else ''
+
+def parse_time(text):
+    """Parses a user-supplied time string into an aware Chicago datetime, or None if it can't be understood.
+    Results are cached per input for the current NOW_BUCKET_SECONDS window."""
+    text = _normalize(text)
+    if not text: return None
+    return _parse_cached(text, int(time.time() // NOW_BUCKET_SECONDS))
+
+async def parse_time_async(text):
+    """(Async) Same as parse_time, but only hops to a thread when dateparser actually has to run."""
+    text = _normalize(text)
+    if not text: return None
+    fast = parse_fast(text)
+    if fast: return fast
+    return await asyncio.to_thread(parse_time, text)
+
+async def parse_many_async(texts):
+    """(Async) parse_time for a list of strings; everything the fast path can't handle shares one thread hop."""
+    texts = [_normalize(t) for t in texts]
+    results = [parse_fast(t) if t else None for t in texts]
+    slow = [i for i, t in enumerate(texts) if t and results[i] is None]
+    if slow:
+        parsed = await asyncio.to_thread(lambda: [parse_time(texts[i]) for i in slow])
+        for i, dt in zip(slow, parsed): results[i] = dt
+    return results
+
+def warm_up():
+    """Loads dateparser's English language data so the first real fallback parse isn't slow."""
+    try:
+        _parse_slow("tomorrow at 5pm")
+        print("[time_utils] dateparser warmed up.")
+    except Exception as e:
+        print(f"[time_utils] ERROR warming up dateparser: {e}")
+
+def cache_info():
+    return _parse_cached.cache_info()
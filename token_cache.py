@@ -0,0 +1,119 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of JWTs that already passed signature and expiry checks.
+    Keyed on the SHA-256 digest of the token, so raw tokens are never held.
+    Entries expire at the token's own `exp`, and tokens can be revoked
+    individually or for a whole subject. With `recheck_after`, an entry is
+    only trusted for that many seconds, so the caller re-checks the token
+    against revocations made by other processes.
+    """
+
+    def __init__(self, maxsize: int = 4096, recheck_after: Optional[float] = None,
+                 max_token_lifetime: Optional[float] = None):
+        self.maxsize = maxsize
+        self.recheck_after = recheck_after
+        self.max_token_lifetime = max_token_lifetime  # Subject revocations older than this can no longer match a live token
+        self._entries: "OrderedDict[bytes, Tuple[Any, float, float]]" = OrderedDict()  # digest -> (value, exp, stored_at)
+        self._revoked: Dict[bytes, float] = {}           # digest -> exp (kept only until the token would expire anyway)
+        self._revoked_subjects: Dict[str, float] = {}    # sub -> tokens issued at or before this time are revoked
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[Any]:
+        """Returns the cached value for a token, or None on a miss, expiry, revocation, or a due re-check."""
+        now = time.time() if now is None else now
+        key = self.digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, exp, stored_at = entry
+        if exp <= now or (self.recheck_after is not None and now - stored_at >= self.recheck_after):
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, token: str, now: Optional[float] = None) -> Optional[Any]:
+        """Like get, but without touching LRU order or hit/miss counters (for cheap lookups like rate limiting)."""
+        now = time.time() if now is None else now
+        entry = self._entries.get(self.digest(token))
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def put(self, token: str, value: Any, claims: Dict[str, Any]) -> None:
+        """Caches a verified token until its `exp`. Tokens without `exp` are not cached."""
+        exp = claims.get("exp")
+        if exp is None or float(exp) <= time.time():
+            return
+        key = self.digest(token)
+        self._entries[key] = (value, float(exp), time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str, claims: Dict[str, Any]) -> bool:
+        key = self.digest(token)
+        if key in self._revoked:
+            return True
+        revoked_at = self._revoked_subjects.get(str(claims.get("sub")))
+        return revoked_at is not None and self.issued_at(claims) <= revoked_at
+
+    @staticmethod
+    def issued_at(claims: Dict[str, Any]) -> float:
+        """
+        Issue time in epoch seconds. `iat` only has whole seconds, so a token issued
+        right after a revocation in the same second would look revoked; tokens carry
+        `iat_ms` for that, and older ones without it fall back to `iat`.
+        """
+        if "iat_ms" in claims:
+            return int(claims["iat_ms"]) / 1000
+        return float(claims.get("iat", 0))
+
+    def revoke(self, token: str, claims: Dict[str, Any]) -> None:
+        """Revokes one token until it would have expired anyway."""
+        key = self.digest(token)
+        self._entries.pop(key, None)
+        self._revoked[key] = float(claims.get("exp", time.time()))
+        self._purge_revoked()
+
+    def revoke_subject(self, sub: str, now: Optional[float] = None) -> None:
+        """Revokes every token for a subject issued up to now (e.g. "log out everywhere")."""
+        now = time.time() if now is None else now
+        self._revoked_subjects[str(sub)] = max(now, self._revoked_subjects.get(str(sub), 0.0))
+        for key, (value, _, _) in list(self._entries.items()):
+            if str(getattr(value, "id", None)) == str(sub):
+                del self._entries[key]
+        self._purge_revoked()
+
+    def _purge_revoked(self) -> None:
+        now = time.time()
+        for key in [k for k, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[key]
+        if self.max_token_lifetime is not None:
+            for sub in [s for s, at in self._revoked_subjects.items() if at + self.max_token_lifetime <= now]:
+                del self._revoked_subjects[sub]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "revoked": len(self._revoked),
+                "revoked_subjects": len(self._revoked_subjects)}
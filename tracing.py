@@ -0,0 +1,264 @@
+# tracing.py
+"""Lightweight request tracing for the bot: one trace per incoming DM or dispatched reminder,
+with a child span per DynamoDB, OpenAI and Discord call.
+
+Spans are finished on the caller and exported from a background thread, either appended to
+TRACE_FILE as JSON lines or POSTed in batches to TRACE_COLLECTOR_URL. Both are off by default
+(spans carry user ids), so tracing costs nothing until one of them is set. This file is also the
+tooling around that:
+
+    python tracing.py show traces.jsonl [--trace ID] [--slowest 10]   # print latency waterfalls
+    python tracing.py collect [--port 4318] [--out traces.jsonl]       # local collector stand-in
+"""
+import atexit
+import contextlib
+import contextvars
+import datetime
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+TRACE_FILE = os.environ.get("TRACE_FILE", "") # e.g. traces.jsonl; empty disables the file export
+TRACE_COLLECTOR_URL = os.environ.get("TRACE_COLLECTOR_URL", "") # e.g. http://127.0.0.1:4318/v1/traces
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "1.0")) # Fraction of traces recorded
+TRACE_MAX_BYTES = int(os.environ.get("TRACE_MAX_BYTES", str(50 * 1024 * 1024))) # Rotate TRACE_FILE to TRACE_FILE.1 at this size
+EXPORT_BATCH_SIZE = 100
+EXPORT_FLUSH_SECONDS = 2.0
+EXPORT_QUEUE_SIZE = 10000 # Finished spans waiting for export; beyond this they are dropped
+
+_current_span = contextvars.ContextVar("prodibot_current_span", default=None)
+
+log = logging.getLogger("prodibot.tracing")
+
+# --- Spans ---
+
+class Span:
+    """One timed operation. Attributes are free-form; `set()` adds more while the span is open."""
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start", "_start_perf", "duration_ms", "error")
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.trace_id = trace_id
+        self.span_id = "%016x" % random.getrandbits(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self._start_perf = time.perf_counter()
+        self.duration_ms = None
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        self.duration_ms = (time.perf_counter() - self._start_perf) * 1000
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id, "name": self.name,
+            "start": datetime.datetime.fromtimestamp(self.start, datetime.timezone.utc).isoformat(timespec="microseconds"),
+            "duration_ms": round(self.duration_ms, 3), "status": "error" if self.error else "ok",
+            "error": self.error, "attributes": self.attributes,
+        }
+
+@contextlib.contextmanager
+def _activate(span):
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        span.finish()
+        _exporter().submit(span)
+
+@contextlib.contextmanager
+def trace(name, **attributes):
+    """Starts a new trace rooted at this block. Yields the root span, or None if the trace isn't sampled."""
+    if not enabled() or random.random() >= TRACE_SAMPLE_RATE:
+        token = _current_span.set(None) # Keep children of an unsampled trace from attaching to an outer one
+        try: yield None
+        finally: _current_span.reset(token)
+        return
+    with _activate(Span(name, "%032x" % random.getrandbits(128), None, attributes)) as root:
+        yield root
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """A child of the current span. Outside a sampled trace this is a no-op that yields None.
+    The context is copied into asyncio.to_thread workers, so spans opened there attach correctly."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None; return
+    with _activate(Span(name, parent.trace_id, parent.span_id, attributes)) as child:
+        yield child
+
+def current_trace_id():
+    current = _current_span.get()
+    return current.trace_id if current else None
+
+def enabled():
+    return bool(TRACE_FILE or TRACE_COLLECTOR_URL)
+
+# --- Export ---
+
+class _Exporter:
+    """Batches finished spans on a daemon thread so file and network I/O never run on the event loop."""
+    def __init__(self, path, url):
+        self.path = path
+        self.url = url
+        self.queue = queue.Queue(EXPORT_QUEUE_SIZE)
+        self.dropped = 0
+        self.export_errors = 0
+        self.thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self.thread.start()
+
+    def submit(self, span):
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = []
+            deadline = time.monotonic() + EXPORT_FLUSH_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._export(batch); return
+                batch.append(item.to_dict())
+            if batch: self._export(batch)
+
+    def _export(self, batch):
+        if not batch: return
+        try:
+            if self.path: self._write_file(batch)
+            if self.url: self._post(batch)
+        except Exception as e:
+            self.export_errors += 1
+            log.error("[tracing] ERROR exporting %d span(s): %s", len(batch), e)
+
+    def _write_file(self, batch):
+        if os.path.exists(self.path) and os.path.getsize(self.path) > TRACE_MAX_BYTES:
+            os.replace(self.path, self.path + ".1")
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(s, default=str) + "\n" for s in batch)
+
+    def _post(self, batch):
+        import urllib.request
+        request = urllib.request.Request(
+            self.url, data=json.dumps({"spans": batch}, default=str).encode(),
+            headers={"Content-Type": "application/json"}, method="POST"
+        )
+        urllib.request.urlopen(request, timeout=5).close()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=10)
+
+_exporter_instance = None
+_exporter_lock = threading.Lock()
+
+def _exporter():
+    global _exporter_instance
+    if _exporter_instance is None:
+        with _exporter_lock:
+            if _exporter_instance is None:
+                _exporter_instance = _Exporter(TRACE_FILE, TRACE_COLLECTOR_URL)
+                atexit.register(_exporter_instance.close) # Flush spans still queued on exit
+    return _exporter_instance
+
+def stats():
+    """Exporter counters, for admin/debug output."""
+    if _exporter_instance is None: return {"queued": 0, "dropped": 0, "export_errors": 0}
+    return {"queued": _exporter_instance.queue.qsize(), "dropped": _exporter_instance.dropped,
+            "export_errors": _exporter_instance.export_errors}
+
+# --- Waterfall Viewer & Collector Stand-in ---
+
+def load_traces(path, trace_id=None):
+    """Groups the spans in a JSON-lines file by trace, each trace sorted by start time."""
+    traces = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            s = json.loads(line)
+            if trace_id and s["trace_id"] != trace_id: continue
+            traces.setdefault(s["trace_id"], []).append(s)
+    for spans in traces.values(): spans.sort(key=lambda s: s["start"])
+    return traces
+
+def format_waterfall(spans, width=40):
+    """Text waterfall of one trace: offset from the root's start, duration, and a bar per span."""
+    by_id = {s["span_id"]: s for s in spans}
+    root = next((s for s in spans if s["parent_id"] is None), spans[0])
+    t0 = datetime.datetime.fromisoformat(root["start"])
+    total = max(root["duration_ms"], 0.001)
+
+    def depth(s):
+        d = 0
+        while s["parent_id"] in by_id: s = by_id[s["parent_id"]]; d += 1
+        return d
+
+    attrs = " ".join(f"{k}={v}" for k, v in root["attributes"].items())
+    lines = [f"trace {root['trace_id']}  {root['name']}  {root['duration_ms']:.1f} ms  {attrs}"]
+    for s in spans:
+        offset = (datetime.datetime.fromisoformat(s["start"]) - t0).total_seconds() * 1000
+        start_col = min(width - 1, int(offset / total * width))
+        bar = " " * start_col + "#" * max(1, int(s["duration_ms"] / total * width))
+        label = "  " * depth(s) + s["name"] + (" !" if s["status"] == "error" else "")
+        lines.append(f"  {offset:9.1f} {s['duration_ms']:9.1f}  |{bar[:width]:<{width}}|  {label}")
+    return "\n".join(lines)
+
+def _show(args):
+    traces = load_traces(args.file, args.trace)
+    roots = sorted(traces.values(), key=lambda spans: -max(s["duration_ms"] for s in spans))
+    for spans in roots[:args.slowest]:
+        print(format_waterfall(spans)); print()
+    print(f"{len(traces)} trace(s) in {args.file}; showing the {min(args.slowest, len(traces))} slowest.")
+
+def _collect(args):
+    """Accepts the exporter's POSTs (or any {"spans": [...]} body) and appends them to a file."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            spans = body.get("spans", [])
+            with lock, open(args.out, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(s) + "\n" for s in spans)
+            for s in spans:
+                if s["parent_id"] is None: print(f"[collector] {s['name']} {s['duration_ms']:.1f} ms trace={s['trace_id']}")
+            self.send_response(200); self.send_header("Content-Length", "0"); self.end_headers()
+
+        def log_message(self, *args): pass
+
+    print(f"[collector] Listening on http://{args.host}:{args.port}/v1/traces, writing to {args.out}")
+    ThreadingHTTPServer((args.host, args.port), Handler).serve_forever()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Trace viewer and collector stand-in.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="Print latency waterfalls from a traces file")
+    show.add_argument("file", nargs="?", default=TRACE_FILE or "traces.jsonl")
+    show.add_argument("--trace", help="Only this trace id")
+    show.add_argument("--slowest", type=int, default=10)
+    collect = sub.add_parser("collect", help="Run a local collector that appends received spans to a file")
+    collect.add_argument("--host", default="127.0.0.1")
+    collect.add_argument("--port", type=int, default=4318)
+    collect.add_argument("--out", default="collected-traces.jsonl")
+    args = parser.parse_args()
+    _show(args) if args.command == "show" else _collect(args)